@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark: neuer HTTP-Client pro Anfrage vs. langlebiger Client mit Keep-Alive-Pool.
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_http_pool                       # lokaler Testserver (nur TCP)
+    python -m benchmarks.bench_http_pool --url https://api.x.ai/v1/models -n 20   # inkl. TLS
+
+Gegen den lokalen Server wird nur der TCP-Aufbau gespart; gegen echte HTTPS-Endpunkte
+zusätzlich der TLS-Handshake (typisch 50–200 ms je Anfrage).
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import httpx
+
+from src.adapters.base import pooled_http_client
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def _measure(n: int, fn: Callable[[], None]) -> List[float]:
+    lat: List[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        lat.append((time.perf_counter() - t0) * 1000)
+    return lat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP-Client-Pooling Benchmark")
+    parser.add_argument("--url", default=None, help="Ziel-URL (Standard: lokaler Testserver)")
+    parser.add_argument("-n", type=int, default=200, help="Anzahl Anfragen je Variante")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def fresh() -> None:
+        with httpx.Client(timeout=45.0) as c:
+            c.get(url)
+
+    pooled = pooled_http_client(timeout=45.0)
+
+    def reuse() -> None:
+        pooled.get(url)
+
+    try:
+        reuse()  # Verbindung aufwärmen
+        res = {"neu je Anfrage": _measure(args.n, fresh), "gepoolt": _measure(args.n, reuse)}
+    finally:
+        pooled.close()
+        if server is not None:
+            server.shutdown()
+
+    print(f"Ziel: {url} · n={args.n}")
+    print(f"{'Variante':<16} {'p50 ms':>8} {'Mittel ms':>10} {'p95 ms':>8}")
+    for name, lat in res.items():
+        lat_sorted = sorted(lat)
+        p95 = lat_sorted[int(0.95 * (len(lat_sorted) - 1))]
+        print(f"{name:<16} {statistics.median(lat):>8.2f} {statistics.mean(lat):>10.2f} {p95:>8.2f}")
+    speedup = statistics.mean(res["neu je Anfrage"]) / max(1e-9, statistics.mean(res["gepoolt"]))
+    print(f"Faktor (Mittelwert): {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark: Judge.classify (Einzelaufrufe) vs. Judge.classify_batch (spaltenweise).
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_judge_batch -n 200000
+
+Als Eingabe dienen vorhandene Meinungen aus outputs/*/raw_opinions/ (falls vorhanden) bzw.
+synthetische Antworten, vervielfacht auf n Texte. Beide Pfade müssen identische Ergebnisse liefern.
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import List
+
+from src.judge import Judge
+
+_SYNTHETIC = [
+    "Ausführliche Abwägung der Situation von Herrn Herrmann. " * 30 + "\nEmpfehlung: PEG: Nein\n",
+    "Kurzbegründung: Der Wille und die Autonomie von Herrn Herrmann sind maßgeblich; Autonomie wiegt schwer.\n"
+    "Empfehlung: PEG: Nein\n",
+    "Die Fürsorge gebietet Stabilisierung. Fürsorge und Lebensqualität sprechen für die Sonde.\n\n"
+    "Empfehlung: PEG: Ja (befristet)",
+    "Autonomie und Fürsorge sind abzuwägen; ein Ethikkonsil ist sinnvoll.\r\nEmpfehlung: PEG: unklar",
+    "Ohne weitere Informationen keine Empfehlung möglich.",
+]
+
+
+def _load_texts(root: Path) -> List[str]:
+    texts = [p.read_text(encoding="utf-8") for p in sorted(root.glob("outputs/*/raw_opinions/**/*.txt"))]
+    return texts or list(_SYNTHETIC)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Judge Batch-Benchmark")
+    parser.add_argument("-n", type=int, default=200_000, help="Anzahl Texte")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    base = _load_texts(root)
+    rng = random.Random(0)
+    texts = [rng.choice(base) for _ in range(args.n)]
+    judge = Judge()
+
+    t0 = time.perf_counter()
+    single = [judge.classify(t) for t in texts]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = judge.classify_batch(texts)
+    t_batch = time.perf_counter() - t0
+
+    same = all(
+        r["axis"] == batch["axis"][i]
+        and r["class_"] == batch["class_"][i]
+        and r["decision"] == batch["decision"][i]
+        and r["justification"] == batch["justification"][i]
+        for i, r in enumerate(single)
+    )
+    print(f"Texte: {args.n} (Vorlagen: {len(base)})")
+    print(f"classify (Einzelaufrufe): {t_single:8.2f} s  ({args.n / t_single:,.0f} Texte/s)")
+    print(f"classify_batch:           {t_batch:8.2f} s  ({args.n / t_batch:,.0f} Texte/s)")
+    print(f"Faktor: {t_single / max(1e-9, t_batch):.1f}x · Ergebnisse identisch: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Benchmark: Orchestrator Ende-zu-Ende gegen lokale Mock-Provider (ohne Netz und API-Kosten).
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_orchestrator
+    python -m benchmarks.bench_orchestrator --runs all --n-samples 20 --mode async --latency lognormal:800:0.6
+    python -m benchmarks.bench_orchestrator --stream --rate-429 0.05 --concurrency 8 --judge gemini
+    python -m benchmarks.bench_orchestrator --concurrency 16 --rpm-limit 600 --rpm 600
+
+Startet je Provider einen Mock-Server (benchmarks/mock_providers.py), kopiert configs/ und cases/
+in ein temporäres Projekt, setzt in models.yaml options.base_url (Teuken: server_url) auf die
+Mocks und führt Orchestrator.run_many mit den echten Adaptern aus. Berichtet Durchsatz,
+p50/p95/p99 der Latenz (Client je Generierung und Server je Anfrage), die Zeitanteile von
+Vorwärmen, Zeitplan und Nachbereitung, Judge, Ergebnis-Writern und Checkpoint sowie den
+Zeitplan-Overhead gegenüber der Untergrenze aus Serverzeiten und Concurrency-Limits.
+Mit --rpm-limit erzwingen die Mocks ein echtes Anfragelimit; --rpm/--tpm setzen das Budget der
+Rate-Limits (src/ratelimit.py) – der Bericht zeigt dann gedrosselte Zeit, 429 und Wiederholungen.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import functools
+import inspect
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import yaml
+
+from benchmarks.mock_providers import BASE_URL_ENV, LatencyProfile, start_mocks
+from src import results as results_mod
+from src.orchestrator import Orchestrator
+from src.results import CheckpointLog, ResultSink
+from src.store import ResultStore
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
+
+# Adapter-Schlüssel -> Mock-Provider und Adapter-Option für den Endpunkt
+MOCK_FOR_ADAPTER: Dict[str, Tuple[str, str]] = {
+    "openai_gpt": ("openai", "base_url"),
+    "anthropic_claude": ("anthropic", "base_url"),
+    "xai_grok": ("xai", "base_url"),
+    "local_mistral": ("mistral", "base_url"),
+    "local_teuken": ("teuken", "server_url"),
+}
+API_KEY_ENV = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY", "MISTRAL_API_KEY", "GOOGLE_API_KEY")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Perzentil nach Nearest-Rank (q in [0, 100]); 0.0 für leere Listen."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(-(-q * len(ordered) // 100))))
+    return ordered[rank - 1]
+
+
+class _Timers:
+    """Summiert Laufzeiten gepatchter Funktionen (thread-sicher) und stellt die Originale wieder her."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, label: str, dt: float) -> None:
+        with self._lock:
+            self.seconds[label] = self.seconds.get(label, 0.0) + dt
+
+    @contextlib.contextmanager
+    def patch(self, owner: Any, name: str, label: str) -> Iterator[None]:
+        orig = getattr(owner, name)
+        own = name in vars(owner)
+        if inspect.iscoroutinefunction(orig):
+
+            @functools.wraps(orig)
+            async def timed_async(*args: Any, **kwargs: Any) -> Any:
+                t0 = time.perf_counter()
+                try:
+                    return await orig(*args, **kwargs)
+                finally:
+                    self._add(label, time.perf_counter() - t0)
+
+            setattr(owner, name, timed_async)
+        else:
+
+            @functools.wraps(orig)
+            def timed(*args: Any, **kwargs: Any) -> Any:
+                t0 = time.perf_counter()
+                try:
+                    return orig(*args, **kwargs)
+                finally:
+                    self._add(label, time.perf_counter() - t0)
+
+            setattr(owner, name, timed)
+        try:
+            yield
+        finally:
+            if own:
+                setattr(owner, name, orig)
+            else:
+                # Instanz-Attribut entfernen, damit wieder die Methode der Klasse greift
+                delattr(owner, name)
+
+
+def _prepare_project(
+    tmp: Path, mocks: Dict[str, Any], providers: List[str], concurrency: int | None, rate_limit: Dict[str, float]
+) -> int:
+    """Kopiert configs/ und cases/ und lenkt die Modelle auf die Mocks; liefert die Anzahl Modelle."""
+    shutil.copytree(ROOT / "configs", tmp / "configs")
+    shutil.copytree(ROOT / "cases", tmp / "cases")
+    path = tmp / "configs" / "models.yaml"
+    cfg = yaml.safe_load(path.read_text(encoding="utf-8"))
+    models = []
+    for m in cfg["models"]:
+        mock_name, option = MOCK_FOR_ADAPTER.get(m["adapter"], (None, ""))
+        if mock_name not in providers:
+            continue
+        m["options"] = dict(m.get("options") or {}, **{option: mocks[mock_name].base_url})
+        if concurrency is not None:
+            m.pop("max_concurrency", None)
+        models.append(m)
+    if not models:
+        raise SystemExit("Keine Modelle für die gewählten Provider in configs/models.yaml.")
+    cfg["models"] = models
+    if concurrency is not None:
+        providers_cfg = {p: concurrency for p in (cfg.get("concurrency") or {}).get("providers") or {}}
+        cfg["concurrency"] = {"default": concurrency, "providers": providers_cfg}
+    if rate_limit:
+        rate_cfg = cfg.get("rate_limits") or {}
+        rate_cfg["providers"] = {m["provider"]: dict(rate_limit) for m in models}
+        cfg["rate_limits"] = rate_cfg
+    path.write_text(yaml.safe_dump(cfg, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    return len(models)
+
+
+def _ideal_schedule_s(tmp: Path, server_ms: Dict[str, List[float]]) -> float:
+    """Untergrenze der Zeitplandauer: je Concurrency-Gruppe Serverzeit / Limit, davon das Maximum."""
+    cfg = yaml.safe_load((tmp / "configs" / "models.yaml").read_text(encoding="utf-8"))
+    conc = cfg.get("concurrency") or {}
+    default = int(conc.get("default", 2))
+    limits = conc.get("providers") or {}
+    busy_s: Dict[str, float] = {}
+    group_limit: Dict[str, int] = {}
+    counted = set()
+    for m in cfg["models"]:
+        mock_name = MOCK_FOR_ADAPTER[m["adapter"]][0]
+        if m.get("max_concurrency"):
+            key, limit = f"model:{m['name']}", int(m["max_concurrency"])
+        else:
+            key, limit = f"provider:{m['provider']}", int(limits.get(m["provider"], default))
+        group_limit[key] = limit
+        if mock_name not in counted:
+            # Serverzeiten werden je Mock gezählt (ein Mock bedient ein Adapter-Format)
+            busy_s[key] = busy_s.get(key, 0.0) + sum(server_ms.get(mock_name, [])) / 1000
+            counted.add(mock_name)
+    return max((busy / max(1, group_limit[key]) for key, busy in busy_s.items()), default=0.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Orchestrator-Benchmark gegen lokale Mock-Provider")
+    parser.add_argument("--runs", nargs="+", default=["baseline"], choices=RUNS + ["all"])
+    parser.add_argument("--mode", default="threads", choices=["threads", "async", "sequential"])
+    parser.add_argument("--n-samples", type=int, default=10, help="Wiederholungen je Modell und Run")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=None, help="Streaming (Standard: Run-Config)")
+    parser.add_argument("--providers", nargs="+", default=list(MOCK_FOR_ADAPTER), choices=list(MOCK_FOR_ADAPTER))
+    parser.add_argument("--latency", default="lognormal:300:0.5", help="Verteilung:Median_ms[:Streuung] der Mocks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil HTTP 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Anteil HTTP 429 (mit Retry-After)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After in Sekunden bei 429")
+    parser.add_argument("--trailing-rate", type=float, default=0.0, help="Anteil Antworten mit Nachsatz nach der Empfehlung")
+    parser.add_argument("--rpm-limit", type=float, default=0.0, help="Anfragelimit je Mock pro Minute (0 = unbegrenzt)")
+    parser.add_argument("--rpm", type=float, default=None, help="Budget der Rate-Limits je Provider (Anfragen/min)")
+    parser.add_argument("--tpm", type=float, default=None, help="Budget der Rate-Limits je Provider (Tokens/min)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Limit je Provider für alle (Standard: models.yaml)")
+    parser.add_argument("--cache", default="off", choices=["rw", "ro", "off"], help="Generierungs-Cache im Temp-Projekt")
+    parser.add_argument("--judge", default="local", choices=["local", "gemini"], help="gemini: Judge gegen Gemini-Mock")
+    parser.add_argument("--verbose", action="store_true", help="Ausgaben des Orchestrators anzeigen")
+    parser.add_argument("--trace", action="store_true", help="Span-Tracing einschalten und Zeitverteilung anzeigen")
+    args = parser.parse_args()
+
+    runs = RUNS if "all" in args.runs else list(dict.fromkeys(args.runs))
+    providers = [MOCK_FOR_ADAPTER[a][0] for a in args.providers]
+    profile = LatencyProfile.parse(
+        args.latency,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        retry_after_s=args.retry_after,
+        trailing_rate=args.trailing_rate,
+        rpm_limit=args.rpm_limit,
+    )
+    mocks = start_mocks(providers + (["gemini"] if args.judge == "gemini" else []), profile)
+
+    # Nur dieser Prozess: Mock-Schlüssel und -Endpunkte statt echter APIs
+    env_before = dict(os.environ)
+    for key in API_KEY_ENV:
+        os.environ[key] = "mock"
+    for name in ("openai", "anthropic", "xai", "mistral", "teuken"):
+        os.environ.pop(BASE_URL_ENV[name], None)
+    os.environ["JUDGE_BACKEND"] = args.judge
+    if args.judge == "gemini":
+        os.environ[BASE_URL_ENV["gemini"]] = mocks["gemini"].url
+
+    timers = _Timers()
+    error: str | None = None
+    log = io.StringIO()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_name:
+            tmp = Path(tmp_name)
+            rate_limit = {k: v for k, v in (("rpm", args.rpm), ("tpm", args.tpm)) if v is not None}
+            n_models = _prepare_project(tmp, mocks, providers, args.concurrency, rate_limit)
+            t0 = time.perf_counter()
+            trace_format = "jsonl" if args.trace else "off"
+            with Orchestrator(str(tmp), cache_mode=args.cache, judge_cache_mode="off", trace_format=trace_format) as orch:
+                orch._ensure_judge()  # Judge vor der Messung erzeugen (Gemini: SDK-Import)
+                t_ready = time.perf_counter()
+                execute = {"threads": "_execute_threads", "async": "_execute_async", "sequential": "_execute_sequential"}
+                with contextlib.ExitStack() as stack:
+                    stack.enter_context(timers.patch(orch, execute[args.mode], "schedule"))
+                    stack.enter_context(timers.patch(orch.adapters, "warmup", "warmup"))
+                    stack.enter_context(timers.patch(results_mod, "judge_texts", "judge"))
+                    stack.enter_context(timers.patch(ResultSink, "add", "sink"))
+                    stack.enter_context(timers.patch(ResultSink, "close", "sink"))
+                    stack.enter_context(timers.patch(CheckpointLog, "record", "checkpoint"))
+                    out = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(log)
+                    with out:
+                        try:
+                            orch.run_many(runs, mode=args.mode, stream=args.stream, n_samples=args.n_samples)
+                        except RuntimeError as e:
+                            error = str(e)
+                wall_s = time.perf_counter() - t0
+                throttle = orch.rate_limit_stats
+                trace_lines = orch.last_trace.summary_lines() if orch.last_trace is not None else []
+            store = ResultStore(tmp / "outputs" / "results.sqlite", read_only=True)
+            rows = store.query("SELECT provider, latency_ms, cache_hit, ttft_ms, ttr_ms FROM results")
+            store.close()
+            server = {name: mock.stats() for name, mock in mocks.items()}
+            ideal_s = _ideal_schedule_s(tmp, {name: s["service_ms"] for name, s in server.items()})
+    finally:
+        for mock in mocks.values():
+            mock.stop()
+        os.environ.clear()
+        os.environ.update(env_before)
+
+    sec = timers.seconds
+    generated = [r for r in rows if not r[2]]
+    latencies = [float(r[1]) for r in generated]
+    sched_s = sec.get("schedule", 0.0)
+    judge_s = sec.get("judge", 0.0)
+    print(
+        f"Runs: {', '.join(runs)} · Modus {args.mode} · {n_models} Modelle × {args.n_samples} Samples · "
+        f"Mock-Latenz {args.latency}, 500: {args.error_rate:.0%}, 429: {args.rate_429:.0%}"
+        + (f", Limit {args.rpm_limit:g}/min" if args.rpm_limit else "")
+    )
+    print(
+        f"Generierungen: {len(rows)} gespeichert ({len(rows) - len(generated)} aus Cache) · "
+        f"Wandzeit {wall_s:.2f} s · Durchsatz {len(rows) / max(wall_s, 1e-9):.1f}/s "
+        f"(Zeitplan allein {len(generated) / max(sched_s, 1e-9):.1f}/s)"
+    )
+    if error:
+        print(f"Fehlgeschlagen: {error.split('.')[0]}.")
+
+    print(f"\n{'Latenz ms':<28} {'p50':>7} {'p95':>7} {'p99':>7} {'n':>6}")
+    print(f"{'Client je Generierung':<28} {percentile(latencies, 50):>7.0f} {percentile(latencies, 95):>7.0f} {percentile(latencies, 99):>7.0f} {len(latencies):>6}")
+    ttr = [float(r[4]) for r in generated if r[4] is not None]
+    if ttr:
+        print(f"{'Client bis Empfehlung (ttr)':<28} {percentile(ttr, 50):>7.0f} {percentile(ttr, 95):>7.0f} {percentile(ttr, 99):>7.0f} {len(ttr):>6}")
+    for name, s in server.items():
+        ms = s["service_ms"]
+        print(f"{'Server ' + name:<28} {percentile(ms, 50):>7.0f} {percentile(ms, 95):>7.0f} {percentile(ms, 99):>7.0f} {len(ms):>6}")
+
+    print(f"\n{'Mock':<10} {'Anfragen':>9} {'ok':>6} {'429':>5} {'500':>5} {'Stream':>7} {'abgebr.':>8}")
+    for name, s in server.items():
+        print(
+            f"{name:<10} {s['requests']:>9} {s['ok']:>6} {s['status_429']:>5} {s['status_500']:>5} "
+            f"{s['stream']:>7} {s['stopped_early']:>8}"
+        )
+
+    if any(t["throttle_waits"] or t["retries"] or t["gave_up"] for t in throttle.values()):
+        print(f"\n{'Rate-Limit':<10} {'Versuche':>9} {'gedr. s':>8} {'Warten':>7} {'429':>5} {'Überl.':>7} {'Wdh.':>5} {'Backoff s':>10} {'Budget min':>11}")
+        for provider, t in throttle.items():
+            budget = f"{t['min_factor']:.0%}" if t["rpm"] or t["tpm"] else "–"
+            print(
+                f"{provider:<10} {t['requests']:>9} {t['throttled_s']:>8.2f} {t['throttle_waits']:>7} {t['rate_limited']:>5} "
+                f"{t['overloaded']:>7} {t['retries']:>5} {t['backoff_s']:>10.2f} {budget:>11}"
+            )
+
+    all_server = [ms for name, s in server.items() if name != "gemini" for ms in s["service_ms"]]
+    client_overhead = percentile(latencies, 50) - percentile(all_server, 50) if latencies and all_server else 0.0
+    print("\nZeitanteile (s):")
+    print(f"  Start (Judge, Konfiguration)      {t_ready - t0:8.2f}")
+    print(f"  Adapter vorwärmen                 {sec.get('warmup', 0.0):8.2f}")
+    print(f"  Zeitplan (Generierung)            {sched_s:8.2f}   Untergrenze {ideal_s:.2f} → Overhead {sched_s - ideal_s:+.2f} ({ideal_s / max(sched_s, 1e-9):.0%} Auslastung)")
+    print(f"  Nachbereitung (summary, Figuren)  {wall_s - (t_ready - t0) - sec.get('warmup', 0.0) - sched_s:8.2f}")
+    print(f"  davon im Zeitplan/Abschluss: Judge {judge_s:.2f} · Ergebnis-Writer {sec.get('sink', 0.0) - judge_s:.2f} · Checkpoint {sec.get('checkpoint', 0.0):.2f}")
+    print(f"  Adapter/HTTP-Overhead je Anfrage ≈ {client_overhead:.0f} ms (Median Client − Median Server)")
+    if trace_lines:
+        print()
+        for line in trace_lines:
+            print(line)
+    if args.verbose is False and error:
+        print("\nAusgabe des Orchestrators (letzte Zeilen):")
+        for line in log.getvalue().strip().splitlines()[-8:]:
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark: results.csv (vollständig geparst) vs. results.parquet (nur benötigte Spalten).
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_results_io -n 1000000
+
+Schreibt n synthetische Ergebniszeilen über den ResultSink (CSV + Parquet in Row Groups) in ein
+temporäres Verzeichnis und misst anschließend das Laden von model/run/axis/decision, wie es
+viz.py und die Vergleichsskripte tun. Voraussetzung: pyarrow.
+"""
+from __future__ import annotations
+import argparse
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+
+from src.aggregate import RunSummary
+from src.judge import Judge
+from src.results import ResultSink, open_parquet_writer
+
+_MODELS = [("gpt-4.1", "openai"), ("claude-sonnet-4", "anthropic"), ("grok-4", "xai"), ("teuken-7b", "local")]
+_OPINION = "Abwägung zwischen Autonomie und Fürsorge für Herrn Herrmann. " * 25 + "\nEmpfehlung: PEG: {}"
+_COLUMNS = ["model", "run", "axis", "decision"]
+
+
+@dataclass
+class _Job:
+    index: int
+    model: tuple
+
+
+@dataclass
+class _Gen:
+    text: str
+
+
+def _finish(job: _Job, gen: _Gen, verdict: Dict[str, Any]) -> Dict[str, Any]:
+    name, provider = job.model
+    return {
+        "run": "baseline",
+        "case": "herr_herrmann",
+        "model": name,
+        "provider": provider,
+        "judge_backend": "local",
+        "temperature": 0.7,
+        "top_p": 1.0,
+        "max_tokens": 400,
+        "system_style": "neutral",
+        "sample": job.index // len(_MODELS),
+        "opinion": gen.text,
+        "decision": verdict["decision"],
+        "class": verdict["class_"],
+        "axis": verdict["axis"],
+        "why": verdict["justification"],
+        "latency_ms": 1000,
+        "cache_hit": False,
+        "ttft_ms": None,
+        "ttr_ms": None,
+        "sampler_dropped": "",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ergebnis-I/O-Benchmark (CSV vs. Parquet)")
+    parser.add_argument("-n", type=int, default=200_000, help="Anzahl Ergebniszeilen")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "results.csv"
+        parquet = open_parquet_writer(Path(tmp) / "results.parquet")
+        if parquet is None:
+            raise SystemExit("pyarrow ist nicht installiert (pip install pyarrow).")
+        t0 = time.perf_counter()
+        with ResultSink(csv_path, Judge(), _finish, RunSummary(), judge_batch=4096, writers=[parquet]) as sink:
+            for i in range(args.n):
+                sink.add(_Job(i, _MODELS[i % len(_MODELS)]), _Gen(_OPINION.format(rng.choice(["Ja", "Nein"]))))
+        t_write = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        df_csv = pd.read_csv(csv_path)[_COLUMNS]
+        t_csv = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        df_pq = pd.read_parquet(parquet.path, columns=_COLUMNS)
+        t_pq = time.perf_counter() - t0
+
+        size_csv = csv_path.stat().st_size / 1e6
+        size_pq = parquet.path.stat().st_size / 1e6
+        same = df_csv.reset_index(drop=True).equals(df_pq.reset_index(drop=True))
+
+    print(f"Zeilen: {args.n} · Schreiben (Bewertung + CSV + Parquet): {t_write:.1f} s")
+    print(f"{'Format':<26} {'Größe MB':>9} {'Laden s':>8}")
+    print(f"{'results.csv (komplett)':<26} {size_csv:>9.1f} {t_csv:>8.2f}")
+    print(f"{'results.parquet (4 Sp.)':<26} {size_pq:>9.1f} {t_pq:>8.2f}")
+    print(f"Faktor Laden: {t_csv / max(1e-9, t_pq):.1f}x · Ergebnisse identisch: {same}")
+
+
+if __name__ == "__main__":
+    main()
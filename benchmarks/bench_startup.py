@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark: Startzeit der Kommandozeilen-Einstiege (Wandzeit und Importe per -X importtime).
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --budget-ms 800 --top 15
+
+Startet --help, --validate, --dry-run und judge_test.py jeweils --repeat-mal in einem frischen
+Interpreter, misst den Median der Wandzeit und wertet die Importzeiten aus. Endet mit Exit-Code 1,
+wenn ein Befehl das Budget überschreitet oder ein schweres Paket (SDKs, pandas, matplotlib, torch …)
+schon beim Start importiert – so fallen Regressionen durch neue Top-Level-Importe auf.
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS: List[Tuple[str, List[str]]] = [
+    ("run.py --help", ["run.py", "--help"]),
+    ("run.py --validate", ["run.py", "--run", "all", "--validate"]),
+    ("run.py --dry-run", ["run.py", "--run", "all", "--dry-run"]),
+    ("judge_test.py", ["judge_test.py"]),
+]
+
+# Dürfen beim Start nicht geladen werden (erst bei der ersten Generierung bzw. Auswertung)
+HEAVY_MODULES = (
+    "pandas",
+    "matplotlib",
+    "numpy",
+    "pyarrow",
+    "torch",
+    "transformers",
+    "httpx",
+    "openai",
+    "anthropic",
+    "mistralai",
+    "xai_sdk",
+    "google.genai",
+)
+
+
+def _parse_importtime(stderr: str) -> Tuple[Dict[str, int], int]:
+    """(Modulname -> kumulative Importzeit in µs, Summe der Top-Level-Importe in µs).
+
+    Zeilen 'import time: self | cumulative | name'; verschachtelte Importe sind eingerückt.
+    """
+    imports: Dict[str, int] = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Kopfzeile
+        imports[parts[2].strip()] = int(parts[1])
+        if not parts[2][1:].startswith(" "):
+            total += int(parts[1])
+    return imports, total
+
+
+def _heavy(imports: Dict[str, int]) -> List[str]:
+    return sorted(
+        name for name in imports if any(name == mod or name.startswith(mod + ".") for mod in HEAVY_MODULES)
+    )
+
+
+def _run(argv: List[str], env: Dict[str, str]) -> Tuple[float, Dict[str, int], int, int]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    imports, total = _parse_importtime(proc.stderr)
+    return (time.perf_counter() - t0) * 1000, imports, total, proc.returncode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startzeit-Benchmark der CLI-Einstiege")
+    parser.add_argument("--repeat", type=int, default=5, help="Starts je Befehl (Median)")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="maximale Median-Wandzeit je Befehl")
+    parser.add_argument("--top", type=int, default=8, help="langsamste Importe (kumulativ) je Befehl anzeigen")
+    args = parser.parse_args()
+
+    # Lokaler Judge: der Gemini-Judge lädt bewusst erst bei Bedarf das SDK
+    env = dict(os.environ, JUDGE_BACKEND="local", PYTHONDONTWRITEBYTECODE="1")
+    failed = False
+    print(f"{'Befehl':<22} {'Median ms':>10} {'Min ms':>8} {'Importe ms':>11}  Status")
+    reports: List[Tuple[str, Dict[str, int]]] = []
+    for label, argv in COMMANDS:
+        walls: List[float] = []
+        imports: Dict[str, int] = {}
+        total_us = returncode = 0
+        for _ in range(max(1, args.repeat)):
+            wall, imports, total_us, returncode = _run(argv, env)
+            walls.append(wall)
+        median = statistics.median(walls)
+        total_import_ms = total_us / 1000
+        heavy = _heavy(imports)
+        problems = []
+        if returncode != 0:
+            problems.append(f"Exit-Code {returncode}")
+        if median > args.budget_ms:
+            problems.append(f"über Budget ({args.budget_ms:.0f} ms)")
+        if heavy:
+            problems.append(f"schwere Importe: {', '.join(heavy[:5])}")
+        failed = failed or bool(problems)
+        status = "; ".join(problems) if problems else "ok"
+        print(f"{label:<22} {median:>10.0f} {min(walls):>8.0f} {total_import_ms:>11.0f}  {status}")
+        reports.append((label, imports))
+
+    for label, imports in reports:
+        top = sorted(((us, name) for name, us in imports.items()), reverse=True)[: args.top]
+        print(f"\n{label} – langsamste Importe (kumulativ):")
+        for us, name in top:
+            print(f"  {us / 1000:8.1f} ms  {name}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
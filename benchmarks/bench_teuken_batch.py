@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark: Durchsatz (Tokens/s) von LocalTeukenAdapter.generate_batch auf CPU.
+
+Aufruf (aus dem Projektverzeichnis, benötigt torch/transformers und die Teuken-Gewichte):
+    python -m benchmarks.bench_teuken_batch --batch-sizes 1 4 8 --max-tokens 64
+
+Alle Batchgrößen erzeugen dieselbe Anzahl Antworten (Standard: 8) mit dem Prompt des
+deterministic-Runs (greedy), damit die Zahlen vergleichbar sind. Der Prefix-KV-Cache ist
+standardmäßig aus, sonst misst jede Batchgröße nach der ersten einen bereits gewärmten Prefix;
+mit --prefix-cache-size N wird er je Batchgröße leer gestartet (misst Batching + Prefix-Cache).
+"""
+from __future__ import annotations
+import argparse
+import time
+from pathlib import Path
+
+from src.adapters import local_teuken
+from src.adapters.base import GenerationRequest
+from src.prompts import load_case_text, system_prompt, user_prompt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teuken Batch-Benchmark (CPU)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=8, help="Anzahl Antworten je Batchgröße")
+    parser.add_argument("--max-tokens", type=int, default=64)
+    parser.add_argument("--case", default="herr_herrmann.txt")
+    parser.add_argument(
+        "--prefix-cache-size", type=int, default=0, help="Prefix-KV-Cache (Einträge, 0 = aus wie im reinen Batch-Vergleich)"
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    case_text = load_case_text(str(root / "cases" / args.case))
+    req = GenerationRequest(system_prompt("neutral"), user_prompt(case_text), 0.0, 1.0, args.max_tokens)
+
+    t_load = time.perf_counter()
+    lm = local_teuken.LocalTeukenAdapter(prefix_cache_size=0)._ensure_model()
+    print(f"Modell geladen in {time.perf_counter() - t_load:.1f} s (Gerät: {lm.device})")
+    tokenizer = lm.tokenizer
+
+    print(f"Prefix-Cache: {args.prefix_cache_size or 'aus'}")
+    print(f"{'Batch':>5} {'Anfragen':>8} {'Sekunden':>9} {'Tokens':>7} {'Tokens/s':>9}")
+    for bs in args.batch_sizes:
+        # Jede Batchgröße startet mit leerem Prefix-Cache
+        local_teuken._PREFIX_CACHES.clear()
+        adapter = local_teuken.LocalTeukenAdapter(
+            batch_size=bs, max_batch_tokens=1 << 20, prefix_cache_size=args.prefix_cache_size
+        )
+        t0 = time.perf_counter()
+        texts = adapter.generate_batch([req] * args.requests)
+        dt = time.perf_counter() - t0
+        n_tokens = sum(len(tokenizer.encode(t, add_special_tokens=False)) for t in texts)
+        print(f"{bs:>5} {args.requests:>8} {dt:>9.1f} {n_tokens:>7} {n_tokens / dt:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
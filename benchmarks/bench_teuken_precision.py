@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark: Teuken-Präzisionsmodi auf CPU (fp32 / bf16 / int8).
+
+Aufruf (aus dem Projektverzeichnis, benötigt torch/transformers und die Teuken-Gewichte):
+    python -m benchmarks.bench_teuken_precision --modes fp32 bf16 int8
+
+Jeder Modus läuft in einem eigenen Prozess, damit Ladezeit und Peak-RSS unabhängig gemessen
+werden. Erzeugt wird die Antwort des deterministic-Runs (configs/run_deterministic.yaml, greedy);
+am Ende wird geprüft, ob die Empfehlung (Judge) in allen Modi übereinstimmt.
+"""
+from __future__ import annotations
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: Bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _worker(mode: str, max_tokens: int | None) -> Dict[str, Any]:
+    import yaml
+
+    from src.adapters import local_teuken
+    from src.judge import Judge
+    from src.prompts import load_case_text, system_prompt, user_prompt
+
+    run_cfg = yaml.safe_load((ROOT / "configs" / "run_deterministic.yaml").read_text(encoding="utf-8"))
+    params = run_cfg["params"]
+    system = system_prompt(params.get("system_style", "neutral"))
+    user = user_prompt(load_case_text(str(ROOT / "cases" / run_cfg["case"])))
+    max_new = int(max_tokens or params["max_tokens"])
+
+    adapter = local_teuken.LocalTeukenAdapter(precision=mode, prefix_cache_size=0)
+    t0 = time.perf_counter()
+    lm = adapter._ensure_model()
+    load_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    text = adapter.generate(system, user, float(params["temperature"]), float(params["top_p"]), max_new)
+    gen_s = time.perf_counter() - t0
+    n_tokens = len(lm.tokenizer.encode(text, add_special_tokens=False))
+    return {
+        "mode": mode,
+        "load_s": load_s,
+        "peak_rss_mb": _peak_rss_mb(),
+        "tokens": n_tokens,
+        "tokens_per_s": n_tokens / gen_s if gen_s > 0 else 0.0,
+        "decision": Judge().classify(text)["decision"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teuken Präzisions-Benchmark (CPU)")
+    parser.add_argument("--modes", nargs="+", default=["fp32", "bf16", "int8"])
+    parser.add_argument("--max-tokens", type=int, default=None, help="Standard: max_tokens des deterministic-Runs")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(args.worker, args.max_tokens)))
+        return
+
+    results: List[Dict[str, Any]] = []
+    for mode in args.modes:
+        cmd = [sys.executable, "-m", "benchmarks.bench_teuken_precision", "--worker", mode]
+        if args.max_tokens:
+            cmd += ["--max-tokens", str(args.max_tokens)]
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"[{mode}] fehlgeschlagen:\n{proc.stderr.strip()}")
+            continue
+        # Letzte Zeile der Ausgabe enthält das Ergebnis (davor ggf. Hinweise des Adapters)
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{'Modus':<6} {'Laden s':>8} {'Peak-RSS MB':>12} {'Tokens':>7} {'Tokens/s':>9}  Empfehlung")
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['load_s']:>8.1f} {r['peak_rss_mb']:>12.0f} {r['tokens']:>7} "
+            f"{r['tokens_per_s']:>9.2f}  {r['decision']}"
+        )
+    decisions = {r["decision"] for r in results}
+    if len(results) > 1:
+        print("Empfehlungen stimmen überein." if len(decisions) == 1 else "ACHTUNG: Empfehlungen weichen zwischen den Modi ab.")
+
+
+if __name__ == "__main__":
+    main()
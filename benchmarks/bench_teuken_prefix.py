@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark: Zeit bis zum ersten Token (TTFT) von Teuken mit und ohne Prefix-KV-Cache.
+
+Aufruf (aus dem Projektverzeichnis, benötigt torch/transformers und die Teuken-Gewichte):
+    python -m benchmarks.bench_teuken_prefix -n 5
+
+Gemessen wird generate() mit max_tokens=1 (≈ Prefill des Prompts) für den Prompt des
+deterministic-Runs; der erste Aufruf mit Cache füllt den Cache und wird nicht mitgezählt.
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import List
+
+from src.adapters import local_teuken
+from src.prompts import load_case_text, system_prompt, user_prompt
+
+
+def _ttft(adapter: local_teuken.LocalTeukenAdapter, system: str, user: str, n: int) -> List[float]:
+    lat: List[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        adapter.generate(system, user, 0.0, 1.0, 1)
+        lat.append((time.perf_counter() - t0) * 1000)
+    return lat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teuken Prefix-KV-Cache Benchmark (CPU)")
+    parser.add_argument("-n", type=int, default=5, help="Messungen je Variante")
+    parser.add_argument("--case", default="herr_herrmann.txt")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    system = system_prompt("neutral")
+    user = user_prompt(load_case_text(str(root / "cases" / args.case)))
+
+    without = local_teuken.LocalTeukenAdapter(prefix_cache_size=0)
+    with_cache = local_teuken.LocalTeukenAdapter(prefix_cache_size=4)
+    t_load = time.perf_counter()
+    lm = without._ensure_model()
+    print(f"Modell geladen in {time.perf_counter() - t_load:.1f} s (Gerät: {lm.device})")
+
+    res = {"ohne Cache": _ttft(without, system, user, args.n)}
+    with_cache.generate(system, user, 0.0, 1.0, 1)  # Cache füllen
+    res["mit Cache"] = _ttft(with_cache, system, user, args.n)
+
+    print(f"{'Variante':<12} {'p50 ms':>9} {'Mittel ms':>10}")
+    for name, lat in res.items():
+        print(f"{name:<12} {statistics.median(lat):>9.1f} {statistics.mean(lat):>10.1f}")
+    speedup = statistics.mean(res["ohne Cache"]) / max(1e-9, statistics.mean(res["mit Cache"]))
+    print(f"Faktor (Mittelwert): {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
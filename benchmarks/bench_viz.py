@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark: Entscheidungs-Grid und Achsenvergleich für wachsende Grids (Modelle × Runs).
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m benchmarks.bench_viz
+    python -m benchmarks.bench_viz --sizes 10x4 100x20 1000x200 --samples 3
+
+Misst plot_decision_grid und plot_axis_comparison (ein Pivot, imshow bzw. eine PolyCollection)
+auf synthetischen Daten mit --samples Zeilen je Zelle. Zum Vergleich läuft die frühere
+Variante des Grids (Filter je Zelle, ein Rectangle je Zelle) bis --legacy-max-cells Zellen.
+"""
+from __future__ import annotations
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.viz import plot_axis_comparison, plot_decision_grid  # noqa: E402
+
+_DECISIONS = np.array(["PEG: Ja", "PEG: Nein", "Unklar"])
+
+
+def _synthetic(n_models: int, n_runs: int, samples: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = n_models * n_runs * samples
+    models = np.repeat([f"modell-{i:04d}" for i in range(n_models)], n_runs * samples)
+    runs = np.tile(np.repeat([f"run-{j:03d}" for j in range(n_runs)], samples), n_models)
+    return pd.DataFrame(
+        {"model": models, "run": runs, "decision": _DECISIONS[rng.integers(0, 3, n)], "axis": rng.uniform(-1, 1, n)}
+    )
+
+
+def _legacy_decision_grid(all_df: pd.DataFrame, run_order: List[str], out_png: str) -> None:
+    """Frühere Implementierung (O(Modelle × Runs × Zeilen), ein Patch je Zelle) – nur zum Vergleich."""
+    models = sorted(all_df["model"].unique().tolist())
+    dec_to_code = {"PEG: Ja": 1, "PEG: Nein": -1, "Unklar": 0}
+    colors = {1: "#54A24B", -1: "#E45756", 0: "#9A9A9A"}
+    grid = np.zeros((len(models), len(run_order)), dtype=int)
+    for i, m in enumerate(models):
+        for j, r in enumerate(run_order):
+            row = all_df[(all_df["model"] == m) & (all_df["run"] == r)]
+            grid[i, j] = dec_to_code.get(row.iloc[0]["decision"], 0) if not row.empty else 0
+    plt.figure(figsize=(max(6, 1.2 * len(run_order)), max(4, 0.6 * len(models))))
+    for i in range(len(models)):
+        for j in range(len(run_order)):
+            plt.gca().add_patch(plt.Rectangle((j, i), 1, 1, color=colors.get(grid[i, j], "#9A9A9A")))
+    plt.xlim(0, len(run_order))
+    plt.ylim(0, len(models))
+    plt.xticks(np.arange(len(run_order)) + 0.5, run_order, rotation=20, ha="right")
+    plt.yticks(np.arange(len(models)) + 0.5, models)
+    plt.tight_layout()
+    plt.savefig(out_png, dpi=160, bbox_inches="tight")
+    plt.close()
+
+
+def _timed(fn, *args, **kwargs) -> float:
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - t0
+
+
+def _parse_size(text: str) -> Tuple[int, int]:
+    models, runs = text.lower().split("x")
+    return int(models), int(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Visualisierungs-Benchmark")
+    parser.add_argument("--sizes", nargs="+", default=["10x4", "100x20", "1000x200"], help="Modelle x Runs")
+    parser.add_argument("--samples", type=int, default=1, help="Zeilen je (Modell, Run)")
+    parser.add_argument("--legacy-max-cells", type=int, default=400, help="frühere Variante nur bis zu so vielen Zellen")
+    args = parser.parse_args()
+
+    print(f"{'Grid':>10} {'Zeilen':>9} {'Grid s':>8} {'Achsen s':>9} {'alt Grid s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            n_models, n_runs = _parse_size(size)
+            df = _synthetic(n_models, n_runs, args.samples)
+            run_order = [f"run-{j:03d}" for j in range(n_runs)]
+            t_grid = _timed(plot_decision_grid, df, str(Path(tmp) / "grid.png"), run_order=run_order)
+            t_axis = _timed(plot_axis_comparison, df, str(Path(tmp) / "axis.png"), run_order=run_order)
+            if n_models * n_runs <= args.legacy_max_cells:
+                legacy = f"{_timed(_legacy_decision_grid, df, run_order, str(Path(tmp) / 'legacy.png')):11.2f}"
+            else:
+                legacy = f"{'–':>11}"
+            print(f"{size:>10} {len(df):>9} {t_grid:8.2f} {t_axis:9.2f} {legacy}")
+
+
+if __name__ == "__main__":
+    main()
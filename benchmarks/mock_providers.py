@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""Lokale Stand-in-Server im Wire-Format der Provider (nur Standardbibliothek).
+
+Jeder Server spricht das HTTP-Format eines Providers, sodass die echten Adapter bzw. SDKs per
+base_url darauf zeigen können:
+
+- openai:    POST /v1/chat/completions (JSON oder SSE mit stream=true)     base_url …/v1
+- anthropic: POST /v1/messages (JSON oder SSE-Events mit stream=true)     base_url …
+- xai:       POST /v1/chat/completions (OpenAI-Format) und /v1/messages    base_url …
+- mistral:   POST /v1/chat/completions (OpenAI-kompatibel, SSE mit stream=true)   base_url …
+- gemini:    POST /v1beta/models/<modell>:generateContent (Judge: JSON-Objekt bzw. JSON-Array)
+- teuken:    wie openai (Client-Modus des Teuken-Adapters, server_url …)
+
+Latenz, Fehler- und 429-Quote sowie ein echtes Anfragelimit (rpm_limit: Token-Bucket mit einer
+Sekunde Burst, darüber 429 mit Retry-After) sind je Server über ein LatencyProfile einstellbar.
+Beim Streaming kommt das erste Fragment nach ttft_share der Gesamtlatenz, der Rest verteilt sich
+auf die übrigen Fragmente. Mit trailing_rate folgt auf die Empfehlungszeile ein Nachsatz (wie bei Modellen, die
+die Formatvorgabe ignorieren); bricht der Client danach ab, zählt der Server das als stopped_early.
+
+Einzeln starten (z. B. für manuelle Tests mit run.py):
+    python -m benchmarks.mock_providers --latency lognormal:400:0.5 --rate-429 0.02
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+PROVIDERS = ("openai", "anthropic", "xai", "mistral", "gemini", "teuken")
+
+# Umgebungsvariable bzw. Adapter-Option, mit der der jeweilige Client auf den Mock zeigt
+BASE_URL_ENV = {
+    "openai": "OPENAI_BASE_URL",
+    "anthropic": "ANTHROPIC_BASE_URL",
+    "xai": "XAI_BASE_URL",
+    "mistral": "MISTRAL_BASE_URL",
+    "gemini": "GEMINI_BASE_URL",
+    "teuken": "TEUKEN_SERVER_URL",
+}
+
+_DECISION_RE = re.compile(r"Empfehlung:\s*PEG:\s*(Ja|Nein|Unklar)", flags=re.IGNORECASE)
+
+_SENTENCES = [
+    "Herr Herrmann hat seinen Willen früher klar geäußert.",
+    "Die Patientenverfügung spricht gegen lebensverlängernde Maßnahmen.",
+    "Die Angehörigen wünschen eine Sicherung der Ernährung.",
+    "Eine PEG-Sonde kann Aspiration nicht sicher verhindern.",
+    "Die Würde und das Wohlbefinden stehen im Vordergrund.",
+    "Palliative Begleitung und Mundpflege sind weiterhin möglich.",
+    "Die Abwägung zwischen Autonomie und Fürsorge bleibt schwierig.",
+    "Das Behandlungsteam sollte den mutmaßlichen Willen dokumentieren.",
+]
+
+
+@dataclass
+class LatencyProfile:
+    """Antwortverhalten eines Mock-Servers.
+
+    dist: "fixed", "uniform", "normal" oder "lognormal"; median_ms: Median der Gesamtlatenz;
+    spread: lognormal sigma bzw. relative Streuung (normal: Standardabweichung, uniform: ±Anteil).
+    trailing_rate: Anteil der Antworten mit Nachsatz nach der Empfehlungszeile.
+    rpm_limit: Anfragen pro Minute, darüber 429 mit passendem Retry-After (0 = unbegrenzt).
+    """
+
+    dist: str = "lognormal"
+    median_ms: float = 300.0
+    spread: float = 0.5
+    ttft_share: float = 0.25
+    error_rate: float = 0.0
+    rate_429: float = 0.0
+    retry_after_s: float = 1.0
+    trailing_rate: float = 0.0
+    rpm_limit: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str, **kwargs: Any) -> "LatencyProfile":
+        """'lognormal:300:0.5' | 'fixed:200' | 'uniform:100:0.5' | 'normal:300:0.2'"""
+        parts = spec.split(":")
+        if parts[0] not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unbekannte Latenzverteilung: {parts[0]!r} (erlaubt: fixed, uniform, normal, lognormal)")
+        profile = cls(dist=parts[0], **kwargs)
+        if len(parts) > 1:
+            profile.median_ms = float(parts[1])
+        if len(parts) > 2:
+            profile.spread = float(parts[2])
+        return profile
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.dist == "fixed":
+            value = self.median_ms
+        elif self.dist == "uniform":
+            value = rng.uniform(self.median_ms * (1 - self.spread), self.median_ms * (1 + self.spread))
+        elif self.dist == "normal":
+            value = rng.gauss(self.median_ms, self.median_ms * self.spread)
+        else:
+            value = self.median_ms * math.exp(rng.gauss(0.0, self.spread))
+        return max(1.0, value)
+
+
+@dataclass
+class RequestRecord:
+    path: str
+    status: int
+    service_ms: float  # Zeit vom Eingang der Anfrage bis zum letzten gesendeten Byte
+    stream: bool
+    stopped_early: bool = False
+
+
+def _opinion(rng: random.Random, trailing: bool = False) -> str:
+    """Deutsche Beispielmeinung mit Empfehlungszeile als letzter Zeile (trailing: mit Nachsatz)."""
+    body = " ".join(rng.sample(_SENTENCES, 4))
+    decision = rng.choice(["Ja", "Nein", "Nein", "Unklar"])
+    text = f"{body}\nEmpfehlung: PEG: {decision}"
+    if trailing:
+        # Nachsatz nach der Empfehlung: lohnt den Streaming-Abbruch
+        text += "\nNachbemerkung: " + " ".join(rng.sample(_SENTENCES, 3))
+    return text
+
+
+def _chunks(text: str, size: int = 3) -> List[str]:
+    """Zerlegt Text in Fragmente aus je size Wörtern (Leerzeichen/Zeilenumbrüche bleiben erhalten)."""
+    tokens = re.findall(r"\S+\s*", text)
+    return ["".join(tokens[i : i + size]) for i in range(0, len(tokens), size)] or [text]
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _judge_reply(prompt: str, rng: random.Random) -> str:
+    """Antwort des Gemini-Judges: JSON-Objekt bzw. JSON-Array (Batch mit 'Eingaben:')."""
+
+    def verdict(text: str) -> Dict[str, Any]:
+        m = _DECISION_RE.findall(text)
+        axis = round(rng.uniform(-1.0, 1.0), 2)
+        cls = "Autonomie" if axis <= -0.4 else "Fürsorge" if axis >= 0.4 else "Ausgewogen"
+        decision = f"PEG: {m[-1].capitalize()}" if m and m[-1].lower() != "unklar" else "Unklar"
+        return {"axis": axis, "class": cls, "decision": decision, "justification": "Mock-Bewertung."}
+
+    if "Eingaben:\n" in prompt:
+        try:
+            items = json.loads(prompt.split("Eingaben:\n", 1)[1])
+        except ValueError:
+            items = []
+        return json.dumps([{"id": it.get("id"), **verdict(str(it.get("text", "")))} for it in items], ensure_ascii=False)
+    return json.dumps(verdict(prompt.rsplit("Eingabe:", 1)[-1]), ensure_ascii=False)
+
+
+class MockProviderServer:
+    """Ein Provider-Mock auf 127.0.0.1 (ThreadingHTTPServer in einem Hintergrund-Thread)."""
+
+    def __init__(
+        self, provider: str, profile: LatencyProfile | None = None, host: str = "127.0.0.1", port: int = 0, seed: int = 0
+    ) -> None:
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unbekannter Mock-Provider: {provider!r} (erlaubt: {', '.join(PROVIDERS)})")
+        self.provider = provider
+        self.profile = profile or LatencyProfile()
+        self.records: List[RequestRecord] = []
+        self._lock = threading.Lock()
+        self._rng = random.Random(f"{provider}:{seed}")
+        # Token-Bucket für rpm_limit: (verfügbare Anfragen, Zeitpunkt der letzten Auffüllung)
+        self._bucket = (max(1.0, self.profile.rpm_limit / 60), time.monotonic())
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """Wert für base_url/server_url des zugehörigen Clients."""
+        return f"{self.url}/v1" if self.provider == "openai" else self.url
+
+    def start(self) -> "MockProviderServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"mock-{self.provider}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def admit(self) -> Optional[float]:
+        """Prüft rpm_limit; None: zugelassen, sonst Sekunden bis zur nächsten freien Anfrage."""
+        if self.profile.rpm_limit <= 0:
+            return None
+        rate_s = self.profile.rpm_limit / 60
+        with self._lock:
+            tokens, t = self._bucket
+            now = time.monotonic()
+            tokens = min(max(1.0, rate_s), tokens + (now - t) * rate_s)
+            if tokens >= 1.0:
+                self._bucket = (tokens - 1.0, now)
+                return None
+            self._bucket = (tokens, now)
+            return (1.0 - tokens) / rate_s
+
+    def draw(self) -> Tuple[str, float, random.Random]:
+        """Zufallsentscheidung je Anfrage: ("429" | "500" | "ok", Gesamtlatenz ms, RNG für den Inhalt)."""
+        with self._lock:
+            u = self._rng.random()
+            latency = self.profile.sample_ms(self._rng)
+            rng = random.Random(self._rng.random())
+        if u < self.profile.rate_429:
+            return "429", latency, rng
+        if u < self.profile.rate_429 + self.profile.error_rate:
+            return "500", latency, rng
+        return "ok", latency, rng
+
+    def opinion(self, rng: random.Random) -> str:
+        return _opinion(rng, trailing=rng.random() < self.profile.trailing_rate)
+
+    def record(self, rec: RequestRecord) -> None:
+        with self._lock:
+            self.records.append(rec)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            records = list(self.records)
+        ok = [r for r in records if r.status == 200]
+        return {
+            "provider": self.provider,
+            "requests": len(records),
+            "ok": len(ok),
+            "status_429": sum(1 for r in records if r.status == 429),
+            "status_500": sum(1 for r in records if r.status == 500),
+            "stream": sum(1 for r in ok if r.stream),
+            "stopped_early": sum(1 for r in ok if r.stopped_early),
+            "service_ms": [r.service_ms for r in ok],
+        }
+
+
+def _make_handler(mock: MockProviderServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        # --- Antworten ---
+
+        def _send_json(self, status: int, payload: Any, headers: Dict[str, str] | None = None) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _start_sse(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+        def _write_chunk(self, data: str) -> None:
+            raw = data.encode("utf-8")
+            self.wfile.write(f"{len(raw):x}\r\n".encode("ascii") + raw + b"\r\n")
+            self.wfile.flush()
+
+        def _end_chunks(self) -> None:
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def _error(self, kind: str, retry_after_s: Optional[float] = None) -> int:
+            status = 429 if kind == "429" else 500
+            message = "Rate limit exceeded (mock)" if status == 429 else "Internal server error (mock)"
+            headers: Dict[str, str] = {}
+            if status == 429:
+                # Wie OpenAI: ganze Sekunden in Retry-After, genauer Wert in retry-after-ms
+                retry_after_s = mock.profile.retry_after_s if retry_after_s is None else retry_after_s
+                headers = {"Retry-After": str(math.ceil(retry_after_s)), "retry-after-ms": str(int(retry_after_s * 1000))}
+            if mock.provider == "anthropic" or self.path.endswith("/messages"):
+                err_type = "rate_limit_error" if status == 429 else "api_error"
+                payload: Any = {"type": "error", "error": {"type": err_type, "message": message}}
+            elif mock.provider == "gemini":
+                payload = {"error": {"code": status, "message": message, "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+            else:
+                payload = {"error": {"message": message, "type": "rate_limit_exceeded" if status == 429 else "server_error"}}
+            self._send_json(status, payload, headers)
+            return status
+
+        # --- Formate ---
+
+        def _openai(self, req: Dict[str, Any], text: str, latency_ms: float, t0: float) -> bool:
+            model = str(req.get("model", "mock"))
+            created = int(time.time())
+            prompt_tokens = _tokens(json.dumps(req.get("messages", []), ensure_ascii=False))
+            if not req.get("stream"):
+                _sleep_until(t0, latency_ms)
+                self._send_json(
+                    200,
+                    {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                        "usage": {
+                            "prompt_tokens": prompt_tokens,
+                            "completion_tokens": _tokens(text),
+                            "total_tokens": prompt_tokens + _tokens(text),
+                        },
+                    },
+                )
+                return False
+
+            def event(delta: Dict[str, Any], finish: str | None = None) -> str:
+                chunk = {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+                return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+            return self._stream(
+                [event({"role": "assistant", "content": ""})],
+                [event({"content": piece}) for piece in _chunks(text)],
+                [event({}, "stop"), "data: [DONE]\n\n"],
+                latency_ms,
+                t0,
+            )
+
+        def _anthropic(self, req: Dict[str, Any], text: str, latency_ms: float, t0: float) -> bool:
+            model = str(req.get("model", "mock"))
+            input_tokens = _tokens(json.dumps(req.get("messages", []), ensure_ascii=False) + str(req.get("system", "")))
+            message = {
+                "id": "msg_mock",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "stop_sequence": None,
+            }
+            if not req.get("stream"):
+                _sleep_until(t0, latency_ms)
+                self._send_json(
+                    200,
+                    {
+                        **message,
+                        "content": [{"type": "text", "text": text}],
+                        "stop_reason": "end_turn",
+                        "usage": {"input_tokens": input_tokens, "output_tokens": _tokens(text)},
+                    },
+                )
+                return False
+
+            def event(name: str, data: Dict[str, Any]) -> str:
+                return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+            start = {**message, "content": [], "stop_reason": None, "usage": {"input_tokens": input_tokens, "output_tokens": 1}}
+            return self._stream(
+                [
+                    event("message_start", {"type": "message_start", "message": start}),
+                    event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+                ],
+                [
+                    event("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}})
+                    for piece in _chunks(text)
+                ],
+                [
+                    event("content_block_stop", {"type": "content_block_stop", "index": 0}),
+                    event(
+                        "message_delta",
+                        {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": _tokens(text)}},
+                    ),
+                    event("message_stop", {"type": "message_stop"}),
+                ],
+                latency_ms,
+                t0,
+            )
+
+        def _gemini(self, req: Dict[str, Any], rng: random.Random, latency_ms: float, t0: float) -> bool:
+            prompt = "".join(
+                str(part.get("text", "")) for content in req.get("contents", []) or [] for part in content.get("parts", []) or []
+            )
+            reply = _judge_reply(prompt, rng)
+            _sleep_until(t0, latency_ms)
+            self._send_json(
+                200,
+                {
+                    "candidates": [{"content": {"role": "model", "parts": [{"text": reply}]}, "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": {
+                        "promptTokenCount": _tokens(prompt),
+                        "candidatesTokenCount": _tokens(reply),
+                        "totalTokenCount": _tokens(prompt) + _tokens(reply),
+                    },
+                    "modelVersion": self.path.split("/models/", 1)[-1].split(":", 1)[0],
+                },
+            )
+            return False
+
+        def _stream(self, head: List[str], body: List[str], tail: List[str], latency_ms: float, t0: float) -> bool:
+            """Sendet SSE-Ereignisse mit Verzögerungen; True, wenn der Client vorzeitig abbricht."""
+            ttft_ms = latency_ms * mock.profile.ttft_share
+            step_ms = (latency_ms - ttft_ms) / max(1, len(body))
+            try:
+                self._start_sse()
+                for data in head:
+                    self._write_chunk(data)
+                for i, data in enumerate(body):
+                    _sleep_until(t0, ttft_ms + i * step_ms)
+                    self._write_chunk(data)
+                _sleep_until(t0, latency_ms)
+                for data in tail:
+                    self._write_chunk(data)
+                self._end_chunks()
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+                return True
+            return False
+
+        # --- Routing ---
+
+        def do_POST(self) -> None:  # noqa: N802
+            t0 = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                req = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                req = {}
+            path = self.path.split("?", 1)[0]
+            kind, latency_ms, rng = mock.draw()
+            stream = bool(req.get("stream"))
+            wait_s = mock.admit()
+            if wait_s is not None:
+                status = self._error("429", wait_s)
+                mock.record(RequestRecord(path, status, (time.perf_counter() - t0) * 1000, stream))
+                return
+            if kind != "ok":
+                status = self._error(kind)
+                mock.record(RequestRecord(path, status, (time.perf_counter() - t0) * 1000, stream))
+                return
+            if mock.provider == "gemini" and ":generateContent" in path:
+                stopped = self._gemini(req, rng, latency_ms, t0)
+            elif path.endswith("/messages") and mock.provider in ("anthropic", "xai"):
+                stopped = self._anthropic(req, mock.opinion(rng), latency_ms, t0)
+            elif path.endswith("/chat/completions") and mock.provider in ("openai", "xai", "mistral", "teuken"):
+                stopped = self._openai(req, mock.opinion(rng), latency_ms, t0)
+            else:
+                self._send_json(404, {"error": {"message": f"Unbekannter Pfad: {path}", "type": "invalid_request_error"}})
+                mock.record(RequestRecord(path, 404, (time.perf_counter() - t0) * 1000, stream))
+                return
+            mock.record(RequestRecord(path, 200, (time.perf_counter() - t0) * 1000, stream, stopped))
+
+        def do_GET(self) -> None:  # noqa: N802
+            # /health für den Teuken-Client-Modus (warmup)
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok", "model": f"mock-{mock.provider}"})
+            else:
+                self._send_json(404, {"error": {"message": f"Unbekannter Pfad: {self.path}"}})
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+def _sleep_until(t0: float, offset_ms: float) -> None:
+    delay = t0 + offset_ms / 1000 - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def start_mocks(
+    providers: List[str], profile: LatencyProfile, seed: int = 0, port_base: int = 0
+) -> Dict[str, MockProviderServer]:
+    """Startet je Provider einen Server (port_base 0: freie Ports)."""
+    return {
+        name: MockProviderServer(name, profile, port=port_base + i if port_base else 0, seed=seed).start()
+        for i, name in enumerate(providers)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock-Server im Wire-Format der Provider")
+    parser.add_argument("--providers", nargs="+", default=list(PROVIDERS), choices=PROVIDERS)
+    parser.add_argument("--latency", default="lognormal:300:0.5", help="Verteilung:Median_ms[:Streuung]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil HTTP 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Anteil HTTP 429 (mit Retry-After)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After in Sekunden bei 429")
+    parser.add_argument("--trailing-rate", type=float, default=0.0, help="Anteil Antworten mit Nachsatz nach der Empfehlung")
+    parser.add_argument("--rpm-limit", type=float, default=0.0, help="Anfragelimit je Mock pro Minute (0 = unbegrenzt)")
+    parser.add_argument("--port-base", type=int, default=9100, help="erster Port (je Provider +1)")
+    args = parser.parse_args()
+
+    profile = LatencyProfile.parse(
+        args.latency,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        retry_after_s=args.retry_after,
+        trailing_rate=args.trailing_rate,
+        rpm_limit=args.rpm_limit,
+    )
+    mocks = start_mocks(args.providers, profile, port_base=args.port_base)
+    print("Mock-Server laufen (Strg+C beendet). Umgebung für run.py:")
+    for name, mock in mocks.items():
+        print(f"  export {BASE_URL_ENV[name]}={mock.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for mock in mocks.values():
+            mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,114 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import argparse
+import sys
 from pathlib import Path
 
-from src.orchestrator import Orchestrator
+RUNS = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Demenz Ethik Checker – Läufe starten")
+    parser.add_argument(
+        "--run",
+        required=True,
+        nargs="+",
+        choices=RUNS + ["all"],
+        help="Name des Runs; mehrere Namen oder 'all' laufen in einem Prozess mit gemeinsamem Zeitplan",
+    )
+    parser.add_argument(
+        "--mode",
+        default="threads",
+        choices=["threads", "async", "sequential"],
+        help="Ausführung: parallel über Threads, über eine asyncio-Event-Loop (async) oder nacheinander",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        choices=["rw", "ro", "off"],
+        help="Generierungs-Cache: rw (lesen+schreiben), ro (nur Replay), off (Standard: GEN_CACHE_MODE bzw. off)",
+    )
+    parser.add_argument(
+        "--judge-cache",
+        default=None,
+        choices=["rw", "ro", "off"],
+        help="Judge-Cache: rw, ro oder off (Standard: JUDGE_CACHE_MODE bzw. rw)",
+    )
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Streaming mit Abbruch nach 'Empfehlung: PEG: …' (Standard: 'stream' aus der Run-Config)",
+    )
+    parser.add_argument(
+        "--n-samples",
+        type=int,
+        default=None,
+        help="Wiederholungen je Modell (Standard: 'n_samples' aus der Run-Config bzw. 1; 'n_samples' am Modell hat Vorrang)",
+    )
+    parser.add_argument(
+        "--case",
+        nargs="+",
+        default=None,
+        help="Fallvignette(n) in cases/: Dateinamen oder Glob-Muster, z. B. '*.txt' (Standard: 'case' aus der Run-Config)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Abgeschlossene Generierungen aus outputs/<run>/checkpoint.jsonl übernehmen, nur fehlende erzeugen",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        choices=["jsonl", "otlp", "off"],
+        help="Span-Tracing aller Phasen nach outputs/<run>/trace.jsonl bzw. trace.otlp.json plus Zeitverteilung "
+        "(Standard: TRACE_FORMAT bzw. off)",
+    )
+    check = parser.add_mutually_exclusive_group()
+    check.add_argument(
+        "--validate",
+        action="store_true",
+        help="Nur models.yaml, Run-Configs und Fallvignetten prüfen (keine Adapter, kein Judge)",
+    )
+    check.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Zeitplan (Generierungen je Run und Modell) anzeigen, ohne Anfragen zu senden",
+    )
+    args = parser.parse_args()
+
+    # Erst nach dem Parsen laden: --help kommt ohne dotenv, YAML und Orchestrator aus
     # .env laden (lokale API-Keys, Konfigurationen)
     try:
         from dotenv import load_dotenv  # type: ignore
         load_dotenv()
     except Exception:
         pass
-    parser = argparse.ArgumentParser(description="Demenz Ethik Checker – Läufe starten")
-    parser.add_argument("--run", required=True, choices=["baseline", "deterministic", "autonomy_bias", "care_bias"], help="Name des Runs")
-    args = parser.parse_args()
+    from src.orchestrator import Orchestrator
+
+    runs = RUNS if "all" in args.run else list(dict.fromkeys(args.run))
 
     root = Path(__file__).parent
-    orchestrator = Orchestrator(str(root))
-    orchestrator.run(args.run)
+    with Orchestrator(
+        str(root), cache_mode=args.cache, judge_cache_mode=args.judge_cache, trace_format=args.trace
+    ) as orchestrator:
+        if args.validate:
+            errors = orchestrator.validate(runs)
+            if errors:
+                print(f"Konfiguration ungültig ({len(errors)} Fehler):")
+                for msg in errors:
+                    print(f"  - {msg}")
+                sys.exit(1)
+            print(f"Konfiguration gültig: configs/models.yaml und {len(runs)} Run-Config(s).")
+            return
+        if args.dry_run:
+            orchestrator.dry_run(
+                runs, mode=args.mode, stream=args.stream, n_samples=args.n_samples, case=args.case, resume=args.resume
+            )
+            return
+        orchestrator.run_many(
+            runs, mode=args.mode, stream=args.stream, n_samples=args.n_samples, case=args.case, resume=args.resume
+        )
 
 
 if __name__ == "__main__":
@@ -1,58 +1,194 @@
 from __future__ import annotations
+import inspect
 import os
-from typing import List
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .base import Adapter
+from ..tracing import traced
+from . import negotiation
+from .base import SDK_MAX_RETRIES, Adapter, note_sampler_dropped, resolve_base_url
+from .registry import register_adapter
 
+# Stufen weggelassener Sampler-Parameter, falls das Modell sie ablehnt (neuere Modelle: nicht beide zugleich)
+SAMPLER_DROPS: Tuple[Tuple[str, ...], ...] = ((), ("top_p",), ("temperature", "top_p"))
 
+
+def _is_sampler_rejection(exc: Exception) -> bool:
+    """HTTP 400 invalid_request_error der API, die temperature/top_p benennt (z. B. nicht beide zugleich)."""
+    if getattr(exc, "status_code", None) != 400:
+        return False
+    body = getattr(exc, "body", None)
+    error = body.get("error") if isinstance(body, dict) else None
+    if not isinstance(error, dict) or error.get("type") != "invalid_request_error":
+        return False
+    message = str(error.get("message", ""))
+    return "temperature" in message or "top_p" in message
+
+
+class _ModelLadder:
+    """Modelle × Sampler-Stufen in Verhandlungsreihenfolge (gemerkte Kombination zuerst).
+
+    Nach einem Fehler entscheidet failed(), ob die nächste Variante versucht wird; succeeded()
+    merkt sich die funktionierende Kombination im Verhandlungs-Cache.
+    """
+
+    def __init__(self, key: str, models: List[str], dropped: Tuple[str, ...]) -> None:
+        self.key = key
+        self.models = models
+        self.dropped = dropped
+        self.last_exc: Exception | None = None
+        self._i = 0
+
+    def __iter__(self) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        while self._i < len(self.models):
+            yield self.models[self._i], self.dropped
+
+    def failed(self, exc: Exception) -> bool:
+        """True: nächste Variante versuchen; False: Fehler weiterreichen (z. B. Rate-Limit beim ersten Modell)."""
+        if _is_sampler_rejection(exc) and self.dropped != SAMPLER_DROPS[-1]:
+            self.dropped = SAMPLER_DROPS[SAMPLER_DROPS.index(self.dropped) + 1]
+            return True
+        # Erstes Modell: nur "nicht gefunden" führt zur Fallback-Liste; weitere Modelle: jeder Fehler
+        if self._i == 0 and getattr(exc, "status_code", None) != 404:
+            return False
+        self.last_exc = exc
+        self._i += 1
+        return True
+
+    def succeeded(self) -> None:
+        negotiation.shared().put(self.key, {"model": self.models[self._i], "dropped": list(self.dropped)})
+
+    def exhausted(self) -> None:
+        negotiation.shared().forget(self.key)
+
+
+@register_adapter("anthropic_claude", streaming=True, native_async=True)
 class AnthropicClaudeAdapter(Adapter):
-    """Anthropic-Adapter (Messages API) für "claude-sonnet-4"."""
+    """Anthropic-Adapter (Messages API) für "claude-sonnet-4".
 
-    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+    Der SDK-Client (mit internem Keep-Alive-Pool) wird einmalig erzeugt und wiederverwendet;
+    agenerate() nutzt AsyncAnthropic; stream() liefert Textfragmente (messages.stream).
+    base_url (Option in models.yaml bzw. ANTHROPIC_BASE_URL) lenkt Anfragen an einen anderen
+    Endpunkt (ohne /v1), z. B. den Mock-Server der Benchmarks.
+    Das funktionierende Modell aus der Fallback-Liste und die abgelehnten Sampler-Parameter werden
+    gemerkt (negotiation.py); spätere Aufrufe beginnen direkt dort. Weggelassene Parameter werden
+    gemeldet (Spalte sampler_dropped).
+    """
+
+    # Primär gewünschtes Modell und Fallback-Liste
+    PRIMARY_MODEL = "claude-sonnet-4-20250514"
+    FALLBACK_MODELS = [
+        "claude-3-7-sonnet-latest",
+        "claude-3-5-sonnet-latest",
+        "claude-3-5-sonnet-20241022",
+    ]
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = resolve_base_url(base_url, "ANTHROPIC_BASE_URL")
+        self._client: Any = None
+        self._aclient: Any = None
+        self._lock = threading.Lock()
+        self._sampler_in_body: bool | None = None
+
+    @staticmethod
+    def _api_key() -> str:
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise RuntimeError(
                 "ANTHROPIC_API_KEY fehlt. Bitte .env anlegen und Schlüssel setzen."
             )
+        return api_key
 
-        # Lazy import, um Importfehler ohne Key/Installation zu vermeiden
-        import anthropic  # type: ignore
-
-        client = anthropic.Anthropic(api_key=api_key)
-
-        # Primär gewünschtes Modell und Fallback-Liste
-        primary_model = "claude-sonnet-4-20250514"
-        fallbacks = [
-            "claude-3-7-sonnet-latest",
-            "claude-3-5-sonnet-latest",
-            "claude-3-5-sonnet-20241022",
-        ]
-
-        def _call(model_id: str):
-            return client.messages.create(
-                model=model_id,
-                system=system,
-                messages=[{"role": "user", "content": user}],
-                temperature=temperature,
-                top_p=top_p,
-                max_tokens=max_tokens,
-            )
+    def _get_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._client is None:
+                # Lazy import, um Importfehler ohne Key/Installation zu vermeiden
+                import anthropic  # type: ignore
+
+                self._client = anthropic.Anthropic(api_key=api_key, base_url=self.base_url, max_retries=SDK_MAX_RETRIES)
+            return self._client
+
+    def _get_async_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._aclient is None:
+                import anthropic  # type: ignore
+
+                self._aclient = anthropic.AsyncAnthropic(api_key=api_key, base_url=self.base_url, max_retries=SDK_MAX_RETRIES)
+            return self._aclient
+
+    def warmup(self) -> None:
+        if os.getenv("ANTHROPIC_API_KEY"):
+            self._get_client(self._api_key())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        with self._lock:
+            aclient, self._aclient = self._aclient, None
+        if aclient is not None:
+            await aclient.close()
 
-        try:
-            resp = _call(primary_model)
-        except anthropic.NotFoundError:
-            last_exc = None
-            for fb in fallbacks:
-                try:
-                    resp = _call(fb)
-                    break
-                except Exception as e:  # weiterhin versuchen
-                    last_exc = e
-            else:
-                raise RuntimeError(
-                    "Anthropic-Modell nicht verfügbar. Bitte in configs/models.yaml eine verfügbare Sonnet-Variante setzen (z. B. 'claude-3-7-sonnet-latest')."
-                ) from last_exc
+    def _request_kwargs(
+        self,
+        create: Any,
+        model_id: str,
+        dropped: Tuple[str, ...],
+        system: str,
+        user: str,
+        temperature: float,
+        top_p: float,
+        max_tokens: int,
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = dict(
+            model=model_id,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+            max_tokens=max_tokens,
+        )
+        # top_p = 1.0 entspricht dem API-Standard; weglassen, da neuere Modelle temperature und
+        # top_p nicht zugleich annehmen
+        sampler: Dict[str, Any] = {"temperature": temperature}
+        if top_p < 1.0:
+            sampler["top_p"] = top_p
+        sampler = {k: v for k, v in sampler.items() if k not in dropped}
+        if self._sampler_in_body is None:
+            # Manche SDK-Versionen kennen temperature/top_p nicht als Argument: dann im Request-Body
+            self._sampler_in_body = "temperature" not in inspect.signature(create).parameters
+        if self._sampler_in_body:
+            kwargs["extra_body"] = sampler
+        else:
+            kwargs.update(sampler)
+        return kwargs
 
+    def _ladder(self) -> _ModelLadder:
+        key = negotiation.negotiation_key("anthropic_claude", self.base_url, self.PRIMARY_MODEL)
+        known = negotiation.shared().get(key) or {}
+        models = [self.PRIMARY_MODEL, *self.FALLBACK_MODELS]
+        if known.get("model") in models:
+            models.remove(known["model"])
+            models.insert(0, known["model"])
+        dropped = tuple(known.get("dropped") or ())
+        return _ModelLadder(key, models, dropped if dropped in SAMPLER_DROPS else SAMPLER_DROPS[0])
+
+    def _note_dropped(self, model_id: str, dropped: Tuple[str, ...], top_p: float) -> None:
+        # top_p = 1.0 wird ohnehin nicht gesendet und fehlt daher nicht
+        note_sampler_dropped(model_id, [p for p in dropped if p != "top_p" or top_p < 1.0])
+
+    @staticmethod
+    def _unavailable(last_exc: Exception | None) -> RuntimeError:
+        err = RuntimeError(
+            "Anthropic-Modell nicht verfügbar. Bitte in configs/models.yaml eine verfügbare Sonnet-Variante setzen (z. B. 'claude-3-7-sonnet-latest')."
+        )
+        err.__cause__ = last_exc
+        return err
+
+    @staticmethod
+    @traced("generate.parse")
+    def _extract_text(resp: Any) -> str:
         # resp.content ist eine Liste von Content-Blocks; extrahiere Text-Inhalte
         parts: List[str] = []
         for block in getattr(resp, "content", []) or []:
@@ -61,3 +197,63 @@ class AnthropicClaudeAdapter(Adapter):
             if isinstance(text, str):
                 parts.append(text)
         return "".join(parts).strip()
+
+    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        client = self._get_client(self._api_key())
+        ladder = self._ladder()
+        for model_id, dropped in ladder:
+            try:
+                resp = client.messages.create(
+                    **self._request_kwargs(client.messages.create, model_id, dropped, system, user, temperature, top_p, max_tokens)
+                )
+            except Exception as e:
+                if not ladder.failed(e):
+                    raise
+                continue
+            ladder.succeeded()
+            self._note_dropped(model_id, dropped, top_p)
+            return self._extract_text(resp)
+        ladder.exhausted()
+        raise self._unavailable(ladder.last_exc)
+
+    async def agenerate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        client = self._get_async_client(self._api_key())
+        ladder = self._ladder()
+        for model_id, dropped in ladder:
+            try:
+                resp = await client.messages.create(
+                    **self._request_kwargs(client.messages.create, model_id, dropped, system, user, temperature, top_p, max_tokens)
+                )
+            except Exception as e:
+                if not ladder.failed(e):
+                    raise
+                continue
+            ladder.succeeded()
+            self._note_dropped(model_id, dropped, top_p)
+            return self._extract_text(resp)
+        ladder.exhausted()
+        raise self._unavailable(ladder.last_exc)
+
+    def stream(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> Iterator[str]:
+        client = self._get_client(self._api_key())
+        ladder = self._ladder()
+        for model_id, dropped in ladder:
+            try:
+                manager = client.messages.stream(
+                    **self._request_kwargs(client.messages.stream, model_id, dropped, system, user, temperature, top_p, max_tokens)
+                )
+                stream = manager.__enter__()
+            except Exception as e:
+                if not ladder.failed(e):
+                    raise
+                continue
+            ladder.succeeded()
+            self._note_dropped(model_id, dropped, top_p)
+            try:
+                yield from stream.text_stream
+            finally:
+                # Verlassen des Stream-Kontexts schließt die Verbindung
+                manager.__exit__(None, None, None)
+            return
+        ladder.exhausted()
+        raise self._unavailable(ladder.last_exc)
@@ -1,6 +1,32 @@
 from __future__ import annotations
+import asyncio
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Iterator, List, Optional, Protocol, Sequence, Set
+
+# Keine SDK-eigenen Wiederholungen (max_retries der SDK-Clients): 429/Überlast behandelt
+# src/ratelimit.py je Provider, sonst vervielfachen sich Wartezeiten und Anfragen
+SDK_MAX_RETRIES = 0
+
+# Vollständige Empfehlungszeile (inkl. Zeilenende) im gestreamten Text
+RECOMMENDATION_LINE_RE = re.compile(r"Empfehlung:\s*PEG:\s*(Ja|Nein|Unklar)\b[^\n]*\n", flags=re.IGNORECASE)
+
+
+class RateLimitError(RuntimeError):
+    """Provider hat die Anfrage wegen Rate-Limit (HTTP 429) oder Überlast abgewiesen.
+
+    Adapter ohne SDK-Fehlerklassen (eigene HTTP-Aufrufe) werfen diesen Fehler; src/ratelimit.py
+    wartet dann mindestens retry_after Sekunden (Header Retry-After) und wiederholt die Anfrage.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, status: int = 429) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status
 
 
 class Adapter(Protocol):
@@ -16,6 +42,175 @@ class Adapter(Protocol):
         """
         ...
 
+    async def agenerate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        """Asynchrone Variante von generate().
+
+        Standard: blockierendes generate() in einem Worker-Thread ausführen. Adapter mit
+        nativem Async-Client überschreiben diese Methode.
+        """
+        return await asyncio.to_thread(self.generate, system, user, temperature, top_p, max_tokens)
+
+    def warmup(self) -> None:
+        """Bereitet die erste Anfrage vor (SDK importieren, Client erzeugen, Modell laden).
+
+        Wird vor dem Zeitplan parallel für alle benötigten Adapter aufgerufen. Adapter mit API-Key
+        bauen den Client nur bei gesetztem Key; sonst meldet erst die Generierung den Fehler.
+        Standard: nichts zu tun.
+        """
+        return None
+
+    def close(self) -> None:
+        """Gibt langlebige Ressourcen (HTTP-/SDK-Clients) frei. Standard: nichts zu tun."""
+        return None
+
+    async def aclose(self) -> None:
+        """Schließt async Clients (innerhalb der Event-Loop aufrufen). Standard: nichts zu tun."""
+        return None
+
+
+# Sampler-Parameter, die Adapter weglassen, wenn ein Modell sie ablehnt (Reihenfolge der Spalte)
+SAMPLER_PARAMS = ("temperature", "top_p")
+
+# Weggelassene Sampler-Parameter der laufenden Generierung (gesetzt von sampler_tracking)
+_dropped_sampler: ContextVar[Optional[List[str]]] = ContextVar("dropped_sampler", default=None)
+_warned_sampler: Set[str] = set()
+
+
+def note_sampler_dropped(model: str, params: Sequence[str]) -> None:
+    """Adapter melden: die Anfrage an model lief ohne params, weil das Modell sie ablehnt.
+
+    Der Orchestrator trägt sie in die Ergebniszeile ein (Spalte sampler_dropped); je Modell und
+    Prozess erscheint einmal eine Warnung.
+    """
+    if not params:
+        return
+    dropped = _dropped_sampler.get()
+    if dropped is not None:
+        dropped[:] = [p for p in SAMPLER_PARAMS if p in params or p in dropped]
+    key = f"{model}|{','.join(params)}"
+    if key not in _warned_sampler:
+        _warned_sampler.add(key)
+        print(f"Warnung: {model} lehnt {'/'.join(params)} ab – Anfragen ohne diese Parameter (Spalte sampler_dropped).")
+
+
+@contextmanager
+def sampler_tracking() -> Iterator[List[str]]:
+    """Sammelt die per note_sampler_dropped() gemeldeten Parameter einer Generierung.
+
+    Die Liste wird geteilt, nicht kopiert: Meldungen aus asyncio.to_thread oder Generatoren
+    (stream()) innerhalb des Blocks kommen an.
+    """
+    dropped: List[str] = []
+    token = _dropped_sampler.set(dropped)
+    try:
+        yield dropped
+    finally:
+        _dropped_sampler.reset(token)
+
+
+def resolve_base_url(option: Optional[str], env_var: str) -> Optional[str]:
+    """Endpunkt eines Adapters: Option base_url aus models.yaml, sonst Umgebungsvariable env_var.
+
+    Dient z. B. dazu, Anfragen an einen lokalen Mock-Server für Benchmarks zu lenken. Eine gesetzte
+    Option hat Vorrang (auch leer: dann Standard-Endpunkt); None bedeutet Standard-Endpunkt der SDK.
+    """
+    url = os.getenv(env_var, "") if option is None else option
+    return url.strip().rstrip("/") or None
+
+
+def pooled_http_client(timeout: float = 60.0) -> Any:
+    """Erzeugt einen httpx.Client mit Keep-Alive-Connection-Pool.
+
+    Adapter halten genau einen solchen Client pro Instanz (lazy erzeugt), sodass
+    TLS- und Verbindungsaufbau nur einmal pro Prozess anfallen.
+    """
+    import httpx
+
+    return httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=120.0),
+    )
+
+
+def pooled_async_http_client(timeout: float = 60.0) -> Any:
+    """Async-Gegenstück zu pooled_http_client() (gebunden an die erzeugende Event-Loop)."""
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=256, max_keepalive_connections=64, keepalive_expiry=120.0),
+    )
+
+
+class StreamingAdapter(Adapter, Protocol):
+    """Optionale Erweiterung: Adapter, die Text inkrementell liefern können."""
+
+    def stream(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> Iterator[str]:
+        """Liefert Textfragmente in Empfangsreihenfolge.
+
+        Das Schließen des Generators (close()) muss die zugrunde liegende Anfrage abbrechen.
+        """
+        ...
+
+
+@dataclass(frozen=True)
+class GenerationRequest:
+    """Eine Anfrage für Batch-Adapter (generate_batch)."""
+
+    system: str
+    user: str
+    temperature: float
+    top_p: float
+    max_tokens: int
+
+
+class BatchingAdapter(Adapter, Protocol):
+    """Optionale Erweiterung: Adapter, die mehrere Anfragen in einem Forward-Pass erzeugen."""
+
+    def generate_batch(self, requests: List[GenerationRequest]) -> List[str]:
+        """Erzeugt Antworttexte in Eingabereihenfolge."""
+        ...
+
+
+@dataclass
+class StreamResult:
+    text: str
+    ttft_ms: Optional[int]  # Zeit bis zum ersten Textfragment
+    ttr_ms: Optional[int]  # Zeit bis zur vollständigen Empfehlungszeile (None: nicht gefunden)
+    stopped_early: bool
+
+
+def consume_until_recommendation(chunks: Iterator[str], t0: float | None = None) -> StreamResult:
+    """Liest einen Text-Stream, bis die Zeile 'Empfehlung: PEG: …' vollständig ist.
+
+    Danach wird der Stream geschlossen (bricht die Anfrage ab); Text nach der Empfehlungszeile
+    wird verworfen. t0: Startzeitpunkt (time.perf_counter) für die Zeitmessung.
+    """
+    t0 = time.perf_counter() if t0 is None else t0
+    buf = ""
+    ttft_ms: Optional[int] = None
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if ttft_ms is None:
+                ttft_ms = int((time.perf_counter() - t0) * 1000)
+            # Nur den Bereich ab der letzten angefangenen Zeile neu durchsuchen
+            start = buf.rfind("\n", 0, max(0, len(buf) - 1)) + 1
+            buf += chunk
+            m = RECOMMENDATION_LINE_RE.search(buf, start)
+            if m:
+                ttr_ms = int((time.perf_counter() - t0) * 1000)
+                return StreamResult(buf[: m.end()].strip(), ttft_ms, ttr_ms, True)
+    finally:
+        closer = getattr(chunks, "close", None)
+        if callable(closer):
+            closer()
+    # Stream regulär beendet: Empfehlung ggf. in letzter Zeile ohne Zeilenumbruch
+    m = RECOMMENDATION_LINE_RE.search(buf + "\n")
+    ttr_ms = int((time.perf_counter() - t0) * 1000) if m else None
+    return StreamResult(buf.strip(), ttft_ms, ttr_ms, False)
+
 
 @dataclass
 class AdapterConfig:
@@ -1,55 +1,143 @@
 from __future__ import annotations
 import os
-from typing import Any, List
+import threading
+from typing import Any, Iterator, List, Optional
 
-from .base import Adapter
+from ..tracing import traced
+from .base import Adapter, pooled_async_http_client, pooled_http_client, resolve_base_url
+from .registry import register_adapter
 
 
+@register_adapter("local_mistral", streaming=True, native_async=True)
 class LocalMistralAdapter(Adapter):
     """Adapter für Mistral AI über die offizielle SDK (La Plateforme).
 
     Erwartet Umgebungsvariable MISTRAL_API_KEY.
     Standardmodell: "ministral-3b-2410" (kleines, kostengünstiges Modell).
+    SDK-Client und zugrunde liegender httpx-Pool werden einmalig erzeugt und wiederverwendet;
+    agenerate() nutzt chat.complete_async mit eigenem httpx.AsyncClient; stream() nutzt chat.stream.
+    base_url (Option in models.yaml bzw. MISTRAL_BASE_URL) setzt die server_url der SDK, z. B. auf
+    den Mock-Server der Benchmarks.
     """
 
-    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+    # Modell-ID – vom Nutzer gewünscht
+    MODEL_ID = "ministral-3b-2410"
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = resolve_base_url(base_url, "MISTRAL_BASE_URL")
+        self._client: Any = None
+        self._http: Any = None
+        self._aclient: Any = None
+        self._ahttp: Any = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _api_key() -> str:
         api_key = os.getenv("MISTRAL_API_KEY")
         if not api_key:
             raise RuntimeError(
                 "MISTRAL_API_KEY fehlt. Bitte .env anlegen und Schlüssel setzen."
             )
+        return api_key
 
+    @staticmethod
+    def _sdk_class() -> Any:
         try:
             from mistralai import Mistral  # type: ignore
         except ImportError as e:
             raise RuntimeError(
                 "mistralai ist nicht installiert. Bitte 'pip install mistralai' ausführen oder requirements.txt installieren."
             ) from e
+        return Mistral
+
+    def _get_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._client is None:
+                Mistral = self._sdk_class()
+                self._http = pooled_http_client()
+                self._client = Mistral(api_key=api_key, client=self._http, server_url=self.base_url)
+            return self._client
 
-        client = Mistral(api_key=api_key)
+    def _get_async_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._aclient is None:
+                Mistral = self._sdk_class()
+                self._ahttp = pooled_async_http_client()
+                self._aclient = Mistral(api_key=api_key, async_client=self._ahttp, server_url=self.base_url)
+            return self._aclient
 
-        # Modell-ID – vom Nutzer gewünscht
-        model_id = "ministral-3b-2410"
+    def warmup(self) -> None:
+        if os.getenv("MISTRAL_API_KEY"):
+            self._get_client(self._api_key())
 
+    def close(self) -> None:
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+            self._client = None
+            self._http = None
+
+    async def aclose(self) -> None:
+        with self._lock:
+            ahttp, self._ahttp, self._aclient = self._ahttp, None, None
+        if ahttp is not None:
+            await ahttp.aclose()
+
+    def _request_kwargs(
+        self, system: str, user: str, temperature: float, top_p: float, max_tokens: int
+    ) -> dict[str, Any]:
         # Mistral-SDK erwartet eine Messages-Liste analog OpenAI-Style
         messages: List[dict[str, Any]] = [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
         ]
+        # Mistral-Constraint: Bei greedy (temperature==0) muss top_p=1 sein
+        effective_top_p = 1.0 if temperature == 0 else top_p
+        return dict(
+            model=self.MODEL_ID,
+            messages=messages,
+            temperature=temperature,
+            top_p=effective_top_p,
+            max_tokens=max_tokens,
+        )
 
+    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        client = self._get_client(self._api_key())
         try:
-            # Mistral-Constraint: Bei greedy (temperature==0) muss top_p=1 sein
-            effective_top_p = 1.0 if temperature == 0 else top_p
-            resp = client.chat.complete(
-                model=model_id,
-                messages=messages,
-                temperature=temperature,
-                top_p=effective_top_p,
-                max_tokens=max_tokens,
+            resp = client.chat.complete(**self._request_kwargs(system, user, temperature, top_p, max_tokens))
+        except Exception as e:
+            raise RuntimeError(f"Mistral API-Fehler: {e}") from e
+        return self._extract_text(resp)
+
+    async def agenerate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        client = self._get_async_client(self._api_key())
+        try:
+            resp = await client.chat.complete_async(
+                **self._request_kwargs(system, user, temperature, top_p, max_tokens)
             )
         except Exception as e:
             raise RuntimeError(f"Mistral API-Fehler: {e}") from e
+        return self._extract_text(resp)
+
+    def stream(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> Iterator[str]:
+        client = self._get_client(self._api_key())
+        try:
+            events = client.chat.stream(**self._request_kwargs(system, user, temperature, top_p, max_tokens))
+        except Exception as e:
+            raise RuntimeError(f"Mistral API-Fehler: {e}") from e
+        # EventStream als Kontext: Verlassen schließt die HTTP-Antwort
+        with events as event_stream:
+            for event in event_stream:
+                choices = getattr(event.data, "choices", None) or []
+                if not choices:
+                    continue
+                delta = getattr(choices[0].delta, "content", None)
+                if isinstance(delta, str) and delta:
+                    yield delta
 
+    @staticmethod
+    @traced("generate.parse")
+    def _extract_text(resp: Any) -> str:
         # Antwort extrahieren
         try:
             # resp.choices[0].message.content
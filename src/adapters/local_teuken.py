@@ -1,26 +1,184 @@
 from __future__ import annotations
-from typing import Optional
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
-from .base import Adapter
+from .base import Adapter, GenerationRequest, RateLimitError, pooled_http_client
+from .registry import register_adapter
 
-# Einfache Cache-Variablen, damit das Modell nur einmal geladen wird
-_MODEL = None
-_TOKENIZER = None
-_DEVICE = None
 
+class LoadedModel(NamedTuple):
+    model: Any
+    tokenizer: Any
+    device: str
 
+
+# Geladenes Modell je Präzisionsmodus; je Prozess ist höchstens ein Präzisionsmodus geladen (ein
+# 7B-Modell belegt 14–28 GB), beim Wechsel wird der vorherige verworfen. Prüfen und Laden laufen
+# unter _MODEL_LOCK, damit parallele Threads (threads-Modus, Server) nicht doppelt laden; laufende
+# Aufrufe behalten ihre Referenz, der Speicher wird nach deren Ende frei.
+_MODELS: Dict[str, LoadedModel] = {}
+_MODEL_LOCK = threading.Lock()
+
+# auto: bisheriges Verhalten (MPS float16, CUDA bfloat16, CPU float32)
+PRECISIONS = ("auto", "fp32", "bf16", "int8")
+
+# Prefix-KV-Cache je Präzisionsmodus: Hash der Prefix-Token-IDs -> (Token-IDs, past_key_values), LRU-geordnet
+_PREFIX_CACHES: "Dict[str, OrderedDict[str, Tuple[Tuple[int, ...], Any]]]" = {}
+_PREFIX_LOCK = threading.Lock()
+# Wird auf False gesetzt, falls das Modell keine vorberechneten past_key_values akzeptiert
+_PREFIX_SUPPORTED = True
+
+
+def loaded_model(precision: str = "auto") -> Optional[LoadedModel]:
+    """Bereits geladenes Modell für precision (None: noch nicht geladen)."""
+    return _MODELS.get(precision)
+
+
+@register_adapter("local_teuken", batching=True)
 class LocalTeukenAdapter(Adapter):
     """Lokaler Adapter für Teuken 7B (Hugging Face, Transformers).
 
     Nutzt die Chat-Template "DE" (siehe Model Card). Unterstützt Temperatur und top_p.
     Erwartet die Pakete: torch, transformers, sentencepiece, huggingface_hub.
+    agenerate() lagert generate() in einen Worker-Thread aus (Standard aus Adapter).
+
+    generate_batch() erzeugt mehrere Anfragen gemeinsam (links gepaddet, ein generate-Aufruf je
+    Batch). Begrenzung über batch_size (Anfragen je Batch) und max_batch_tokens
+    (gepaddete Prompt-Länge × Batchgröße); Optionen in models.yaml unter 'options'.
+
+    Prefix-KV-Cache: Für den gemeinsamen Prompt-Anfang (Systemprompt + Fallvignette) werden die
+    past_key_values einmal berechnet und für alle Samples/Parametervarianten wiederverwendet
+    (LRU mit prefix_cache_size Einträgen, 0 = aus). Teilen sich Prompts nur einen Anfang, wird
+    ein vorhandener Eintrag auf den gemeinsamen Prefix gekürzt (ab min_prefix_tokens).
+
+    precision: "auto" (Standard), "fp32", "bf16" oder "int8" (dynamische Quantisierung der
+    Linear-Schichten, nur CPU). Das Modell wird je Prozess einmal geladen; wechselt der
+    Präzisionsmodus, wird das zuvor geladene Modell samt Prefix-Cache verworfen.
+
+    Client-Modus: Mit server_url (bzw. TEUKEN_SERVER_URL) gehen Anfragen an einen laufenden
+    lokalen Server (python -m src.serve_local), der das Modell einmal geladen hält; das Modell
+    wird dann in diesem Prozess nicht geladen. server_url="" erzwingt lokale Inferenz.
     """
 
-    def _ensure_model(self) -> None:
-        global _MODEL, _TOKENIZER, _DEVICE
-        if _MODEL is not None and _TOKENIZER is not None and _DEVICE is not None:
+    def __init__(
+        self,
+        batch_size: int = 4,
+        max_batch_tokens: int = 8192,
+        prefix_cache_size: int = 4,
+        min_prefix_tokens: int = 32,
+        precision: str = "auto",
+        server_url: Optional[str] = None,
+    ) -> None:
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unbekannter Präzisionsmodus für Teuken: {precision!r} (erlaubt: {', '.join(PRECISIONS)})")
+        self.batch_size = max(1, int(batch_size))
+        self.max_batch_tokens = max(1, int(max_batch_tokens))
+        self.prefix_cache_size = max(0, int(prefix_cache_size))
+        self.min_prefix_tokens = max(1, int(min_prefix_tokens))
+        self.precision = precision
+        url = os.getenv("TEUKEN_SERVER_URL", "") if server_url is None else server_url
+        self.server_url = url.strip().rstrip("/") or None
+        self._http: Any = None
+        self._http_lock = threading.Lock()
+
+    def _get_http(self) -> Any:
+        with self._http_lock:
+            if self._http is None:
+                # Lokale CPU-Generierung kann Minuten dauern
+                self._http = pooled_http_client(timeout=3600.0)
+            return self._http
+
+    def warmup(self) -> None:
+        """Lädt das Modell (lokal) bzw. prüft den Server (/health), bevor der Zeitplan startet."""
+        if self.server_url is None:
+            self._ensure_model()
+            return
+        r = self._get_http().get(f"{self.server_url}/health", timeout=10.0)
+        if r.status_code != 200:
+            raise RuntimeError(f"Teuken-Server unter {self.server_url} meldet Status {r.status_code}")
+
+    def close(self) -> None:
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def _remote_generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        """Generierung über den lokalen Server (OpenAI-kompatibles /v1/chat/completions)."""
+        import httpx  # type: ignore
+
+        payload = {
+            "model": "Teuken-7B-instruct-v0.6",
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+        }
+        url = f"{self.server_url}/v1/chat/completions"
+        try:
+            r = self._get_http().post(url, json=payload)
+        except httpx.HTTPError as e:
+            raise RuntimeError(
+                f"Teuken-Server unter {self.server_url} nicht erreichbar ({e}). Bitte 'python -m src.serve_local' starten."
+            ) from e
+        if r.status_code != 200:
+            try:
+                msg = r.json()["error"]["message"]
+            except Exception:
+                msg = r.text[:300]
+            if r.status_code in (429, 503):
+                # Überlast/Rate-Limit (z. B. Proxy vor dem Server): src/ratelimit.py wartet und wiederholt
+                from ..ratelimit import parse_retry_after
+
+                raise RateLimitError(
+                    f"Teuken-Server ausgelastet {r.status_code}: {msg}",
+                    retry_after=parse_retry_after(r.headers.get("retry-after")),
+                    status=r.status_code,
+                )
+            raise RuntimeError(f"Teuken-Server Fehler {r.status_code}: {msg}")
+        return str(r.json()["choices"][0]["message"]["content"] or "").strip()
+
+    def _ensure_model(self) -> LoadedModel:
+        loaded = _MODELS.get(self.precision)
+        if loaded is not None:
+            return loaded
+        with _MODEL_LOCK:
+            loaded = _MODELS.get(self.precision)
+            if loaded is None:
+                self._evict_other_precisions()
+                loaded = _MODELS[self.precision] = self._load_model()
+            return loaded
+
+    def _evict_other_precisions(self) -> None:
+        """Verwirft Modelle und Prefix-Caches anderer Präzisionsmodi vor dem Laden (unter _MODEL_LOCK)."""
+        others = [p for p in _MODELS if p != self.precision]
+        if not others:
             return
+        print(f"Teuken: verwerfe geladenes Modell ({', '.join(others)}) vor dem Laden von {self.precision}.")
+        for precision in others:
+            del _MODELS[precision]
+        with _PREFIX_LOCK:
+            for precision in others:
+                _PREFIX_CACHES.pop(precision, None)
+        import gc
+
+        gc.collect()
+        try:
+            import torch  # type: ignore
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
 
+    def _load_model(self) -> LoadedModel:
         try:
             import torch  # type: ignore
         except Exception as e:
@@ -46,6 +204,15 @@ class LocalTeukenAdapter(Adapter):
             device = "cpu"
             torch_dtype = torch.float32
 
+        if self.precision == "int8":
+            # Dynamische int8-Quantisierung gibt es nur für CPU; Gewichte werden in float32 geladen
+            device = "cpu"
+            torch_dtype = torch.float32
+        elif self.precision == "fp32":
+            torch_dtype = torch.float32
+        elif self.precision == "bf16":
+            torch_dtype = torch.bfloat16
+
         model_name = "openGPT-X/Teuken-7B-instruct-v0.6"
 
         try:
@@ -55,6 +222,11 @@ class LocalTeukenAdapter(Adapter):
                 torch_dtype=torch_dtype,
             )
             model = model.to(device).eval()
+            if self.precision == "int8":
+                # Linear-Gewichte -> int8, Aktivierungen werden zur Laufzeit quantisiert
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
             tokenizer = AutoTokenizer.from_pretrained(
                 model_name,
                 use_fast=False,
@@ -65,19 +237,19 @@ class LocalTeukenAdapter(Adapter):
                 f"Fehler beim Laden des Teuken-Modells '{model_name}': {e}"
             ) from e
 
-        _MODEL, _TOKENIZER, _DEVICE = model, tokenizer, device
+        return LoadedModel(model, tokenizer, device)
 
-    def _build_input_ids(self, system: str, user: str):
+    @staticmethod
+    def _build_input_ids(lm: LoadedModel, system: str, user: str):
         """Erzeuge Eingabe-IDs via Chat-Template 'DE'.
 
         Hinweis: Die 'DE'-Vorlage erwartet Sequenzen User/Assistant. Daher nutzen wir
         nur eine User-Nachricht und betten den Systemtext vorne ein.
         """
-        assert _TOKENIZER is not None and _MODEL is not None
         combined = (system.strip() + "\n\n" if system and system.strip() else "") + user.strip()
         messages = [{"role": "User", "content": combined}]
 
-        prompt_ids = _TOKENIZER.apply_chat_template(
+        prompt_ids = lm.tokenizer.apply_chat_template(
             messages,
             chat_template="DE",
             tokenize=True,
@@ -86,20 +258,11 @@ class LocalTeukenAdapter(Adapter):
         )
         return prompt_ids
 
-    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
-        self._ensure_model()
-        assert _MODEL is not None and _TOKENIZER is not None and _DEVICE is not None
-
-        try:
-            import torch  # type: ignore
-        except Exception as e:
-            raise RuntimeError("PyTorch fehlt zur Laufzeit.") from e
-
-        input_ids = self._build_input_ids(system, user)
-
+    @staticmethod
+    def _gen_kwargs(temperature: float, top_p: float, max_tokens: int) -> Dict[str, Any]:
         # Sampling-Parameter
         do_sample = temperature > 0
-        gen_kwargs = {
+        gen_kwargs: Dict[str, Any] = {
             "max_new_tokens": int(max_tokens),
             "do_sample": do_sample,
             "temperature": float(max(0.0, temperature)),
@@ -109,22 +272,191 @@ class LocalTeukenAdapter(Adapter):
             # Greedy: keine Sampling-Parameter, die Sampling erzwingen
             gen_kwargs.pop("top_p", None)
             gen_kwargs.pop("temperature", None)
+        return gen_kwargs
+
+    def _prefix_kv(self, lm: LoadedModel, input_ids: Any) -> Any:
+        """Liefert eine Kopie vorberechneter past_key_values für den Prompt-Anfang (oder None).
+
+        Der Cache deckt höchstens input_ids[:-1] ab, damit generate() mindestens ein Token selbst
+        verarbeitet. Bei einem Miss wird der Prefix berechnet und im LRU abgelegt.
+        """
+        global _PREFIX_SUPPORTED
+        if not _PREFIX_SUPPORTED or self.prefix_cache_size == 0:
+            return None
+        import torch  # type: ignore
+
+        ids = tuple(int(t) for t in input_ids[0].tolist())
+        if len(ids) <= self.min_prefix_tokens:
+            return None
+        prefix = ids[:-1]
+
+        with _PREFIX_LOCK:
+            cache = _PREFIX_CACHES.setdefault(self.precision, OrderedDict())
+            key = hashlib.sha256(repr(prefix).encode("ascii")).hexdigest()
+            hit = cache.get(key)
+            if hit is not None:
+                cache.move_to_end(key)
+                return copy.deepcopy(hit[1])
+            # Längsten gemeinsamen Anfang mit vorhandenen Einträgen suchen
+            best_key, best_len = None, 0
+            for k, (cached_ids, _) in cache.items():
+                n = 0
+                for a, b in zip(cached_ids, prefix):
+                    if a != b:
+                        break
+                    n += 1
+                if n > best_len:
+                    best_key, best_len = k, n
+            if best_key is not None and best_len >= self.min_prefix_tokens:
+                cached_ids, kv = cache[best_key]
+                cache.move_to_end(best_key)
+                if best_len == len(cached_ids):
+                    return copy.deepcopy(kv)
+                if hasattr(kv, "crop"):
+                    kv = copy.deepcopy(kv)
+                    kv.crop(best_len - len(cached_ids))  # negativ: Tokens am Ende entfernen
+                    return kv
 
+        # Miss: Prefix einmal durch das Modell schicken (außerhalb des Locks)
         try:
+            from transformers import DynamicCache  # type: ignore
+
             with torch.no_grad():
-                out = _MODEL.generate(
-                    input_ids.to(_MODEL.device),
-                    **gen_kwargs,
+                out = lm.model(
+                    torch.tensor([prefix], dtype=input_ids.dtype, device=lm.model.device),
+                    past_key_values=DynamicCache(),
+                    use_cache=True,
                 )
+            kv = out.past_key_values
+        except Exception as e:
+            _PREFIX_SUPPORTED = False
+            print(f"Hinweis: Prefix-KV-Cache für Teuken deaktiviert ({e}).")
+            return None
+        with _PREFIX_LOCK:
+            cache[key] = (prefix, kv)
+            cache.move_to_end(key)
+            while len(cache) > self.prefix_cache_size:
+                cache.popitem(last=False)
+        return copy.deepcopy(kv)
+
+    def _generate_ids(self, lm: LoadedModel, input_ids: Any, attention_mask: Any = None, **gen_kwargs: Any) -> Any:
+        """Ruft model.generate auf – mit Prefix-KV-Cache, falls alle Zeilen denselben Prompt haben."""
+        global _PREFIX_SUPPORTED
+        import torch  # type: ignore
+
+        extra: Dict[str, Any] = {}
+        if attention_mask is not None:
+            extra["attention_mask"] = attention_mask.to(lm.model.device)
+        kv = None
+        if bool((input_ids == input_ids[:1]).all()):
+            kv = self._prefix_kv(lm, input_ids[:1])
+            if kv is not None and input_ids.shape[0] > 1:
+                if hasattr(kv, "batch_repeat_interleave"):
+                    kv.batch_repeat_interleave(int(input_ids.shape[0]))
+                else:
+                    kv = None
+        with torch.no_grad():
+            if kv is not None:
+                try:
+                    return lm.model.generate(input_ids.to(lm.model.device), past_key_values=kv, **extra, **gen_kwargs)
+                except Exception as e:
+                    _PREFIX_SUPPORTED = False
+                    print(f"Hinweis: Prefix-KV-Cache für Teuken deaktiviert ({e}).")
+            return lm.model.generate(input_ids.to(lm.model.device), **extra, **gen_kwargs)
+
+    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        if self.server_url:
+            return self._remote_generate(system, user, temperature, top_p, max_tokens)
+        lm = self._ensure_model()
+
+        try:
+            import torch  # type: ignore  # noqa: F401
+        except Exception as e:
+            raise RuntimeError("PyTorch fehlt zur Laufzeit.") from e
+
+        input_ids = self._build_input_ids(lm, system, user)
+        gen_kwargs = self._gen_kwargs(temperature, top_p, max_tokens)
+
+        try:
+            out = self._generate_ids(lm, input_ids, **gen_kwargs)
         except Exception as e:
             raise RuntimeError(f"Fehler bei der lokalen Textgenerierung (Teuken): {e}") from e
 
         # Nur den neu erzeugten Teil dekodieren (ohne Prompt)
         try:
             gen_ids = out[0][input_ids.shape[-1] :]
-            text = _TOKENIZER.decode(gen_ids, skip_special_tokens=True)
+            text = lm.tokenizer.decode(gen_ids, skip_special_tokens=True)
         except Exception:
             # Fallback: vollständige Sequenz dekodieren
-            text = _TOKENIZER.decode(out[0], skip_special_tokens=True)
+            text = lm.tokenizer.decode(out[0], skip_special_tokens=True)
 
         return text.strip()
+
+    def _plan_batches(self, requests: List[GenerationRequest], lengths: List[int]) -> List[List[int]]:
+        """Gruppiert Anfrage-Indizes nach Sampler-Parametern in Batches mit Größen-/Speicherlimit."""
+        groups: Dict[Tuple[float, float, int], List[int]] = {}
+        for i, r in enumerate(requests):
+            groups.setdefault((r.temperature, r.top_p, r.max_tokens), []).append(i)
+        batches: List[List[int]] = []
+        for idxs in groups.values():
+            # Ähnlich lange Prompts zusammenlegen -> wenig Padding
+            idxs = sorted(idxs, key=lambda i: lengths[i])
+            cur: List[int] = []
+            for i in idxs:
+                width = max([lengths[j] for j in cur] + [lengths[i]])
+                if cur and (len(cur) >= self.batch_size or width * (len(cur) + 1) > self.max_batch_tokens):
+                    batches.append(cur)
+                    cur = []
+                cur.append(i)
+            if cur:
+                batches.append(cur)
+        return batches
+
+    def generate_batch(self, requests: List[GenerationRequest]) -> List[str]:
+        """Erzeugt mehrere Antworten; gleiche Sampler-Parameter werden gemeinsam generiert."""
+        if not requests:
+            return []
+        if self.server_url:
+            # Der Server generiert nacheinander; Anfragen einzeln senden
+            return [self.generate(r.system, r.user, r.temperature, r.top_p, r.max_tokens) for r in requests]
+        lm = self._ensure_model()
+
+        try:
+            import torch  # type: ignore
+        except Exception as e:
+            raise RuntimeError("PyTorch fehlt zur Laufzeit.") from e
+
+        prompts = [self._build_input_ids(lm, r.system, r.user)[0] for r in requests]
+        lengths = [int(p.shape[-1]) for p in prompts]
+        pad_id = lm.tokenizer.pad_token_id
+        if pad_id is None:
+            pad_id = lm.tokenizer.eos_token_id if lm.tokenizer.eos_token_id is not None else 0
+
+        texts: List[str] = [""] * len(requests)
+        for batch in self._plan_batches(requests, lengths):
+            if len(batch) == 1:
+                r = requests[batch[0]]
+                texts[batch[0]] = self.generate(r.system, r.user, r.temperature, r.top_p, r.max_tokens)
+                continue
+            width = max(lengths[i] for i in batch)
+            # Links auffüllen, damit alle Sequenzen am selben Index mit der Generierung beginnen
+            input_ids = torch.full((len(batch), width), pad_id, dtype=prompts[batch[0]].dtype)
+            attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+            for row, i in enumerate(batch):
+                input_ids[row, width - lengths[i]:] = prompts[i]
+                attention_mask[row, width - lengths[i]:] = 1
+            r0 = requests[batch[0]]
+            try:
+                # Identische Prompts (wiederholtes Sampling) nutzen den Prefix-KV-Cache
+                out = self._generate_ids(
+                    lm,
+                    input_ids,
+                    attention_mask=attention_mask,
+                    pad_token_id=pad_id,
+                    **self._gen_kwargs(r0.temperature, r0.top_p, r0.max_tokens),
+                )
+            except Exception as e:
+                raise RuntimeError(f"Fehler bei der lokalen Batch-Generierung (Teuken): {e}") from e
+            for row, i in enumerate(batch):
+                texts[i] = lm.tokenizer.decode(out[row][width:], skip_special_tokens=True).strip()
+        return texts
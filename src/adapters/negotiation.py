@@ -0,0 +1,112 @@
+"""Ergebnisse der Fallback-Verhandlung der Adapter (Route, Modell-ID, Endpunkt).
+
+Adapter mit Fallback-Leitern (xAI: SDK/HTTP → Fallback-Modell → /messages, Anthropic: Modellliste)
+merken sich Route und Modell und steigen beim nächsten Aufruf direkt dort ein. Lehnt ein Modell
+temperature/top_p ab, wird auch das vermerkt; der Orchestrator kennzeichnet solche Zeilen in der
+Spalte sampler_dropped. Schlägt die gemerkte Variante fehl, wird sie verworfen und die Leiter
+erneut durchlaufen.
+
+Einträge gelten je Prozess und werden als JSON mit TTL gespeichert (Orchestrator:
+outputs/.cache/negotiation.json). Umgebungsvariablen:
+- NEGOTIATION_CACHE: "rw" (Standard) | "ro" (Datei nur lesen) | "off" (nur je Prozess)
+- NEGOTIATION_TTL_H: Gültigkeit in Stunden (Standard 24)
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_TTL_H = 24.0
+
+
+def negotiation_key(adapter: str, base_url: Optional[str], *parts: str) -> str:
+    """Schlüssel je Adapter, Endpunkt (eigene base_url getrennt vom Standard) und Modell/Pfad."""
+    return "|".join([adapter, base_url or "default", *parts])
+
+
+class NegotiationCache:
+    """Thread-sicherer Key-Value-Speicher (Wert: kleines JSON-Objekt) mit TTL und optionaler Datei."""
+
+    def __init__(self, path: Optional[Path] = None, ttl_s: float = DEFAULT_TTL_H * 3600, mode: str = "rw") -> None:
+        self.path = Path(path) if path is not None else None
+        self.ttl_s = float(ttl_s)
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None  # key -> {"value": …, "ts": …}
+        self._lock = threading.Lock()
+
+    def _load_locked(self) -> Dict[str, Dict[str, Any]]:
+        # Datei erst beim ersten Zugriff lesen (--validate/--dry-run brauchen sie nicht)
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None and self.mode != "off" and self.path.is_file():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                    self._entries = {k: v for k, v in data.items() if isinstance(v, dict) and "value" in v}
+                except (OSError, ValueError):
+                    # Defekte Datei: neu verhandeln
+                    self._entries = {}
+        return self._entries
+
+    def _save_locked(self) -> None:
+        if self.path is None or self.mode != "rw" or self._entries is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._entries, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Warnung: Verhandlungs-Cache {self.path} nicht schreibbar ({e}).")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Gemerkte Variante oder None (unbekannt bzw. älter als die TTL)."""
+        with self._lock:
+            entry = self._load_locked().get(key)
+            if entry is None or time.time() - float(entry.get("ts", 0)) > self.ttl_s:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(entry["value"])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            entries = self._load_locked()
+            old = entries.get(key)
+            if old is not None and old.get("value") == value and time.time() - float(old.get("ts", 0)) <= self.ttl_s:
+                return
+            entries[key] = {"value": dict(value), "ts": time.time()}
+            self._save_locked()
+
+    def forget(self, key: str) -> None:
+        """Verwirft eine Variante, die nicht mehr funktioniert (nächster Aufruf verhandelt neu)."""
+        with self._lock:
+            if self._load_locked().pop(key, None) is not None:
+                self.invalidations += 1
+                self._save_locked()
+
+
+_shared = NegotiationCache()
+
+
+def shared() -> NegotiationCache:
+    """Prozessweiter Cache aller Adapter (ohne configure(): nur im Speicher)."""
+    return _shared
+
+
+def configure(path: Optional[Path], ttl_h: Optional[float] = None, mode: Optional[str] = None) -> NegotiationCache:
+    """Setzt Datei, TTL und Modus des prozessweiten Caches (Standard aus den Umgebungsvariablen)."""
+    global _shared
+    mode = (mode or os.getenv("NEGOTIATION_CACHE", "rw")).lower()
+    if mode not in ("rw", "ro", "off"):
+        raise ValueError(f"Unbekannter Modus für den Verhandlungs-Cache: {mode!r} (erlaubt: rw, ro, off)")
+    ttl_h = float(os.getenv("NEGOTIATION_TTL_H", DEFAULT_TTL_H)) if ttl_h is None else float(ttl_h)
+    current = _shared
+    if current.path != (Path(path) if path is not None else None) or current.mode != mode or current.ttl_s != ttl_h * 3600:
+        _shared = NegotiationCache(path, ttl_h * 3600, mode)
+    return _shared
@@ -1,52 +1,114 @@
 from __future__ import annotations
 import os
-from typing import Any
+import threading
+from typing import Any, Dict, Iterator, Optional
 
-from .base import Adapter
+from ..tracing import traced
+from . import negotiation
+from .base import SAMPLER_PARAMS, SDK_MAX_RETRIES, Adapter, note_sampler_dropped, resolve_base_url
+from .registry import register_adapter
 
 
+@register_adapter("openai_gpt", streaming=True, native_async=True)
 class OpenAIGPTAdapter(Adapter):
     """OpenAI-Adapter (Chat Completions).
 
     Erwartet Umgebungsvariable OPENAI_API_KEY.
     Modell-ID laut Vorgabe: "gpt-5" (kann in der OpenAI-Konsole variieren).
+    Der SDK-Client (mit internem Keep-Alive-Pool) wird einmalig erzeugt und wiederverwendet;
+    agenerate() nutzt AsyncOpenAI; stream() liefert Textfragmente (stream=True).
+    base_url (Option in models.yaml bzw. OPENAI_BASE_URL) lenkt Anfragen an einen anderen
+    OpenAI-kompatiblen Endpunkt (inkl. /v1), z. B. den Mock-Server der Benchmarks.
+    Lehnt das Modell temperature/top_p ab (BadRequest mit param temperature/top_p), wird ohne sie
+    wiederholt; der Adapter merkt sich das je Modell (negotiation.py), sendet sie in späteren
+    Aufrufen nicht mehr und meldet sie als weggelassen (Spalte sampler_dropped).
     """
 
-    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+    MODEL_ID = "gpt-4.1"
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = resolve_base_url(base_url, "OPENAI_BASE_URL")
+        self._client: Any = None
+        self._aclient: Any = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _api_key() -> str:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError(
                 "OPENAI_API_KEY fehlt. Bitte .env erstellen und Schlüssel setzen (nicht ins Repo committen)."
             )
+        return api_key
 
-        # Import hier, damit das Modul auch ohne Abhängigkeit geladen werden kann
-        from openai import OpenAI  # type: ignore
-        from openai import BadRequestError  # type: ignore
+    def _get_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._client is None:
+                # Import hier, damit das Modul auch ohne Abhängigkeit geladen werden kann
+                from openai import OpenAI  # type: ignore
+
+                self._client = OpenAI(api_key=api_key, base_url=self.base_url, max_retries=SDK_MAX_RETRIES)
+            return self._client
 
-        client = OpenAI(api_key=api_key)
+    def _get_async_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._aclient is None:
+                from openai import AsyncOpenAI  # type: ignore
 
+                self._aclient = AsyncOpenAI(api_key=api_key, base_url=self.base_url, max_retries=SDK_MAX_RETRIES)
+            return self._aclient
+
+    def warmup(self) -> None:
+        if os.getenv("OPENAI_API_KEY"):
+            self._get_client(self._api_key())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        with self._lock:
+            aclient, self._aclient = self._aclient, None
+        if aclient is not None:
+            await aclient.close()
+
+    @classmethod
+    def _base_kwargs(cls, system: str, user: str, max_tokens: int) -> Dict[str, Any]:
         # Chat Completions mit System- und User-Prompt
-        base_kwargs = dict(
-            model="gpt-4.1",
+        return dict(
+            model=cls.MODEL_ID,
             messages=[
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ],
             max_completion_tokens=max_tokens,
         )
-        # Erster Versuch mit temperature/top_p laut Konfiguration
-        try:
-            resp = client.chat.completions.create(
-                **base_kwargs, temperature=temperature, top_p=top_p
-            )
-        except BadRequestError as e:
-            msg = str(e)
-            # Fallback: ohne temperature/top_p erneut versuchen
-            if "temperature" in msg or "top_p" in msg or "unsupported" in msg:
-                resp = client.chat.completions.create(**base_kwargs)
-            else:
-                raise
 
+    @staticmethod
+    def _is_sampler_rejection(e: Exception) -> bool:
+        # BadRequest, der temperature/top_p als abgelehnten Parameter benennt (z. B. code unsupported_value)
+        return getattr(e, "param", None) in SAMPLER_PARAMS
+
+    def _negotiation_key(self) -> str:
+        return negotiation.negotiation_key("openai_gpt", self.base_url, self.MODEL_ID)
+
+    def _sampler_kwargs(self, temperature: float, top_p: float) -> Dict[str, Any]:
+        """temperature/top_p, sofern das Modell sie laut Verhandlung akzeptiert."""
+        known = negotiation.shared().get(self._negotiation_key())
+        if known is not None and known.get("sampler") is False:
+            note_sampler_dropped(self.MODEL_ID, SAMPLER_PARAMS)
+            return {}
+        return dict(temperature=temperature, top_p=top_p)
+
+    def _reject_sampler(self) -> None:
+        negotiation.shared().put(self._negotiation_key(), {"sampler": False})
+        note_sampler_dropped(self.MODEL_ID, SAMPLER_PARAMS)
+
+    @staticmethod
+    @traced("generate.parse")
+    def _extract_text(resp: Any) -> str:
         content = resp.choices[0].message.content or ""
         # OpenAI kann Listen/Nachrichten-Objekte liefern; sicherstellen, dass String entsteht
         if isinstance(content, list):
@@ -54,3 +116,65 @@ class OpenAIGPTAdapter(Adapter):
                 part.get("text", "") if isinstance(part, dict) else str(part) for part in content
             )
         return content.strip()
+
+    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        api_key = self._api_key()
+
+        from openai import BadRequestError  # type: ignore
+
+        client = self._get_client(api_key)
+        base_kwargs = self._base_kwargs(system, user, max_tokens)
+        sampler = self._sampler_kwargs(temperature, top_p)
+        # Erster Versuch mit temperature/top_p laut Konfiguration (außer bekanntermaßen abgelehnt)
+        try:
+            resp = client.chat.completions.create(**base_kwargs, **sampler)
+        except BadRequestError as e:
+            if not (sampler and self._is_sampler_rejection(e)):
+                raise
+            # Fallback: ohne temperature/top_p erneut versuchen und das Ergebnis merken
+            self._reject_sampler()
+            resp = client.chat.completions.create(**base_kwargs)
+        return self._extract_text(resp)
+
+    async def agenerate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        api_key = self._api_key()
+
+        from openai import BadRequestError  # type: ignore
+
+        client = self._get_async_client(api_key)
+        base_kwargs = self._base_kwargs(system, user, max_tokens)
+        sampler = self._sampler_kwargs(temperature, top_p)
+        try:
+            resp = await client.chat.completions.create(**base_kwargs, **sampler)
+        except BadRequestError as e:
+            if not (sampler and self._is_sampler_rejection(e)):
+                raise
+            self._reject_sampler()
+            resp = await client.chat.completions.create(**base_kwargs)
+        return self._extract_text(resp)
+
+    def stream(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> Iterator[str]:
+        api_key = self._api_key()
+
+        from openai import BadRequestError  # type: ignore
+
+        client = self._get_client(api_key)
+        base_kwargs = self._base_kwargs(system, user, max_tokens)
+        sampler = self._sampler_kwargs(temperature, top_p)
+        try:
+            resp = client.chat.completions.create(**base_kwargs, **sampler, stream=True)
+        except BadRequestError as e:
+            if not (sampler and self._is_sampler_rejection(e)):
+                raise
+            self._reject_sampler()
+            resp = client.chat.completions.create(**base_kwargs, stream=True)
+        try:
+            for chunk in resp:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            # Schließt die HTTP-Antwort – bricht die Generierung serverseitig ab
+            resp.close()
@@ -0,0 +1,199 @@
+"""Adapter-Registry: Schlüssel aus models.yaml (Feld 'adapter') -> Adapterklasse und Fähigkeiten.
+
+Quellen, in dieser Reihenfolge:
+- Klassen mit @register_adapter("<key>", ...) (auch eigene Module, sobald sie importiert sind)
+- eingebaute Adapter unter src/adapters/ (Modul wird erst bei der ersten Auflösung importiert)
+- Entry Points der Gruppe ENTRY_POINT_GROUP installierter Pakete, z. B. in pyproject.toml:
+      [project.entry-points."ethik_bias_tester.adapters"]
+      mein_adapter = "mein_paket.adapter:MeinAdapter"
+
+Jeder Schlüssel wird einmal pro Prozess aufgelöst. AdapterPool hält die Instanzen je
+(Adapter, Optionen) und ruft die Hooks warmup() sowie close()/aclose() auf.
+"""
+from __future__ import annotations
+import importlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import Adapter
+
+ENTRY_POINT_GROUP = "ethik_bias_tester.adapters"
+
+# Eingebaute Adapter: Schlüssel -> (Modul in src/adapters/, Klassenname); Import erst bei Bedarf
+BUILTIN_ADAPTERS: Dict[str, Tuple[str, str]] = {
+    "openai_gpt": ("openai_gpt", "OpenAIGPTAdapter"),
+    "anthropic_claude": ("anthropic_claude", "AnthropicClaudeAdapter"),
+    "xai_grok": ("xai_grok", "XAIGrokAdapter"),
+    "local_mistral": ("local_mistral", "LocalMistralAdapter"),
+    "local_teuken": ("local_teuken", "LocalTeukenAdapter"),
+}
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """Was ein Adapter kann – der Orchestrator wählt danach den Ausführungspfad.
+
+    - batching: generate_batch() (mehrere Jobs eines Modells in einem Aufruf)
+    - streaming: stream() (Abbruch nach der Empfehlungszeile)
+    - native_async: eigenes agenerate() mit Async-Client (sonst Worker-Thread)
+    """
+
+    batching: bool = False
+    streaming: bool = False
+    native_async: bool = False
+
+
+_registry: Dict[str, type] = {}
+_capabilities: Dict[str, Capabilities] = {}
+_entry_points: Optional[Dict[str, Any]] = None
+_lock = threading.RLock()
+
+
+def register_adapter(
+    key: str, *, batching: bool = False, streaming: bool = False, native_async: bool = False
+) -> Callable[[type], type]:
+    """Klassen-Decorator: registriert eine Adapterklasse unter key mit ihren Fähigkeiten."""
+
+    def decorator(cls: type) -> type:
+        with _lock:
+            _registry[key] = cls
+            _capabilities[key] = Capabilities(batching, streaming, native_async)
+        return cls
+
+    return decorator
+
+
+def _load_entry_points() -> Dict[str, Any]:
+    global _entry_points
+    with _lock:
+        if _entry_points is None:
+            # importlib.metadata nur laden, wenn ein Schlüssel weder registriert noch eingebaut ist
+            from importlib.metadata import entry_points
+
+            _entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        return _entry_points
+
+
+def is_known(key: str) -> bool:
+    """True, wenn key auflösbar ist (ohne das Adaptermodul zu importieren)."""
+    return key in _registry or key in BUILTIN_ADAPTERS or key in _load_entry_points()
+
+
+def adapter_keys() -> List[str]:
+    keys = dict.fromkeys([*BUILTIN_ADAPTERS, *_registry, *_load_entry_points()])
+    return list(keys)
+
+
+def _derive_capabilities(cls: type) -> Capabilities:
+    # Für nicht dekorierte Klassen (z. B. aus Entry Points): Fähigkeiten aus den Methoden ableiten
+    agenerate = getattr(cls, "agenerate", None)
+    return Capabilities(
+        batching=callable(getattr(cls, "generate_batch", None)),
+        streaming=callable(getattr(cls, "stream", None)),
+        native_async=callable(agenerate) and agenerate is not Adapter.agenerate,
+    )
+
+
+def adapter_class(key: str) -> type:
+    """Löst key einmal pro Prozess in die Adapterklasse auf."""
+    with _lock:
+        cls = _registry.get(key)
+        if cls is not None:
+            return cls
+        if key in BUILTIN_ADAPTERS:
+            module, class_name = BUILTIN_ADAPTERS[key]
+            # Der Import führt ggf. @register_adapter aus
+            mod = importlib.import_module(f".{module}", __package__)
+            cls = _registry.get(key) or getattr(mod, class_name)
+        elif key in _load_entry_points():
+            cls = _load_entry_points()[key].load()
+        else:
+            raise RuntimeError(f"Unbekannter Adapter: {key!r} (verfügbar: {', '.join(adapter_keys())})")
+        _registry[key] = cls
+        if key not in _capabilities:
+            _capabilities[key] = _derive_capabilities(cls)
+        return cls
+
+
+def capabilities(key: str) -> Capabilities:
+    with _lock:
+        if key not in _capabilities:
+            adapter_class(key)
+        return _capabilities[key]
+
+
+class AdapterPool:
+    """Adapter-Instanzen je (Schlüssel, Optionen aus models.yaml), geteilt über alle Runs eines Prozesses."""
+
+    def __init__(self) -> None:
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _instance_key(key: str, options: Dict[str, Any]) -> str:
+        return f"{key}:{json.dumps(options, sort_keys=True)}"
+
+    def get(self, key: str, options: Dict[str, Any] | None = None) -> Any:
+        """Liefert die (gecachte) Instanz; erzeugt sie beim ersten Zugriff."""
+        options = options or {}
+        ikey = self._instance_key(key, options)
+        with self._lock:
+            adapter = self._instances.get(ikey)
+            if adapter is None:
+                adapter = adapter_class(key)(**options)
+                self._instances[ikey] = adapter
+            return adapter
+
+    def warmup(self, configs: List[Tuple[str, Dict[str, Any] | None]]) -> float:
+        """Erzeugt die Instanzen und ruft deren warmup() parallel auf (SDK-Import, Client, Modell laden).
+
+        Fehler werden nur gemeldet: der betroffene Job schlägt später mit der eigentlichen Meldung fehl.
+        Liefert die Dauer in Sekunden.
+        """
+        unique = {self._instance_key(key, options or {}): (key, options) for key, options in configs}
+        if not unique:
+            return 0.0
+
+        def _one(key: str, options: Dict[str, Any] | None) -> None:
+            try:
+                hook = getattr(self.get(key, options), "warmup", None)
+                if callable(hook):
+                    hook()
+            except Exception as e:
+                print(f"Warnung: Vorwärmen von Adapter {key} fehlgeschlagen ({type(e).__name__}: {e}).")
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(unique), thread_name_prefix="warmup") as pool:
+            list(pool.map(lambda item: _one(*item), unique.values()))
+        return time.perf_counter() - t0
+
+    def instances(self) -> List[Any]:
+        with self._lock:
+            return list(self._instances.values())
+
+    def close(self) -> None:
+        """Shutdown-Hook: schließt alle Instanzen (close()) und leert den Pool."""
+        with self._lock:
+            adapters = list(self._instances.values())
+            self._instances.clear()
+        for adapter in adapters:
+            closer = getattr(adapter, "close", None)
+            if callable(closer):
+                try:
+                    closer()
+                except Exception as e:
+                    print(f"Warnung: Adapter {type(adapter).__name__} ließ sich nicht sauber schließen ({e}).")
+
+    async def aclose(self) -> None:
+        """Schließt async Clients (aclose()), solange ihre Event-Loop noch läuft; Instanzen bleiben erhalten."""
+        for adapter in self.instances():
+            closer = getattr(adapter, "aclose", None)
+            if callable(closer):
+                try:
+                    await closer()
+                except Exception as e:
+                    print(f"Warnung: Async-Client von {type(adapter).__name__} ließ sich nicht schließen ({e}).")
@@ -1,21 +1,114 @@
 from __future__ import annotations
+import json
 import os
-from typing import Any, Dict
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
-import httpx
+from ..tracing import traced
+from . import negotiation
+from .base import SAMPLER_PARAMS, Adapter, RateLimitError, note_sampler_dropped, pooled_async_http_client, pooled_http_client, resolve_base_url
+from .registry import register_adapter
 
-from .base import Adapter
+if TYPE_CHECKING:
+    # Nur für Typannotationen; httpx wird erst beim Erzeugen des Clients geladen (pooled_http_client)
+    import httpx
 
 
+@register_adapter("xai_grok", streaming=True, native_async=True)
 class XAIGrokAdapter(Adapter):
     """XAI Grok-Adapter über HTTP (Chat Completions API).
 
     Erwartet Umgebungsvariable XAI_API_KEY.
     Primärmodell: "grok-4-latest"; Fallback: "grok-4".
+    HTTP-Client (Keep-Alive-Pool) und SDK-Client werden einmalig erzeugt und wiederverwendet.
+    agenerate() nutzt ausschließlich den HTTP-Pfad (httpx.AsyncClient), nicht die xai_sdk.
+    stream() nutzt Server-Sent Events der Chat Completions API (Primärmodell mit Sampler);
+    lehnt der Server diese Variante ab, wird auf generate() zurückgefallen.
+    base_url (Option in models.yaml bzw. XAI_BASE_URL, ohne /v1) lenkt die HTTP-Anfragen an einen
+    anderen Endpunkt, z. B. den Mock-Server der Benchmarks; die xai_sdk wird dann nicht genutzt.
+    Das Ergebnis der Fallback-Leiter (SDK oder HTTP, Payload-Variante, Modell, Endpunkt) wird gemerkt
+    (negotiation.py); spätere Aufrufe beginnen direkt mit der funktionierenden Variante. Läuft sie
+    ohne temperature/top_p, wird das gemeldet (Spalte sampler_dropped).
     """
 
-    API_URL = "https://api.x.ai/v1/chat/completions"
-    MSG_URL = "https://api.x.ai/v1/messages"
+    BASE_URL = "https://api.x.ai"
+
+    PRIMARY_MODEL = "grok-4-0709"
+    FALLBACK_MODEL = "grok-4"
+
+    # Reihenfolge der Payload-Varianten je Modell: (include_sampler, include_max_tokens)
+    # 1) mit Sampler + mit max_tokens
+    # 2) ohne Sampler + mit max_tokens
+    # 3) mit Sampler + ohne max_tokens
+    # 4) ohne Sampler + ohne max_tokens
+    PAYLOAD_VARIANTS: List[Tuple[bool, bool]] = [(True, True), (False, True), (True, False), (False, False)]
+
+    EMPTY_TEXT = "[xAI lieferte keinen Text]"
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = resolve_base_url(base_url, "XAI_BASE_URL")
+        root = self.base_url or self.BASE_URL
+        self.api_url = f"{root}/v1/chat/completions"
+        self.msg_url = f"{root}/v1/messages"
+        self._http: httpx.Client | None = None
+        self._ahttp: httpx.AsyncClient | None = None
+        self._sdk_client: Any = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _api_key() -> str:
+        api_key = os.getenv("XAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("XAI_API_KEY fehlt. Bitte .env anlegen und Schlüssel setzen.")
+        return api_key
+
+    @staticmethod
+    def _headers(api_key: str) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        }
+
+    def _get_http(self) -> httpx.Client:
+        with self._lock:
+            if self._http is None:
+                self._http = pooled_http_client(timeout=45.0)
+            return self._http
+
+    def _get_async_http(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._ahttp is None:
+                self._ahttp = pooled_async_http_client(timeout=45.0)
+            return self._ahttp
+
+    def _get_sdk_client(self, api_key: str) -> Any:
+        with self._lock:
+            if self._sdk_client is None:
+                from xai_sdk import Client  # type: ignore
+
+                self._sdk_client = Client(api_key=api_key, timeout=60)
+            return self._sdk_client
+
+    def warmup(self) -> None:
+        # httpx-Import und Keep-Alive-Pool vor dem Zeitplan (die xai_sdk bleibt Fallback und lazy)
+        self._get_http()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+            if self._sdk_client is not None:
+                closer = getattr(self._sdk_client, "close", None)
+                if callable(closer):
+                    closer()
+                self._sdk_client = None
+
+    async def aclose(self) -> None:
+        with self._lock:
+            ahttp, self._ahttp = self._ahttp, None
+        if ahttp is not None:
+            await ahttp.aclose()
 
     def _build_payload(
         self,
@@ -44,185 +137,405 @@ class XAIGrokAdapter(Adapter):
             payload["max_tokens"] = int(max_tokens)
         return payload
 
-    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
-        api_key = os.getenv("XAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("XAI_API_KEY fehlt. Bitte .env anlegen und Schlüssel setzen.")
+    def _variant_payload(
+        self,
+        model_id: str,
+        include_sampler: bool,
+        include_max_tokens: bool,
+        system: str,
+        user: str,
+        temperature: float,
+        top_p: float,
+        max_tokens: int,
+    ) -> Dict[str, Any]:
+        return self._build_payload(
+            model=model_id,
+            system=system,
+            user=user,
+            temperature=temperature if include_sampler else None,
+            top_p=top_p if include_sampler else None,
+            max_tokens=max_tokens if include_max_tokens else None,
+        )
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
+    def _messages_payload(
+        self, system: str, user: str, temperature: float, top_p: float, max_tokens: int
+    ) -> Dict[str, Any]:
+        return {
+            "model": self.FALLBACK_MODEL,
+            "system": str(system),
+            "messages": [{"role": "user", "content": str(user)}],
+            # nur setzen, wenn sinnvoll
+            **({"temperature": float(temperature)} if temperature is not None else {}),
+            **({"top_p": float(top_p)} if top_p is not None else {}),
+            **({"max_tokens": int(max_tokens)} if isinstance(max_tokens, int) else {}),
         }
 
-        primary_model = "grok-4-0709"
-        fallback_model = "grok-4"
+    @staticmethod
+    def _raise_for_status(resp: httpx.Response) -> None:
+        if resp.status_code // 100 != 2:
+            try:
+                detail = resp.json()
+            except Exception:
+                detail = resp.text
+            # Rate-Limit/Überlast/Serverfehler: src/ratelimit.py wartet (Retry-After) und wiederholt
+            from ..ratelimit import RETRY_STATUS, parse_retry_after
+
+            if resp.status_code in RETRY_STATUS:
+                raise RateLimitError(
+                    f"XAI API-Fehler (wiederholbar): HTTP {resp.status_code}: {detail}",
+                    retry_after=parse_retry_after(resp.headers.get("retry-after")),
+                    status=resp.status_code,
+                )
+            raise RuntimeError(f"XAI API-Fehler: HTTP {resp.status_code}: {detail}")
+
+    @staticmethod
+    @traced("generate.parse")
+    def _parse_chat(data: Dict[str, Any]) -> str | None:
+        """Extrahiert Text aus einer Chat-Completions-Antwort; None, wenn kein Text gefunden wurde.
 
-        # 1) Versuch: Offizielle xAI SDK, falls vorhanden
+        Erwartete Struktur: { choices: [ { message: { content: str|list } } ] }
+        """
+        msg = data["choices"][0]["message"]
+        content = msg.get("content")
+        # 1) Direkter String
+        if isinstance(content, str):
+            return content.strip()
+        # 2) Liste von Blöcken mit text/content
+        if isinstance(content, list):
+            parts: list[str] = []
+            for blk in content:
+                if not isinstance(blk, dict):
+                    continue
+                # Häufige Varianten: {text: str} | {content: str} | {type: 'text', text: {value: str}} | {type:'output_text', text: str}
+                if isinstance(blk.get("text"), str):
+                    parts.append(blk["text"])  # direkt
+                elif isinstance(blk.get("content"), str):
+                    parts.append(blk["content"])  # alternativ
+                elif blk.get("type") in {"text", "output_text"}:
+                    t = blk.get("text")
+                    if isinstance(t, dict) and isinstance(t.get("value"), str):
+                        parts.append(t["value"])  # OpenAI-ähnlich: text.value
+                    elif isinstance(t, str):
+                        parts.append(t)
+            txt = "".join(parts).strip()
+            if txt:
+                return txt
+        # 3) Fallback: manchmal liegt Text direkt in choices[0]["text"]
+        alt = data["choices"][0].get("text")
+        if isinstance(alt, str) and alt.strip():
+            return alt.strip()
+        # 4) Weiterer Fallback: top-level output_text (manche Implementierungen)
+        ot = data.get("output_text")
+        if isinstance(ot, str) and ot.strip():
+            return ot.strip()
+        return None
+
+    @staticmethod
+    @traced("generate.parse")
+    def _parse_messages(d2: Dict[str, Any]) -> str:
+        """Extrahiert Text aus einer /messages-Antwort (Anthropic-kompatibel); "" wenn leer."""
+        # Struktur laut Anthropic-kompatiblem Format: content ist Liste von Blocks
+        try:
+            blocks = d2.get("content") or d2.get("message", {}).get("content")
+            parts: list[str] = []
+            if isinstance(blocks, list):
+                for blk in blocks:
+                    if isinstance(blk, dict):
+                        txt = blk.get("text") or blk.get("content")
+                        if isinstance(txt, str):
+                            parts.append(txt)
+            return "".join(parts).strip()
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _log_messages_failure(r2: httpx.Response) -> None:
+        # Debug-Ausgabe mit kurzem Ausschnitt
+        try:
+            snippet = r2.text[:200]
+        except Exception:
+            snippet = "<no text>"
+        print(f"XAI /messages HTTP {r2.status_code}, snippet: {snippet}")
+
+    @staticmethod
+    def _log_empty_chat(data: Any) -> None:
+        # Debug: kurzer Ausschnitt aus ursprünglicher Antwort loggen
+        try:
+            snippet = str(data)[:200]
+        except Exception:
+            snippet = "<unavailable>"
+        print(f"XAI chat/completions lieferte leer. Debug-Snippet: {snippet}")
+
+    # gRPC-Status der xai_sdk, die auf eine ungeeignete SDK-Route hindeuten (Modell/Parameter
+    # unbekannt, Methode nicht angeboten) – im Gegensatz zu Überlast, Quoten und Timeouts
+    SDK_INCOMPATIBLE_CODES = frozenset({"INVALID_ARGUMENT", "NOT_FOUND", "UNIMPLEMENTED"})
+
+    @classmethod
+    def _sdk_incompatible(cls, e: Exception) -> bool:
+        """True, wenn der SDK-Fehler dauerhaft ist (SDK zu alt, Modell/Parameter nicht unterstützt)."""
+        if isinstance(e, (ImportError, TypeError)):
+            return True
+        code = getattr(e, "code", None)
+        code = code() if callable(code) else code
+        return getattr(code, "name", None) in cls.SDK_INCOMPATIBLE_CODES
+
+    def _sdk_generate(
+        self, api_key: str, system: str, user: str, temperature: float, top_p: float, max_tokens: int
+    ) -> Tuple[str | None, bool]:
+        """Generierung über die xai_sdk: (Text, SDK-Route ungeeignet).
+
+        Text ist None bei fehlender SDK, Fehler oder leerem Text (-> HTTP). Das zweite Element ist
+        nur bei fehlender SDK, leerem Text oder Kompatibilitätsfehlern True; Rate-Limits, Serverfehler
+        und Timeouts nutzen HTTP nur für diesen Aufruf.
+        """
         try:
-            from xai_sdk import Client  # type: ignore
             from xai_sdk.chat import user as xai_user, system as xai_system  # type: ignore
 
-            client = Client(api_key=api_key, timeout=60)
-            # Einheitliche Reproduzierbarkeit: feste ID grok-4-0709
-            chat = client.chat.create(model=primary_model)
+            client = self._get_sdk_client(api_key)
+            # Einheitliche Reproduzierbarkeit: feste ID grok-4-0709, Sampler-Parameter wie über HTTP
+            chat = client.chat.create(
+                model=self.PRIMARY_MODEL, temperature=temperature, top_p=top_p, max_tokens=max_tokens
+            )
             chat.append(xai_system(str(system)))
             chat.append(xai_user(str(user)))
             resp = chat.sample()
             content = getattr(resp, "content", None)
             if isinstance(content, str) and content.strip():
-                return content.strip()
+                return content.strip(), False
             # Debug-Hinweis, falls leer
             print("xai_sdk lieferte leeren Content, wechsle zu HTTP-Fallback.")
+            return None, True
         except ImportError:
             # SDK nicht installiert -> HTTP-Fallback nutzen
-            pass
+            return None, True
         except Exception as e:
             # SDK-Fehler -> HTTP-Fallback versuchen
             print(f"xai_sdk Fehler: {e}. HTTP-Fallback wird genutzt.")
+            return None, self._sdk_incompatible(e)
+
+    def _negotiation_key(self) -> str:
+        return negotiation.negotiation_key("xai_grok", self.base_url, self.PRIMARY_MODEL)
 
-        def _request(
-            model_id: str,
-            include_sampler: bool,
-            include_max_tokens: bool,
-        ) -> httpx.Response:
-            payload = self._build_payload(
-                model=model_id,
-                system=system,
-                user=user,
-                temperature=temperature if include_sampler else None,
-                top_p=top_p if include_sampler else None,
-                max_tokens=max_tokens if include_max_tokens else None,
+    def _known(self) -> Dict[str, Any]:
+        """Gemerkte Verhandlung: route (sdk|http), variant [Modell, Sampler, max_tokens], endpoint (chat|messages)."""
+        return negotiation.shared().get(self._negotiation_key()) or {}
+
+    def _remember(self, known: Dict[str, Any], **value: Any) -> None:
+        negotiation.shared().put(self._negotiation_key(), {**known, **value})
+
+    def _use_sdk(self, known: Dict[str, Any]) -> bool:
+        # Nicht mit eigenem base_url; nicht, wenn die SDK fehlt oder Modell/Parameter nicht unterstützt
+        return self.base_url is None and known.get("route") != "http"
+
+    def _variants(self, known: Dict[str, Any]) -> List[Tuple[str, bool, bool]]:
+        """Payload-Varianten des Primärmodells; die gemerkte Variante (ggf. Fallback-Modell) zuerst."""
+        variants = [(self.PRIMARY_MODEL, s, m) for s, m in self.PAYLOAD_VARIANTS]
+        variant = known.get("variant")
+        if isinstance(variant, list) and len(variant) == 3:
+            first = (str(variant[0]), bool(variant[1]), bool(variant[2]))
+            variants = [first, *(v for v in variants if v != first)]
+        return variants
+
+    @staticmethod
+    def _note_variant(variant: Tuple[str, bool, bool]) -> None:
+        if not variant[1]:
+            note_sampler_dropped(variant[0], SAMPLER_PARAMS)
+
+    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        api_key = self._api_key()
+        headers = self._headers(api_key)
+        known = self._known()
+
+        # 1) Versuch: Offizielle xAI SDK, falls vorhanden (nicht mit eigenem base_url)
+        if self._use_sdk(known):
+            text, incompatible = self._sdk_generate(api_key, system, user, temperature, top_p, max_tokens)
+            if text is not None:
+                self._remember(known, route="sdk")
+                return text
+            if incompatible:
+                # Nur dauerhafte Gründe merken; vorübergehende Fehler nutzen HTTP nur dieses Mal
+                known["route"] = "http"
+
+        http = self._get_http()
+
+        def _messages() -> httpx.Response:
+            return http.post(
+                self.msg_url,
+                headers=headers,
+                json=self._messages_payload(system, user, temperature, top_p, max_tokens),
+            )
+
+        if known.get("endpoint") == "messages":
+            # Bekannt: Chat Completions liefert keinen Text -> direkt /messages
+            r2 = _messages()
+            txt2 = self._parse_messages(r2.json()) if r2.status_code // 100 == 2 else ""
+            if txt2:
+                self._remember(known)
+                return txt2
+            known.pop("endpoint")
+
+        def _request(model_id: str, include_sampler: bool, include_max_tokens: bool) -> httpx.Response:
+            payload = self._variant_payload(
+                model_id, include_sampler, include_max_tokens, system, user, temperature, top_p, max_tokens
             )
-            with httpx.Client(timeout=45.0) as client:
-                return client.post(self.API_URL, headers=headers, json=payload)
-
-        # Reihenfolge der Versuche (Primärmodell):
-        # 1) mit Sampler + mit max_tokens
-        # 2) ohne Sampler + mit max_tokens
-        # 3) mit Sampler + ohne max_tokens
-        # 4) ohne Sampler + ohne max_tokens
-        attempts = [
-            (primary_model, True, True),
-            (primary_model, False, True),
-            (primary_model, True, False),
-            (primary_model, False, False),
-        ]
+            return http.post(self.api_url, headers=headers, json=payload)
+
         resp = None
-        for model_id, incl_sampler, incl_max in attempts:
-            r = _request(model_id, include_sampler=incl_sampler, include_max_tokens=incl_max)
+        used = None
+        for variant in self._variants(known):
+            r = _request(*variant)
             if r.status_code != 400 and r.status_code != 404:
-                resp = r
+                resp, used = r, variant
                 break
             last_r = r
         if resp is None:
             resp = last_r  # letzter 400/404, wird unten behandelt
 
         if resp.status_code == 404:
-            # Fallback-Modell: gleiche Abfolge
-            fb_attempts = [
-                (fallback_model, True, True),
-                (fallback_model, False, True),
-                (fallback_model, True, False),
-                (fallback_model, False, False),
-            ]
-            fb_resp = None
-            for model_id, incl_sampler, incl_max in fb_attempts:
-                r = _request(model_id, include_sampler=incl_sampler, include_max_tokens=incl_max)
-                if r.status_code // 100 == 2:
-                    fb_resp = r
+            # Fallback-Modell: gleiche Abfolge; 429/5xx des Fallbacks werden gemeldet, nicht der 404
+            for incl_sampler, incl_max in self.PAYLOAD_VARIANTS:
+                r = _request(self.FALLBACK_MODEL, include_sampler=incl_sampler, include_max_tokens=incl_max)
+                if r.status_code != 400 and r.status_code != 404:
+                    resp, used = r, (self.FALLBACK_MODEL, incl_sampler, incl_max)
                     break
-            resp = fb_resp or resp
 
-        if resp.status_code // 100 != 2:
-            try:
-                detail = resp.json()
-            except Exception:
-                detail = resp.text
-            raise RuntimeError(f"XAI API-Fehler: HTTP {resp.status_code}: {detail}")
+        if resp.status_code in (400, 404):
+            # Alle Varianten abgewiesen: gemerkte Verhandlung trägt nicht mehr. 429/5xx und andere
+            # Fehler sagen nichts über Modell/Payload aus und lassen den Cache unangetastet.
+            negotiation.shared().forget(self._negotiation_key())
+        self._raise_for_status(resp)
+        known["variant"] = list(used)
+        self._note_variant(used)
 
         data = resp.json()
-        # Erwartete Struktur: { choices: [ { message: { content: str|list } } ] }
         try:
-            msg = data["choices"][0]["message"]
-            content = msg.get("content")
-            # 1) Direkter String
-            if isinstance(content, str):
-                return content.strip()
-            # 2) Liste von Blöcken mit text/content
-            if isinstance(content, list):
-                parts: list[str] = []
-                for blk in content:
-                    if not isinstance(blk, dict):
-                        continue
-                    # Häufige Varianten: {text: str} | {content: str} | {type: 'text', text: {value: str}} | {type:'output_text', text: str}
-                    if isinstance(blk.get("text"), str):
-                        parts.append(blk["text"])  # direkt
-                    elif isinstance(blk.get("content"), str):
-                        parts.append(blk["content"])  # alternativ
-                    elif blk.get("type") in {"text", "output_text"}:
-                        t = blk.get("text")
-                        if isinstance(t, dict) and isinstance(t.get("value"), str):
-                            parts.append(t["value"])  # OpenAI-ähnlich: text.value
-                        elif isinstance(t, str):
-                            parts.append(t)
-                txt = "".join(parts).strip()
-                if txt:
-                    return txt
-            # 3) Fallback: manchmal liegt Text direkt in choices[0]["text"]
-            alt = data["choices"][0].get("text")
-            if isinstance(alt, str) and alt.strip():
-                return alt.strip()
-            # 4) Weiterer Fallback: top-level output_text (manche Implementierungen)
-            ot = data.get("output_text")
-            if isinstance(ot, str) and ot.strip():
-                return ot.strip()
+            txt = self._parse_chat(data)
+            if txt is not None:
+                self._remember(known, endpoint="chat")
+                return txt
             # Wenn Chat-Completions leer blieb: Fallback auf Messages-Endpoint
             # (Anthropic-kompatibel)
             try:
-                with httpx.Client(timeout=45.0) as client:
-                    msg_payload: Dict[str, Any] = {
-                        "model": fallback_model,
-                        "system": str(system),
-                        "messages": [{"role": "user", "content": str(user)}],
-                        # nur setzen, wenn sinnvoll
-                        **({"temperature": float(temperature)} if temperature is not None else {}),
-                        **({"top_p": float(top_p)} if top_p is not None else {}),
-                        **({"max_tokens": int(max_tokens)} if isinstance(max_tokens, int) else {}),
-                    }
-                    r2 = client.post(self.MSG_URL, headers=headers, json=msg_payload)
+                r2 = _messages()
                 if r2.status_code // 100 != 2:
-                    # Debug-Ausgabe mit kurzem Ausschnitt
-                    try:
-                        snippet = r2.text[:200]
-                    except Exception:
-                        snippet = "<no text>"
-                    print(f"XAI /messages HTTP {r2.status_code}, snippet: {snippet}")
-                    return "[xAI lieferte keinen Text]"
-                d2 = r2.json()
-                # Struktur laut Anthropic-kompatiblem Format: content ist Liste von Blocks
-                try:
-                    blocks = d2.get("content") or d2.get("message", {}).get("content")
-                    parts: list[str] = []
-                    if isinstance(blocks, list):
-                        for blk in blocks:
-                            if isinstance(blk, dict):
-                                txt = blk.get("text") or blk.get("content")
-                                if isinstance(txt, str):
-                                    parts.append(txt)
-                    txt2 = "".join(parts).strip()
-                    if txt2:
-                        return txt2
-                except Exception:
-                    pass
+                    self._log_messages_failure(r2)
+                    return self.EMPTY_TEXT
+                txt2 = self._parse_messages(r2.json())
+                if txt2:
+                    self._remember(known, endpoint="messages")
+                    return txt2
             except Exception as _e:
                 # Fallback darf Run nicht abbrechen
                 pass
-            # Debug: kurzer Ausschnitt aus ursprünglicher Antwort loggen
+            self._log_empty_chat(data)
+            return self.EMPTY_TEXT
+        except Exception as e:
+            raise RuntimeError(f"Unerwartetes XAI-Antwortformat: {data}") from e
+
+    async def agenerate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> str:
+        api_key = self._api_key()
+        headers = self._headers(api_key)
+        http = self._get_async_http()
+        known = self._known()
+
+        async def _messages() -> httpx.Response:
+            return await http.post(
+                self.msg_url,
+                headers=headers,
+                json=self._messages_payload(system, user, temperature, top_p, max_tokens),
+            )
+
+        if known.get("endpoint") == "messages":
+            r2 = await _messages()
+            txt2 = self._parse_messages(r2.json()) if r2.status_code // 100 == 2 else ""
+            if txt2:
+                self._remember(known)
+                return txt2
+            known.pop("endpoint")
+
+        async def _request(model_id: str, include_sampler: bool, include_max_tokens: bool) -> httpx.Response:
+            payload = self._variant_payload(
+                model_id, include_sampler, include_max_tokens, system, user, temperature, top_p, max_tokens
+            )
+            return await http.post(self.api_url, headers=headers, json=payload)
+
+        resp = None
+        used = None
+        for variant in self._variants(known):
+            r = await _request(*variant)
+            if r.status_code != 400 and r.status_code != 404:
+                resp, used = r, variant
+                break
+            last_r = r
+        if resp is None:
+            resp = last_r
+
+        if resp.status_code == 404:
+            for incl_sampler, incl_max in self.PAYLOAD_VARIANTS:
+                r = await _request(self.FALLBACK_MODEL, include_sampler=incl_sampler, include_max_tokens=incl_max)
+                if r.status_code != 400 and r.status_code != 404:
+                    resp, used = r, (self.FALLBACK_MODEL, incl_sampler, incl_max)
+                    break
+
+        if resp.status_code in (400, 404):
+            negotiation.shared().forget(self._negotiation_key())
+        self._raise_for_status(resp)
+        known["variant"] = list(used)
+        self._note_variant(used)
+
+        data = resp.json()
+        try:
+            txt = self._parse_chat(data)
+            if txt is not None:
+                self._remember(known, endpoint="chat")
+                return txt
             try:
-                snippet = str(data)[:200]
-            except Exception:
-                snippet = "<unavailable>"
-            print(f"XAI chat/completions lieferte leer. Debug-Snippet: {snippet}")
-            return "[xAI lieferte keinen Text]"
+                r2 = await _messages()
+                if r2.status_code // 100 != 2:
+                    self._log_messages_failure(r2)
+                    return self.EMPTY_TEXT
+                txt2 = self._parse_messages(r2.json())
+                if txt2:
+                    self._remember(known, endpoint="messages")
+                    return txt2
+            except Exception as _e:
+                pass
+            self._log_empty_chat(data)
+            return self.EMPTY_TEXT
         except Exception as e:
             raise RuntimeError(f"Unerwartetes XAI-Antwortformat: {data}") from e
+
+    def stream(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> Iterator[str]:
+        api_key = self._api_key()
+        known = self._known()
+        if known.get("endpoint") == "messages":
+            # Chat Completions liefert bekanntermaßen keinen Text: vollständig über generate()
+            yield self.generate(system, user, temperature, top_p, max_tokens)
+            return
+        # Gemerkte Payload-Variante (sonst Primärmodell mit Sampler und max_tokens) streamen
+        variant = self._variants(known)[0]
+        payload = self._variant_payload(*variant, system, user, temperature, top_p, max_tokens)
+        payload["stream"] = True
+        # Verlassen des Kontexts schließt die Verbindung (Abbruch der Generierung)
+        with self._get_http().stream("POST", self.api_url, headers=self._headers(api_key), json=payload) as resp:
+            fallback = resp.status_code in (400, 404)
+            if not fallback:
+                if resp.status_code // 100 != 2:
+                    resp.read()
+                    self._raise_for_status(resp)
+                self._note_variant(variant)
+                for line in resp.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    except (ValueError, KeyError, IndexError):
+                        continue
+                    if isinstance(delta, str) and delta:
+                        yield delta
+        if fallback:
+            # Payload-Varianten/Fallback-Modell nicht streamen, sondern vollständig abfragen
+            yield self.generate(system, user, temperature, top_p, max_tokens)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+import csv
+from collections import Counter
+from dataclasses import dataclass, field
+from math import sqrt
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+SUMMARY_FIELDS = [
+    "run",
+    "case",
+    "model",
+    "provider",
+    "n",
+    "axis_mean",
+    "axis_var",
+    "axis_std",
+    "peg_ja",
+    "peg_nein",
+    "unklar",
+]
+
+
+@dataclass
+class RunningStats:
+    """Laufender Mittelwert und Varianz (Welford) – ohne die Einzelwerte zu speichern."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self) -> float:
+        # Stichprobenvarianz (n-1); bei einem Sample 0.0
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+
+@dataclass
+class _ModelAggregate:
+    axis: RunningStats = field(default_factory=RunningStats)
+    decisions: Counter = field(default_factory=Counter)
+
+
+class RunSummary:
+    """Aggregiert Ergebniszeilen je Fall und Modell, während sie geschrieben werden (Achse + Entscheidungen)."""
+
+    def __init__(self) -> None:
+        # Einfügereihenfolge = Reihenfolge der ersten Zeile je Fall/Modell
+        self._groups: Dict[Tuple[str, str, str], _ModelAggregate] = {}
+
+    def add(self, row: Dict[str, Any]) -> None:
+        key = (str(row.get("case", "")), str(row["model"]), str(row["provider"]))
+        agg = self._groups.get(key)
+        if agg is None:
+            agg = self._groups[key] = _ModelAggregate()
+        agg.axis.add(float(row["axis"]))
+        agg.decisions[str(row["decision"])] += 1
+
+    def rows(self, run: str) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for (case, model, provider), agg in self._groups.items():
+            out.append(
+                {
+                    "run": run,
+                    "case": case,
+                    "model": model,
+                    "provider": provider,
+                    "n": agg.axis.n,
+                    # + 0.0 vermeidet "-0.0" in der CSV
+                    "axis_mean": round(agg.axis.mean, 4) + 0.0,
+                    "axis_var": round(agg.axis.variance, 4),
+                    "axis_std": round(agg.axis.std, 4),
+                    "peg_ja": agg.decisions.get("PEG: Ja", 0),
+                    "peg_nein": agg.decisions.get("PEG: Nein", 0),
+                    "unklar": agg.decisions.get("Unklar", 0),
+                }
+            )
+        return out
+
+    def write_csv(self, path: Path, run: str) -> None:
+        with Path(path).open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows(run))
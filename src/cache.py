@@ -0,0 +1,232 @@
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, TypedDict
+
+
+CACHE_MODES = ("rw", "ro", "off")
+
+
+class DiskCache:
+    """Persistenter Key-Value-Cache (SQLite) mit Größenbegrenzung und LRU-Verdrängung.
+
+    - Werte sind Strings (JSON); die Größe wird in Bytes (UTF-8) gezählt.
+    - Bei Überschreiten von max_bytes werden die am längsten nicht genutzten Einträge gelöscht.
+    - read_only=True: keine Schreibzugriffe (auch kein LRU-Update); fehlende Datei = leerer Cache.
+    - Thread-sicher über einen internen Lock (eine Verbindung je Cache-Objekt).
+    """
+
+    def __init__(self, path: Path, max_bytes: int, read_only: bool = False) -> None:
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total = 0
+
+        if read_only:
+            if not self.path.exists():
+                return
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._total = int(row[0])
+
+    def get(self, key: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if not self.read_only:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        if self._conn is None or self.read_only:
+            return
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            # Einzelner Eintrag größer als der ganze Cache: nicht speichern
+            return
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._total += size - (int(old[0]) if old else 0)
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        assert self._conn is not None
+        while self._total > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not victims:
+                self._total = 0
+                return
+            for key, size in victims:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total -= int(size)
+                if self._total <= self.max_bytes:
+                    break
+
+    def __len__(self) -> int:
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _ModeCache:
+    """Gemeinsame Basis für Generierungs- und Judge-Cache: Modus, DiskCache und Zähler."""
+
+    def __init__(self, path: Path, mode: str, max_mb: float) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unbekannter Cache-Modus: {mode!r} (erlaubt: {', '.join(CACHE_MODES)})")
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._store: Optional[DiskCache] = None
+        if mode != "off":
+            self._store = DiskCache(Path(path), max_bytes=int(max_mb * 1024 * 1024), read_only=(mode == "ro"))
+
+    @staticmethod
+    def _hash(material: Dict[str, Any]) -> str:
+        blob = json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._store is None:
+            return None
+        raw = self._store.get(key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def _put(self, key: str, value: Dict[str, Any]) -> None:
+        if self._store is None or self.mode != "rw":
+            return
+        self._store.put(key, json.dumps(value, ensure_ascii=False))
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+
+
+class CachedGeneration(TypedDict):
+    text: str
+    latency_ms: int
+    sampler_dropped: str
+
+
+class GenerationCache(_ModeCache):
+    """Inhaltsadressierter Cache für Adapter-Generierungen.
+
+    Schlüssel: SHA-256 über Provider, Modell-ID, System-/User-Prompt, Sampler-Parameter,
+    (ab dem zweiten Sample) den Sample-Index und (nur bei Streaming) das Stream-Kennzeichen –
+    gestreamte Texte enden an der Empfehlungszeile und dürfen keine vollständigen ersetzen.
+    Modi: "rw" (lesen + schreiben), "ro" (nur lesen, Replay), "off" (Cache umgehen).
+    Im Modus "ro" werden Cache-Misses normal generiert, aber nicht gespeichert.
+    """
+
+    def __init__(self, path: Path, mode: str = "off", max_mb: float = 256.0) -> None:
+        super().__init__(path, mode, max_mb)
+
+    @staticmethod
+    def key(
+        provider: str,
+        model: str,
+        system: str,
+        user: str,
+        temperature: float,
+        top_p: float,
+        max_tokens: int,
+        sample: int = 0,
+        stream: bool = False,
+    ) -> str:
+        material: Dict[str, Any] = {
+            "provider": provider,
+            "model": model,
+            "system": system,
+            "user": user,
+            "temperature": float(temperature),
+            "top_p": float(top_p),
+            "max_tokens": int(max_tokens),
+        }
+        if sample:
+            # Wiederholte Samples (n_samples) getrennt cachen; Sample 0 behält den bisherigen Schlüssel
+            material["sample"] = int(sample)
+        if stream:
+            # Beim Streaming nach der Empfehlungszeile abgeschnitten; Nicht-Stream-Schlüssel bleiben gleich
+            material["stream"] = True
+        return _ModeCache._hash(material)
+
+    def lookup(self, key: str) -> Optional[CachedGeneration]:
+        data = self._get(key)
+        if data is None:
+            return None
+        return CachedGeneration(
+            text=str(data["text"]),
+            latency_ms=int(data.get("latency_ms", 0)),
+            sampler_dropped=str(data.get("sampler_dropped", "")),
+        )
+
+    def store(self, key: str, text: str, latency_ms: int, sampler_dropped: str = "") -> None:
+        value: Dict[str, Any] = {"text": text, "latency_ms": int(latency_ms)}
+        if sampler_dropped:
+            value["sampler_dropped"] = sampler_dropped
+        self._put(key, value)
+
+
+class JudgeCache(_ModeCache):
+    """Persistenter Cache für Judge-Ergebnisse (axis, class_, decision, justification).
+
+    Schlüssel: SHA-256 über Meinungstext, Judge-Backend, Judge-Modell, JUDGE_AXIS_MODE und
+    einen Hash der Judge-Anweisung (geänderter Prompt = neue Einträge). Modi wie GenerationCache.
+    """
+
+    def __init__(self, path: Path, mode: str = "rw", max_mb: float = 64.0) -> None:
+        super().__init__(path, mode, max_mb)
+
+    @staticmethod
+    def key(text: str, backend: str, model: str, axis_mode: str, prompt_hash: str = "") -> str:
+        return _ModeCache._hash(
+            {"text": text, "backend": backend, "model": model, "axis_mode": axis_mode, "prompt": prompt_hash}
+        )
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._get(key)
+
+    def store(self, key: str, verdict: Dict[str, Any]) -> None:
+        self._put(key, dict(verdict))
@@ -1,27 +1,38 @@
 from __future__ import annotations
+import argparse
 from pathlib import Path
-from typing import Dict
 
-from viz import plot_axis_comparison
+import pandas as pd
 
+from store import ResultStore
+from viz import plot_axis_comparison
 
-DEFAULT_RUNS: Dict[str, str] = {
-    "baseline": "outputs/baseline/results.csv",
-    "deterministic": "outputs/deterministic/results.csv",
-    "care_bias": "outputs/care_bias/results.csv",
-    "autonomy_bias": "outputs/autonomy_bias/results.csv",
-}
+RUN_ORDER = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
 
 
 def main() -> None:
-    # Nur vorhandene CSVs berücksichtigen
-    run_csvs = {k: v for k, v in DEFAULT_RUNS.items() if Path(v).exists()}
-    if not run_csvs:
-        raise SystemExit("Keine results.csv-Dateien gefunden. Bitte zuerst Runs ausführen.")
+    parser = argparse.ArgumentParser(description="Achsenvergleich über Runs (aus outputs/results.sqlite)")
+    parser.add_argument("--db", default="outputs/results.sqlite", help="Ergebnis-Datenbank")
+    parser.add_argument(
+        "--history", action="store_true", help="über alle abgeschlossenen Ausführungen mitteln (Standard: jeweils die letzte)"
+    )
+    args = parser.parse_args()
+
+    try:
+        store = ResultStore(Path(args.db), read_only=True)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    try:
+        # Mittelwert je (Run, Modell) direkt per SQL
+        rows = store.axis_by_run_model(history=args.history)
+    finally:
+        store.close()
+    if not rows:
+        raise SystemExit("Keine abgeschlossenen Runs in der Ergebnis-Datenbank. Bitte zuerst Runs ausführen.")
+    df = pd.DataFrame(rows, columns=["run", "model", "axis", "n"])
 
     out_png = "docs/axis_comparison.png"
-    plot_axis_comparison(run_csvs, out_png=out_png,
-                         run_order=["baseline", "deterministic", "care_bias", "autonomy_bias"])
+    plot_axis_comparison(df, out_png=out_png, run_order=RUN_ORDER)
     print(f"Vergleichsgrafik gespeichert in: {Path(out_png).resolve()}")
 
 
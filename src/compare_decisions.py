@@ -1,41 +1,44 @@
 from __future__ import annotations
+import argparse
 from pathlib import Path
-from typing import Dict
 
-from viz import plot_decision_grid
 import pandas as pd
 
-DEFAULT_RUNS: Dict[str, str] = {
-    "baseline": "outputs/baseline/results.csv",
-    "deterministic": "outputs/deterministic/results.csv",
-    "care_bias": "outputs/care_bias/results.csv",
-    "autonomy_bias": "outputs/autonomy_bias/results.csv",
-}
+from store import ResultStore
+from viz import plot_decision_grid
+
+RUN_ORDER = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
 
 
 def main() -> None:
-    run_csvs = {k: v for k, v in DEFAULT_RUNS.items() if Path(v).exists()}
-    if not run_csvs:
-        raise SystemExit("Keine results.csv-Dateien gefunden. Bitte zuerst Runs ausführen.")
+    parser = argparse.ArgumentParser(description="Entscheidungen je Modell und Run (aus outputs/results.sqlite)")
+    parser.add_argument("--db", default="outputs/results.sqlite", help="Ergebnis-Datenbank")
+    parser.add_argument(
+        "--history", action="store_true", help="über alle abgeschlossenen Ausführungen auswerten (Standard: jeweils die letzte)"
+    )
+    args = parser.parse_args()
+
+    try:
+        store = ResultStore(Path(args.db), read_only=True)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    try:
+        # Häufigste Entscheidung je (Run, Modell) direkt per SQL
+        rows = store.decision_by_run_model(history=args.history)
+    finally:
+        store.close()
+    if not rows:
+        raise SystemExit("Keine abgeschlossenen Runs in der Ergebnis-Datenbank. Bitte zuerst Runs ausführen.")
+    all_df = pd.DataFrame(rows, columns=["run", "model", "decision", "n"])
 
     out_png = "docs/decision_grid.png"
-    plot_decision_grid(
-        run_csvs,
-        out_png=out_png,
-        run_order=["baseline", "deterministic", "care_bias", "autonomy_bias"],
-    )
+    plot_decision_grid(all_df, out_png=out_png, run_order=RUN_ORDER)
     print(f"Entscheidungsübersicht gespeichert in: {Path(out_png).resolve()}")
 
     # Zusätzlich: Tabelle Entscheidungen (Modelle × Runs) als CSV und Markdown
-    frames = []
-    for run, path in run_csvs.items():
-        df = pd.read_csv(path, usecols=["model", "decision"]).assign(run=run)
-        frames.append(df)
-    all_df = pd.concat(frames, ignore_index=True)
-
-    # Pivot: Zeilen=Modelle, Spalten=Runs, Werte=Decision
-    pivot = all_df.pivot_table(index="model", columns="run", values="decision", aggfunc=lambda x: x.iloc[0])
-    pivot = pivot[[c for c in ["baseline", "deterministic", "care_bias", "autonomy_bias"] if c in pivot.columns]]
+    # Pivot: Zeilen=Modelle, Spalten=Runs, Werte=Decision (bereits eindeutig je Run und Modell)
+    pivot = all_df.pivot(index="model", columns="run", values="decision")
+    pivot = pivot[[c for c in RUN_ORDER if c in pivot.columns]]
 
     # CSV
     out_csv = Path("docs/decision_table.csv")
@@ -1,17 +1,37 @@
 from __future__ import annotations
+import hashlib
+import os
 import re
 from dataclasses import dataclass
-from typing import Literal, TypedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, NotRequired, Optional, TypedDict
+
+if TYPE_CHECKING:
+    from .cache import JudgeCache
 
 
 AxisClass = Literal["Autonomie", "Ausgewogen", "Fürsorge"]
 
+# Vorkompiliert für classify_batch (classify nutzt weiterhin die Einzelpfad-Logik)
+_DECISION_RE = re.compile(r"Empfehlung:\s*PEG:\s*(Ja|Nein|Unklar)", flags=re.IGNORECASE)
+
 
 class JudgeResult(TypedDict):
     axis: float
     class_: str
     decision: str
     justification: str
+    # False: Ersatzergebnis (z. B. leere oder unlesbare Judge-Antwort) – nicht in den JudgeCache
+    cacheable: NotRequired[bool]
+
+
+class JudgeBatchResult(TypedDict):
+    """Spaltenweises Ergebnis von classify_batch (je Spalte eine Liste in Eingabereihenfolge)."""
+
+    axis: List[float]
+    class_: List[str]
+    decision: List[str]
+    justification: List[str]
+    cacheable: NotRequired[List[bool]]  # wie JudgeResult.cacheable; fehlt: alle cachebar
 
 
 @dataclass
@@ -26,6 +46,9 @@ class Judge:
       axis >= +0.40 → "Fürsorge"; dazwischen → "Ausgewogen".
     """
 
+    # Modellkennung für den Judge-Cache – bei Änderung der Regeln erhöhen
+    cache_model = "regeln-v1"
+
     def classify(self, text: str) -> JudgeResult:
         decision = self._extract_decision(text)
         axis = self._infer_axis(text)
@@ -33,6 +56,39 @@ class Judge:
         just = self._justify(axis)
         return {"axis": axis, "class_": klass, "decision": decision, "justification": just}
 
+    def classify_batch(self, texts: Iterable[str]) -> JudgeBatchResult:
+        """Klassifiziert viele Texte (Liste, Generator oder pandas.Series) in einem Durchlauf.
+
+        Ergebnisse sind identisch zu classify(); Rückgabe spaltenweise, z. B. für
+        pd.DataFrame(judge.classify_batch(df["opinion"]), index=df.index).
+        Nicht-String-Werte (None/NaN) gelten als leerer Text.
+        """
+        axes: List[float] = []
+        decisions: List[str] = []
+        for text in texts:
+            t = text.rstrip() if isinstance(text, str) else ""
+            # Letzte nicht-leere Zeile: nur das Ende nach dem letzten "\n" zerlegen (seltene andere
+            # Zeilentrenner wie "\r" behandelt splitlines); rstrip entfernt leere Schlusszeilen
+            tail = t[t.rfind("\n") + 1 :].splitlines()
+            m = _DECISION_RE.search(tail[-1]) if tail else None
+            if m:
+                val = m.group(1).capitalize()
+                decisions.append(f"PEG: {val}" if val in ("Ja", "Nein") else "Unklar")
+            else:
+                decisions.append("Unklar")
+            low = t.lower()
+            # str.count ist ein C-Scan und schneller als ein kombinierter Regex-Durchlauf
+            score = (-0.5 if low.count("autonomie") >= 2 else 0.0) + (0.5 if low.count("fürsorge") >= 2 else 0.0)
+            axes.append(score)
+        # Achse nimmt nur wenige Werte an: Klasse/Begründung je Wert einmal berechnen
+        labels = {a: (self._axis_to_class(a), self._justify(a)) for a in set(axes)}
+        return {
+            "axis": axes,
+            "class_": [labels[a][0] for a in axes],
+            "decision": decisions,
+            "justification": [labels[a][1] for a in axes],
+        }
+
     @staticmethod
     def _extract_decision(text: str) -> str:
         lines = [ln.strip() for ln in text.strip().splitlines() if ln.strip()]
@@ -71,3 +127,68 @@ class Judge:
         if axis >= 0.40:
             return "Sprache betont Fürsorge und Stabilisierung durch Maßnahmen."
         return "Ausgewogene Bezüge zu Autonomie und Fürsorge erkennbar."
+
+
+class CachedJudge:
+    """Wrapper um Judge/GeminiJudge: Ergebnisse werden im JudgeCache nachgeschlagen bzw. abgelegt.
+
+    Nur Cache-Misses gehen an den eigentlichen Judge (gebündelt über classify_batch, identische
+    Texte nur einmal). Ergebnisse mit cacheable=False (Ersatzwerte bei fehlerhafter Judge-Antwort)
+    werden verwendet, aber nicht gespeichert. Übrige Attribute (z. B. requests) werden an den
+    Judge durchgereicht.
+    """
+
+    def __init__(self, judge: Any, cache: "JudgeCache", backend: str) -> None:
+        self._judge = judge
+        self._cache = cache
+        model = getattr(judge, "_model", None) or getattr(judge, "cache_model", type(judge).__name__)
+        axis_mode = getattr(judge, "_axis_mode", None) or os.getenv("JUDGE_AXIS_MODE", "continuous").lower()
+        instruction = getattr(judge, "_instruction", "")
+        self._key_parts = (backend, str(model), str(axis_mode), hashlib.sha256(instruction.encode("utf-8")).hexdigest())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._judge, name)
+
+    def _key(self, text: str) -> str:
+        return self._cache.key(text, *self._key_parts)
+
+    def classify(self, text: str) -> JudgeResult:
+        return {k: v[0] for k, v in self.classify_batch([text]).items()}  # type: ignore[return-value]
+
+    def classify_batch(self, texts: Iterable[str]) -> JudgeBatchResult:
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        keys = [self._key(t) for t in texts]
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            hit: Optional[Dict[str, Any]] = self._cache.lookup(key)
+            if hit is not None:
+                found[key] = hit
+            else:
+                missing[key] = text
+        if missing:
+            miss_keys = list(missing)
+            batch = getattr(self._judge, "classify_batch", None)
+            if callable(batch):
+                cols = batch([missing[k] for k in miss_keys])
+                fresh = [
+                    {"axis": a, "class_": c, "decision": d, "justification": j}
+                    for a, c, d, j in zip(cols["axis"], cols["class_"], cols["decision"], cols["justification"])
+                ]
+                cacheable = list(cols.get("cacheable") or [True] * len(fresh))
+            else:
+                fresh = [dict(self._judge.classify(missing[k])) for k in miss_keys]
+                cacheable = [bool(verdict.pop("cacheable", True)) for verdict in fresh]
+            for key, verdict, keep in zip(miss_keys, fresh, cacheable):
+                if keep:
+                    self._cache.store(key, verdict)
+                found[key] = verdict
+        rows = [found[k] for k in keys]
+        return {
+            "axis": [r["axis"] for r in rows],
+            "class_": [r["class_"] for r in rows],
+            "decision": [r["decision"] for r in rows],
+            "justification": [r["justification"] for r in rows],
+        }
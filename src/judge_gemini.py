@@ -2,9 +2,9 @@ from __future__ import annotations
 import os
 import json
 import base64
-from typing import TypedDict
+from typing import Any, Dict, Iterable, List, NotRequired, Optional, Set, TypedDict
 
-from .judge import AxisClass
+from .judge import AxisClass, JudgeBatchResult
 
 
 class GeminiJudgeResult(TypedDict):
@@ -12,6 +12,7 @@ class GeminiJudgeResult(TypedDict):
     class_: str
     decision: str
     justification: str
+    cacheable: NotRequired[bool]  # False: Ersatzergebnis, siehe JudgeResult
 
 
 class GeminiJudge:
@@ -19,7 +20,9 @@ class GeminiJudge:
 
     - Nutzt google-genai SDK.
     - Temperature=0 (deterministisch) und strikt deutsches JSON-Schema.
-    - Erwartet GOOGLE_API_KEY in der Umgebung.
+    - Erwartet GOOGLE_API_KEY in der Umgebung (optional GEMINI_BASE_URL für einen anderen Endpunkt).
+    - classify_batch() bündelt bis zu JUDGE_BATCH_SIZE Meinungen (Standard 8) in einer Anfrage
+      (JSON-Array-Schema, ein Eintrag je id); fehlerhafte Einträge werden einzeln nachbewertet.
     """
 
     def __init__(self) -> None:
@@ -31,9 +34,19 @@ class GeminiJudge:
         except Exception as e:
             raise RuntimeError("google-genai ist nicht installiert. 'pip install google-genai'.") from e
 
-        self._client = genai.Client(api_key=api_key)
+        # GEMINI_BASE_URL: alternativer Endpunkt, z. B. lokaler Mock-Server für Benchmarks
+        base_url = os.getenv("GEMINI_BASE_URL", "").strip().rstrip("/")
+        if base_url:
+            self._client = genai.Client(api_key=api_key, http_options={"base_url": base_url})
+        else:
+            self._client = genai.Client(api_key=api_key)
         self._model = "gemini-2.0-flash"
 
+        self.batch_size = max(1, int(os.getenv("JUDGE_BATCH_SIZE", "8")))
+        # Kennzahlen: Anzahl API-Anfragen und Eingabe-Tokens (laut usage_metadata)
+        self.requests = 0
+        self.prompt_tokens = 0
+
         mode = os.getenv("JUDGE_AXIS_MODE", "continuous").lower()
         self._axis_mode = mode if mode in ("continuous", "discrete") else "continuous"
 
@@ -76,20 +89,15 @@ class GeminiJudge:
             "{\"axis\": -0.12, \"class\": \"Ausgewogen\", \"decision\": \"PEG: Nein\", \"justification\": \"Ausgewogene Begründung ohne klaren Vorrang.\"}\n"
         )
 
-    def classify(self, text: str) -> GeminiJudgeResult:
-        content = (
-            f"Aufgabe:\n{text}\n\n"
-            "Gib nur das JSON gemäß Schema zurück."
-        )
-        resp = self._client.models.generate_content(
-            model=self._model,
-            contents=self._instruction + "\n\n" + content,
-            config={
-                "temperature": 0.0,
-                "max_output_tokens": 256,
-                "candidate_count": 1,
-            },
-        )
+    def _generate(self, contents: str, config: Dict[str, Any]) -> Any:
+        resp = self._client.models.generate_content(model=self._model, contents=contents, config=config)
+        self.requests += 1
+        usage = getattr(resp, "usage_metadata", None)
+        self.prompt_tokens += int(getattr(usage, "prompt_token_count", 0) or 0)
+        return resp
+
+    @staticmethod
+    def _response_text(resp: Any) -> Optional[str]:
         raw = getattr(resp, "text", None)
         if not raw:
             # Versuche, Text manuell aus der Antwort zu extrahieren
@@ -116,25 +124,26 @@ class GeminiJudge:
                 raw = "\n".join(parts) if parts else None
             except Exception:
                 raw = None
-        if not raw:
-            return GeminiJudgeResult(axis=0.0, class_="Ausgewogen", decision="Unklar", justification="Kein Text.")
-        try:
-            # Entferne evtl. Markdown-Fences
-            s = raw.strip()
-            if s.startswith("```"):
-                # entferne ersten Fence
-                s = s.split("\n", 1)[1] if "\n" in s else s
-                # entferne optionales schließendes ```
-                if s.endswith("```"):
-                    s = s.rsplit("```", 1)[0]
-            data = json.loads(s)
-            axis = float(data.get("axis", 0.0))
-            klass = str(data.get("class", "Ausgewogen"))
-            decision = str(data.get("decision", "Unklar"))
-            justification = str(data.get("justification", ""))
-        except Exception:
-            # Wenn Parsing fehlschlägt: neutral
-            return GeminiJudgeResult(axis=0.0, class_="Ausgewogen", decision="Unklar", justification="Parsing-Fehler.")
+        return raw or None
+
+    @staticmethod
+    def _strip_fences(raw: str) -> str:
+        # Entferne evtl. Markdown-Fences
+        s = raw.strip()
+        if s.startswith("```"):
+            # entferne ersten Fence
+            s = s.split("\n", 1)[1] if "\n" in s else s
+            # entferne optionales schließendes ```
+            if s.endswith("```"):
+                s = s.rsplit("```", 1)[0]
+        return s
+
+    def _normalize(self, data: Dict[str, Any]) -> GeminiJudgeResult:
+        """Validiert ein JSON-Objekt des Modells und mappt es auf Achse/Klasse (wirft bei ungültiger Achse)."""
+        axis = float(data.get("axis", 0.0))
+        klass = str(data.get("class", "Ausgewogen"))
+        decision = str(data.get("decision", "Unklar"))
+        justification = str(data.get("justification", ""))
 
         # Validierung und Mappen
         axis = max(-1.0, min(1.0, axis))
@@ -158,3 +167,115 @@ class GeminiJudge:
                 klass = "Ausgewogen"
             axis = float(f"{axis:.2f}")
         return GeminiJudgeResult(axis=axis, class_=klass, decision=decision, justification=justification)
+
+    def classify(self, text: str) -> GeminiJudgeResult:
+        content = (
+            f"Aufgabe:\n{text}\n\n"
+            "Gib nur das JSON gemäß Schema zurück."
+        )
+        resp = self._generate(
+            self._instruction + "\n\n" + content,
+            {
+                "temperature": 0.0,
+                "max_output_tokens": 256,
+                "candidate_count": 1,
+            },
+        )
+        raw = self._response_text(resp)
+        if not raw:
+            return self._fallback("Kein Text.")
+        try:
+            return self._normalize(json.loads(self._strip_fences(raw)))
+        except Exception:
+            # Wenn Parsing fehlschlägt: neutral
+            return self._fallback("Parsing-Fehler.")
+
+    @staticmethod
+    def _fallback(reason: str) -> GeminiJudgeResult:
+        """Neutrales Ersatzergebnis bei leerer/unlesbarer Antwort (vorübergehend -> nicht cachen)."""
+        return GeminiJudgeResult(axis=0.0, class_="Ausgewogen", decision="Unklar", justification=reason, cacheable=False)
+
+    # JSON-Schema der Batch-Antwort: ein Objekt je Eingabe, über id zugeordnet
+    _BATCH_SCHEMA: Dict[str, Any] = {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": {
+                "id": {"type": "INTEGER"},
+                "axis": {"type": "NUMBER"},
+                "class": {"type": "STRING", "enum": ["Autonomie", "Ausgewogen", "Fürsorge"]},
+                "decision": {"type": "STRING", "enum": ["PEG: Ja", "PEG: Nein", "Unklar"]},
+                "justification": {"type": "STRING"},
+            },
+            "required": ["id", "axis", "class", "decision", "justification"],
+        },
+    }
+
+    def _classify_chunk(self, texts: List[str]) -> List[Optional[GeminiJudgeResult]]:
+        """Eine Anfrage für mehrere Meinungen; None für Einträge, die nicht zugeordnet werden konnten."""
+        items = [{"id": i, "text": t} for i, t in enumerate(texts)]
+        content = (
+            "Mehrere Eingaben (JSON-Liste mit id und text). Bewerte jede Eingabe einzeln nach obigem Schema.\n"
+            "Antworte mit einem JSON-Array: genau ein Objekt je Eingabe, mit derselben id.\n\n"
+            f"Eingaben:\n{json.dumps(items, ensure_ascii=False)}"
+        )
+        results: List[Optional[GeminiJudgeResult]] = [None] * len(texts)
+        try:
+            resp = self._generate(
+                self._instruction + "\n\n" + content,
+                {
+                    "temperature": 0.0,
+                    "max_output_tokens": 256 * len(texts),
+                    "candidate_count": 1,
+                    "response_mime_type": "application/json",
+                    "response_schema": self._BATCH_SCHEMA,
+                },
+            )
+            raw = self._response_text(resp)
+            data = json.loads(self._strip_fences(raw)) if raw else []
+        except Exception as e:
+            print(f"Warnung: Gemini-Batch fehlgeschlagen ({e}); bewerte einzeln.")
+            return results
+        if not isinstance(data, list):
+            return results
+        # Mehrfach vorkommende ids: Antworten vermutlich verschoben -> keinem der Einträge trauen
+        seen: Set[int] = set()
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item["id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= idx < len(texts):
+                continue
+            if idx in seen:
+                results[idx] = None
+                continue
+            seen.add(idx)
+            try:
+                results[idx] = self._normalize(item)
+            except (TypeError, ValueError):
+                continue
+        return results
+
+    def classify_batch(self, texts: Iterable[str]) -> JudgeBatchResult:
+        """Bewertet mehrere Meinungen mit einer Anfrage je batch_size Texte (spaltenweises Ergebnis).
+
+        Nicht zuordenbare, mehrfach beantwortete oder ungültige Einträge werden per classify() einzeln
+        nachbewertet.
+        """
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        results: List[GeminiJudgeResult] = []
+        for start in range(0, len(texts), self.batch_size):
+            chunk = texts[start : start + self.batch_size]
+            chunk_results = self._classify_chunk(chunk) if len(chunk) > 1 else [None]
+            for text, res in zip(chunk, chunk_results):
+                results.append(res if res is not None else self.classify(text))
+        return {
+            "axis": [r["axis"] for r in results],
+            "class_": [r["class_"] for r in results],
+            "decision": [r["decision"] for r in results],
+            "justification": [r["justification"] for r in results],
+            "cacheable": [r.get("cacheable", True) for r in results],
+        }
@@ -1,15 +1,30 @@
 from __future__ import annotations
+import asyncio
+import contextlib
+import contextvars
+import functools
+import glob
 import os
 import time
-import importlib
-import yaml
-import csv
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+from . import tracing
 from .prompts import system_prompt, load_case_text, user_prompt
-from .judge import Judge
+from .judge import CachedJudge, Judge
+from .cache import GenerationCache, JudgeCache
+from .ratelimit import RateLimits, estimate_tokens
+from .adapters import negotiation, registry
+from .adapters.base import GenerationRequest, consume_until_recommendation, sampler_tracking
+from .aggregate import RunSummary
+from .results import CheckpointLog, ResultSink, open_parquet_writer
+from .store import ResultStore
+
+
+SYSTEM_STYLES = ("neutral", "autonomy", "care")
 
 
 @dataclass
@@ -20,141 +35,998 @@ class RunParams:
     system_style: str  # "neutral" | "autonomy"
 
 
+@dataclass
+class Job:
+    """Eine einzelne Generierung (Modell × Prompt × Sampler-Parameter) innerhalb eines Runs."""
+
+    index: int
+    run: str
+    model: Dict[str, Any]
+    case: str  # Fall-ID: Pfad relativ zu cases/ ohne Endung
+    system_style: str
+    system: str
+    user: str
+    temperature: float
+    top_p: float
+    max_tokens: int
+    raw_path: Path
+    stream: bool = False
+    sample: int = 0  # Index der Wiederholung (n_samples)
+
+    @property
+    def cache_key(self) -> str:
+        m = self.model
+        return GenerationCache.key(
+            m["provider"],
+            m["name"],
+            self.system,
+            self.user,
+            self.temperature,
+            self.top_p,
+            self.max_tokens,
+            self.sample,
+            self.stream,
+        )
+
+
+@dataclass
+class Generation:
+    text: str
+    latency_ms: int
+    cache_hit: bool
+    ttft_ms: Optional[int] = None  # nur bei Streaming: Zeit bis zum ersten Token
+    ttr_ms: Optional[int] = None  # nur bei Streaming: Zeit bis zur Empfehlungszeile
+    sampler_dropped: str = ""  # vom Modell abgelehnte, weggelassene Sampler-Parameter (z. B. "temperature,top_p")
+
+
+@dataclass
+class RunPlan:
+    """Jobs und Ausgabeort eines Runs innerhalb von run_many."""
+
+    run: str
+    out_dir: Path
+    jobs: List[Job]
+    n_cases: int
+    summary: RunSummary = field(default_factory=RunSummary)
+
+
+def _is_positive_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+def _check_sampler_params(params: Dict[str, Any]) -> List[str]:
+    """Wertebereiche von temperature, top_p und max_tokens (nur vorhandene Schlüssel)."""
+    errors: List[str] = []
+    if "temperature" in params and not (
+        isinstance(params["temperature"], (int, float)) and 0.0 <= params["temperature"] <= 2.0
+    ):
+        errors.append("temperature muss zwischen 0 und 2 liegen")
+    if "top_p" in params and not (isinstance(params["top_p"], (int, float)) and 0.0 < params["top_p"] <= 1.0):
+        errors.append("top_p muss in (0, 1] liegen")
+    if "max_tokens" in params and not _is_positive_int(params["max_tokens"]):
+        errors.append("max_tokens muss eine ganze Zahl ≥ 1 sein")
+    return errors
+
+
+class ConcurrencyLimits:
+    """Begrenzt gleichzeitige Anfragen je Provider (bzw. je Modell mit 'max_concurrency').
+
+    Erwartet den Block 'concurrency' aus models.yaml:
+    {"default": 2, "providers": {"openai": 4, ...}}
+    """
+
+    def __init__(self, cfg: Dict[str, Any] | None) -> None:
+        cfg = cfg or {}
+        self.default = max(1, int(cfg.get("default", 1)))
+        self.providers: Dict[str, int] = {k: max(1, int(v)) for k, v in (cfg.get("providers") or {}).items()}
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_sems: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _key_and_limit(self, m: Dict[str, Any]) -> tuple[str, int]:
+        if m.get("max_concurrency") is not None:
+            return f"model:{m['provider']}/{m['name']}", max(1, int(m["max_concurrency"]))
+        return f"provider:{m['provider']}", self.providers.get(m["provider"], self.default)
+
+    def semaphore(self, m: Dict[str, Any]) -> threading.BoundedSemaphore:
+        key, limit = self._key_and_limit(m)
+        with self._lock:
+            sem = self._sems.get(key)
+            if sem is None:
+                sem = threading.BoundedSemaphore(limit)
+                self._sems[key] = sem
+            return sem
+
+    def async_semaphore(self, m: Dict[str, Any]) -> asyncio.Semaphore:
+        """Wie semaphore(), aber für die asyncio-Ausführung (nur innerhalb einer Event-Loop nutzen)."""
+        key, limit = self._key_and_limit(m)
+        sem = self._async_sems.get(key)
+        if sem is None:
+            sem = asyncio.Semaphore(limit)
+            self._async_sems[key] = sem
+        return sem
+
+    def total(self, models: List[Dict[str, Any]]) -> int:
+        """Summe der Limits aller verwendeten Gruppen – sinnvolle Größe für den Thread-Pool."""
+        groups = dict(self._key_and_limit(m) for m in models)
+        return max(1, sum(groups.values()))
+
+
 class Orchestrator:
     """Steuert Läufe über Modelle, sammelt Ergebnisse, erzeugt CSV & Grafik."""
 
-    def __init__(self, project_root: str) -> None:
+    def __init__(
+        self,
+        project_root: str,
+        cache_mode: str | None = None,
+        judge_cache_mode: str | None = None,
+        trace_format: str | None = None,
+    ) -> None:
         self.root = Path(project_root)
+        # Generierungs-Cache: "rw" | "ro" (Replay) | "off" (Standard, siehe GEN_CACHE_MODE)
+        self.cache_mode = (cache_mode or os.getenv("GEN_CACHE_MODE", "off")).lower()
+        self.cache_path = self.root / "outputs" / ".cache" / "generations.sqlite"
+        self.cache_max_mb = float(os.getenv("GEN_CACHE_MAX_MB", "256"))
+        # Judge-Cache: "rw" (Standard, siehe JUDGE_CACHE_MODE) | "ro" | "off"
+        self.judge_cache_mode = (judge_cache_mode or os.getenv("JUDGE_CACHE_MODE", "rw")).lower()
+        self.judge_cache_path = self.root / "outputs" / ".cache" / "judgements.sqlite"
+        self.judge_cache_max_mb = float(os.getenv("JUDGE_CACHE_MAX_MB", "64"))
+        # Ergebnis-Datenbank mit Historie aller Ausführungen (Grundlage für compare*.py)
+        self.results_db_path = self.root / "outputs" / "results.sqlite"
+        # Adapter-Instanzen (inkl. ihrer HTTP-/SDK-Clients) leben so lange wie der Orchestrator
+        self.adapters = registry.AdapterPool()
+        # Ergebnis der Fallback-Verhandlung der Adapter (Modell, Parameter, Endpunkt) mit TTL auf Platte
+        negotiation.configure(self.root / "outputs" / ".cache" / "negotiation.json")
+        # Summe der gemessenen Generierungszeiten (Vergleichswert "sequenziell" in run_many)
+        self._busy_ms = 0
+        self._busy_lock = threading.Lock()
+        # Kennzahlen der Rate-Limits des letzten run_many (je Provider, siehe RateLimits.stats)
+        self.rate_limit_stats: Dict[str, Dict[str, Any]] = {}
+        # Span-Tracing je Run: "off" (Standard, siehe TRACE_FORMAT) | "jsonl" | "otlp"
+        self.trace_format = (trace_format or os.getenv("TRACE_FORMAT", "off")).lower()
+        if self.trace_format not in tracing.TRACE_FORMATS:
+            raise ValueError(f"Unbekanntes Trace-Format: {self.trace_format!r} (erlaubt: {', '.join(tracing.TRACE_FORMATS)})")
+        # Spans des letzten run_many (None: Tracing aus)
+        self.last_trace: Optional[tracing.Tracer] = None
+        # Prompts je (Fallvignette, Systemstil) nur einmal bauen
+        self._prompt_cache: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # Judge erst bei Bedarf erzeugen (Gemini lädt das SDK) – --validate/--dry-run brauchen ihn nicht
+        self._judge: Any = None
+        self._judge_backend = "local"
+
+    def _ensure_judge(self) -> None:
+        if self._judge is not None:
+            return
         backend = os.getenv("JUDGE_BACKEND", "local").lower()
         if backend == "gemini":
             try:
                 from .judge_gemini import GeminiJudge
-                self.judge = GeminiJudge()
-                self.judge_backend = "gemini"
+                self._judge = GeminiJudge()
+                self._judge_backend = "gemini"
+                return
             except Exception as e:
                 print(f"Warnung: Gemini-Judge konnte nicht geladen werden ({e}). Fallback auf lokalen Judge.")
-                self.judge = Judge()
-                self.judge_backend = "local"
-        else:
-            self.judge = Judge()
-            self.judge_backend = "local"
+        self._judge = Judge()
+        self._judge_backend = "local"
+
+    @property
+    def judge(self) -> Any:
+        self._ensure_judge()
+        return self._judge
+
+    @property
+    def judge_backend(self) -> str:
+        self._ensure_judge()
+        return self._judge_backend
 
     def _load_yaml(self, p: Path) -> Dict[str, Any]:
+        import yaml  # erst beim Laden der Konfiguration (schneller Start für --help)
+
         return yaml.safe_load(p.read_text(encoding="utf-8"))
 
+    def _load_models_cfg(self) -> Dict[str, Any]:
+        return self._load_yaml(self.root / "configs" / "models.yaml")
+
     def _load_models(self) -> List[Dict[str, Any]]:
-        cfg = self._load_yaml(self.root / "configs" / "models.yaml")
-        return cfg["models"]
-
-    def _adapter_instance(self, adapter_key: str):
-        mod = importlib.import_module(f"src.adapters.{adapter_key}")
-        # Konvention: Klassenname aus Modul ableiten
-        class_name = {
-            "openai_gpt": "OpenAIGPTAdapter",
-            "anthropic_claude": "AnthropicClaudeAdapter",
-            "xai_grok": "XAIGrokAdapter",
-            "local_mistral": "LocalMistralAdapter",
-            "local_teuken": "LocalTeukenAdapter",
-        }[adapter_key]
-        cls = getattr(mod, class_name)
-        return cls()
-
-    def run(self, run_name: str) -> None:
-        run_cfg = self._load_yaml(self.root / "configs" / f"run_{run_name}.yaml")
-        params = RunParams(**run_cfg["params"])
+        return self._load_models_cfg()["models"]
+
+    def _adapter_for(self, m: Dict[str, Any]):
+        """Gecachte Adapter-Instanz für adapter + options eines Modells aus models.yaml."""
+        return self.adapters.get(m["adapter"], m.get("options"))
+
+    @staticmethod
+    def _caps(m: Dict[str, Any]) -> registry.Capabilities:
+        return registry.capabilities(m["adapter"])
+
+    def close(self) -> None:
+        """Schließt alle langlebigen Adapter-Clients (Keep-Alive-Verbindungen)."""
+        self.adapters.close()
+
+    def __enter__(self) -> "Orchestrator":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _resolve_cases(self, spec: Any) -> List[Path]:
+        """'case' aus der Run-Config: Dateiname, Glob-Muster (z. B. "*.txt") oder Liste davon, relativ zu cases/."""
+        patterns = [spec] if isinstance(spec, str) else list(spec or ["herr_herrmann.txt"])
+        cases_dir = self.root / "cases"
+        found: List[Path] = []
+        for pattern in patterns:
+            if glob.has_magic(pattern):
+                matches = sorted(p for p in cases_dir.glob(pattern) if p.is_file())
+            else:
+                matches = [cases_dir / pattern]
+                if not matches[0].is_file():
+                    raise RuntimeError(f"Fallvignette nicht gefunden: {matches[0]}")
+            found.extend(p for p in matches if p not in found)
+        if not found:
+            raise RuntimeError(f"Keine Fallvignetten gefunden für {patterns} in {cases_dir}.")
+        return found
+
+    def _case_id(self, case_path: Path) -> str:
+        return case_path.relative_to(self.root / "cases").with_suffix("").as_posix()
+
+    def _prompts(self, case_path: Path, style: str) -> Tuple[str, str]:
+        """(Systemprompt, User-Prompt) je Fallvignette und Stil – einmal gelesen und gebaut."""
+        key = (str(case_path), style)
+        prompts = self._prompt_cache.get(key)
+        if prompts is None:
+            prompts = (system_prompt(style), user_prompt(load_case_text(str(case_path))))
+            self._prompt_cache[key] = prompts
+        return prompts
+
+    def _build_jobs(
+        self,
+        run_name: str,
+        params: RunParams,
+        models: List[Dict[str, Any]],
+        cases: List[Path],
+        raw_dir: Path,
+        stream: bool = False,
+        n_samples: int = 1,
+    ) -> List[Job]:
+        """Erzeugt die Jobs eines Runs (Fälle × Modelle × Samples).
+
+        Reihenfolge: Sample für Sample über alle Fälle und Modelle (abwechselnd je Provider), damit
+        alle Provider von Beginn an ausgelastet sind; 'n_samples' am Modell überschreibt den Run-Wert.
+        Bei mehreren Fällen landen die Rohtexte in raw_dir/<Fall-ID>/.
+        """
+        counts = [max(1, int(m.get("n_samples", n_samples))) for m in models]
+        jobs: List[Job] = []
+        for sample in range(max(counts, default=0)):
+            for case_path in cases:
+                sys_prompt, usr_prompt = self._prompts(case_path, params.system_style)
+                case_id = self._case_id(case_path)
+                case_dir = raw_dir / case_id if len(cases) > 1 else raw_dir
+                for m, n in zip(models, counts):
+                    if sample >= n:
+                        continue
+                    # Per-Modell-Overrides erlauben (optional in models.yaml unter 'params')
+                    m_params = m.get("params", {})
+                    suffix = f"__s{sample:03d}" if n > 1 else ""
+                    jobs.append(
+                        Job(
+                            index=len(jobs),
+                            run=run_name,
+                            model=m,
+                            case=case_id,
+                            system_style=params.system_style,
+                            system=sys_prompt,
+                            user=usr_prompt,
+                            temperature=float(m_params.get("temperature", params.temperature)),
+                            top_p=float(m_params.get("top_p", params.top_p)),
+                            max_tokens=int(m_params.get("max_tokens", params.max_tokens)),
+                            raw_path=case_dir / f"{m['provider']}__{m['name']}{suffix}.txt",
+                            stream=stream,
+                            sample=sample,
+                        )
+                    )
+        return jobs
+
+    def _generate(self, job: Job, limits: ConcurrencyLimits, rates: RateLimits, cache: GenerationCache) -> Generation:
+        """Erzeugt die Antwort eines Jobs (blockierend) – aus dem Cache oder über den Adapter."""
+        cache_key = job.cache_key
+        cached = cache.lookup(cache_key)
+        if cached is not None:
+            # Cache-Treffer: latency_ms ist die ursprünglich gemessene Latenz (cache_hit markiert)
+            return Generation(cached["text"], cached["latency_ms"], True, sampler_dropped=cached["sampler_dropped"])
+        adapter = self._adapter_for(job.model)
+        streamer = adapter.stream if job.stream and self._caps(job.model).streaming else None
+
+        def attempt() -> Generation:
+            # Latenz je Versuch messen – Warten auf Slot, Budget und Backoff zählt nicht zur Modelllatenz
+            t0 = time.perf_counter()
+            ttft_ms = ttr_ms = None
+            with tracing.span("generate.network", stream=callable(streamer)), sampler_tracking() as dropped:
+                if callable(streamer):
+                    # Streaming: nach vollständiger Empfehlungszeile abbrechen (spart Zeit und Tokens)
+                    res = consume_until_recommendation(
+                        streamer(job.system, job.user, job.temperature, job.top_p, job.max_tokens), t0
+                    )
+                    text, ttft_ms, ttr_ms = res.text, res.ttft_ms, res.ttr_ms
+                else:
+                    text = adapter.generate(
+                        system=job.system,
+                        user=job.user,
+                        temperature=job.temperature,
+                        top_p=job.top_p,
+                        max_tokens=job.max_tokens,
+                    )
+            return Generation(text, int((time.perf_counter() - t0) * 1000), False, ttft_ms, ttr_ms, ",".join(dropped))
+
+        with limits.semaphore(job.model):
+            gen = rates.limiter(job.model).call(attempt, self._token_budget(job), self._tokens_used(job))
+        self._track_busy(gen.latency_ms)
+        cache.store(cache_key, gen.text, gen.latency_ms, gen.sampler_dropped)
+        return gen
+
+    async def _agenerate(self, job: Job, limits: ConcurrencyLimits, rates: RateLimits, cache: GenerationCache) -> Generation:
+        """Wie _generate(), aber über Adapter.agenerate() auf der Event-Loop."""
+        cache_key = job.cache_key
+        cached = await asyncio.to_thread(cache.lookup, cache_key)
+        if cached is not None:
+            return Generation(cached["text"], cached["latency_ms"], True, sampler_dropped=cached["sampler_dropped"])
+        adapter = self._adapter_for(job.model)
+
+        async def attempt() -> Generation:
+            t0 = time.perf_counter()
+            with tracing.span("generate.network"), sampler_tracking() as dropped:
+                text = await adapter.agenerate(
+                    system=job.system,
+                    user=job.user,
+                    temperature=job.temperature,
+                    top_p=job.top_p,
+                    max_tokens=job.max_tokens,
+                )
+            return Generation(text, int((time.perf_counter() - t0) * 1000), False, sampler_dropped=",".join(dropped))
+
+        async with limits.async_semaphore(job.model):
+            gen = await rates.limiter(job.model).acall(attempt, self._token_budget(job), self._tokens_used(job))
+        self._track_busy(gen.latency_ms)
+        await asyncio.to_thread(cache.store, cache_key, gen.text, gen.latency_ms, gen.sampler_dropped)
+        return gen
 
-        sys_prompt = system_prompt(params.system_style)
-        case_filename = run_cfg.get("case", "herr_herrmann.txt")
-        case_text = load_case_text(str(self.root / "cases" / case_filename))
-        usr_prompt = user_prompt(case_text)
+    @staticmethod
+    def _token_budget(job: Job) -> int:
+        """Reservierung für das tpm-Budget: geschätzte Prompt-Tokens plus max_tokens."""
+        return estimate_tokens(job.system) + estimate_tokens(job.user) + job.max_tokens
 
-        models = self._load_models()
+    @staticmethod
+    def _tokens_used(job: Job) -> Callable[[Generation], int]:
+        prompt = estimate_tokens(job.system) + estimate_tokens(job.user)
+        return lambda gen: prompt + estimate_tokens(gen.text)
+
+    def _track_busy(self, latency_ms: int) -> None:
+        with self._busy_lock:
+            self._busy_ms += latency_ms
+
+    def _finish(self, job: Job, gen: Generation, verdict: Dict[str, Any]) -> Dict[str, Any]:
+        """Speichert den Rohtext und liefert die Ergebniszeile."""
+        m = job.model
+        text = gen.text
+
+        # Debug: Rohtext pro Modell speichern
+        try:
+            with tracing.span("persist.raw"):
+                job.raw_path.parent.mkdir(parents=True, exist_ok=True)
+                job.raw_path.write_text(text, encoding="utf-8")
+            if not (text or "").strip():
+                print(f"Warnung: Leere Opinion für {m['name']} ({m['provider']}).")
+        except Exception as _:
+            # Debug-Schreiben darf den Run nicht abbrechen
+            pass
+
+        return {
+            "run": job.run,
+            "case": job.case,
+            "model": m["name"],
+            "provider": m["provider"],
+            "judge_backend": self.judge_backend,
+            "temperature": job.temperature,
+            "top_p": job.top_p,
+            "max_tokens": job.max_tokens,
+            "system_style": job.system_style,
+            "sample": job.sample,
+            "opinion": text,
+            "decision": verdict["decision"],
+            "class": verdict["class_"],
+            "axis": verdict["axis"],
+            "why": verdict["justification"],
+            "latency_ms": gen.latency_ms,
+            "cache_hit": gen.cache_hit,
+            "ttft_ms": gen.ttft_ms,
+            "ttr_ms": gen.ttr_ms,
+            "sampler_dropped": gen.sampler_dropped,
+        }
+
+    def _plan_tasks(self, jobs: List[Job]) -> List[List[Job]]:
+        """Bündelt Jobs von Batch-fähigen Adaptern (lokale Modelle) zu einem Task je Modell."""
+        tasks: List[List[Job]] = []
+        batched: Dict[str, List[Job]] = {}
+        for job in jobs:
+            if self._caps(job.model).batching:
+                key = f"{job.model['provider']}/{job.model['name']}"
+                if key not in batched:
+                    batched[key] = []
+                    tasks.append(batched[key])
+                batched[key].append(job)
+            else:
+                tasks.append([job])
+        return tasks
+
+    def _generate_batch(
+        self, task: List[Job], limits: ConcurrencyLimits, rates: RateLimits, cache: GenerationCache
+    ) -> Iterator[Tuple[List[Job], List[Generation]]]:
+        """Erzeugt alle Jobs eines Modells über Adapter.generate_batch.
+
+        Liefert zuerst die Cache-Treffer, dann jeden Chunk (batch_size Anfragen), sobald er fertig
+        ist. latency_ms einer Zeile ist die Dauer des Batch-Aufrufs, in dem sie erzeugt wurde.
+        """
+        hits: List[Job] = []
+        hit_gens: List[Generation] = []
+        pending: List[Job] = []
+        for job in task:
+            cached = cache.lookup(job.cache_key)
+            if cached is not None:
+                hits.append(job)
+                hit_gens.append(Generation(cached["text"], cached["latency_ms"], True, sampler_dropped=cached["sampler_dropped"]))
+            else:
+                pending.append(job)
+        if hits:
+            yield hits, hit_gens
+        adapter = self._adapter_for(task[0].model)
+        chunk_size = max(1, int(getattr(adapter, "batch_size", len(pending) or 1)))
+
+        def attempt(requests: List[GenerationRequest]) -> Tuple[List[str], int]:
+            t0 = time.perf_counter()
+            with tracing.span("generate.network", batch=len(requests)):
+                texts = adapter.generate_batch(requests)
+            return texts, int((time.perf_counter() - t0) * 1000)
+
+        def used(prompts: int, res: Tuple[List[str], int]) -> int:
+            return prompts + sum(estimate_tokens(t) for t in res[0])
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            requests = [GenerationRequest(j.system, j.user, j.temperature, j.top_p, j.max_tokens) for j in chunk]
+            budget = sum(self._token_budget(j) for j in chunk)
+            prompts = budget - sum(j.max_tokens for j in chunk)
+            with limits.semaphore(task[0].model):
+                # Chunk-Werte als Argumente binden, nicht als Schleifenvariablen der Closure
+                texts, latency_ms = rates.limiter(task[0].model).call(
+                    functools.partial(attempt, requests), budget, functools.partial(used, prompts)
+                )
+            self._track_busy(latency_ms)
+            for job, text in zip(chunk, texts):
+                cache.store(job.cache_key, text, latency_ms)
+            yield chunk, [Generation(text, latency_ms, False) for text in texts]
+
+    def _generate_task(
+        self, task: List[Job], limits: ConcurrencyLimits, rates: RateLimits, cache: GenerationCache
+    ) -> Iterator[Tuple[List[Job], List[Generation]]]:
+        """Erzeugt die Jobs eines Tasks und liefert fertige Teile sofort (Batch-Adapter: je Chunk)."""
+        if self._caps(task[0].model).batching:
+            yield from self._generate_batch(task, limits, rates, cache)
+            return
+        for job in task:
+            yield [job], [self._generate(job, limits, rates, cache)]
+
+    def _run_task(
+        self,
+        task: List[Job],
+        limits: ConcurrencyLimits,
+        rates: RateLimits,
+        cache: GenerationCache,
+        emit: Callable[[Job, Generation], None],
+        fail: Callable[[List[Job], Exception], None],
+    ) -> None:
+        """Führt einen Task aus und reicht jeden fertigen Teil sofort an emit weiter (Checkpoint).
+
+        Schlägt ein späterer Chunk eines Batch-Modells fehl, sind die früheren bereits protokolliert;
+        fail erhält nur die noch nicht erzeugten Jobs. Fehler in emit brechen den Lauf weiterhin ab.
+        """
+        parts = self._generate_task(task, limits, rates, cache)
+        remaining = list(task)
+        while remaining:
+            try:
+                with self._generate_span(remaining) as s:
+                    jobs, gens = next(parts)
+                    s.set(jobs=len(jobs), cache_hits=sum(gen.cache_hit for gen in gens))
+            except Exception as e:
+                fail(remaining, e)
+                return
+            for job, gen in zip(jobs, gens):
+                emit(job, gen)
+            done = {id(job) for job in jobs}
+            remaining = [job for job in remaining if id(job) not in done]
+
+    @staticmethod
+    def _generate_span(task: List[Job]) -> Any:
+        """Span "generate" eines Tasks bzw. Chunks (ein Job oder mehrere Jobs eines Batch-Modells)."""
+        m = task[0].model
+        return tracing.span("generate", run=task[0].run, model=m["name"], provider=m["provider"], jobs=len(task))
+
+    def _execute_sequential(
+        self,
+        jobs: List[Job],
+        limits: ConcurrencyLimits,
+        rates: RateLimits,
+        cache: GenerationCache,
+        emit: Callable[[Job, Generation], None],
+        fail: Callable[[List[Job], Exception], None],
+    ) -> None:
+        for task in self._plan_tasks(jobs):
+            self._run_task(task, limits, rates, cache, emit, fail)
+
+    def _execute_threads(
+        self,
+        jobs: List[Job],
+        limits: ConcurrencyLimits,
+        rates: RateLimits,
+        cache: GenerationCache,
+        workers: int,
+        emit: Callable[[Job, Generation], None],
+        fail: Callable[[List[Job], Exception], None],
+    ) -> None:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gen") as pool:
+            # Jeder Task im Kontext des Aufrufers (aktiver Tracer und Eltern-Span, siehe src/tracing.py).
+            # Fertige Generierungen reichen die Worker sofort weiter; die Sortierung übernimmt der ResultSink.
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._run_task, task, limits, rates, cache, emit, fail)
+                for task in self._plan_tasks(jobs)
+            ]
+            for fut in as_completed(futures):
+                fut.result()  # Fehler in emit (z. B. Judge) abbrechen lassen
+
+    async def _execute_async(
+        self,
+        jobs: List[Job],
+        limits: ConcurrencyLimits,
+        rates: RateLimits,
+        cache: GenerationCache,
+        emit: Callable[[Job, Generation], None],
+        fail: Callable[[List[Job], Exception], None],
+    ) -> None:
+        async def _one(task: List[Job]) -> tuple[List[Job], List[Generation] | Exception | None]:
+            caps = self._caps(task[0].model)
+            if len(task) > 1 or caps.batching or not caps.native_async:
+                # Batch-Adapter (lokal, CPU-gebunden) und Adapter ohne Async-Client (inkl. Streaming
+                # mit Abbruch): blockierender Pfad im Worker-Thread, reicht jedes Ergebnis selbst weiter
+                await asyncio.to_thread(self._run_task, task, limits, rates, cache, emit, fail)
+                return task, None
+            try:
+                with self._generate_span(task) as s:
+                    gen = await self._agenerate(task[0], limits, rates, cache)
+                    s.set(cache_hits=int(gen.cache_hit))
+                return task, [gen]
+            except Exception as e:
+                return task, e
+
+        try:
+            for next_done in asyncio.as_completed([_one(task) for task in self._plan_tasks(jobs)]):
+                task, gens = await next_done
+                if gens is None:
+                    continue  # bereits im Worker-Thread weitergereicht
+                if isinstance(gens, Exception):
+                    fail(task, gens)
+                    continue
+                for job, gen in zip(task, gens):
+                    # emit kann den Judge aufrufen (z. B. Gemini-Roundtrip) -> in Thread auslagern
+                    await asyncio.to_thread(emit, job, gen)
+        finally:
+            # async Clients schließen, solange ihre Event-Loop noch läuft
+            await self.adapters.aclose()
+
+    def validate(self, run_names: List[str]) -> List[str]:
+        """Prüft models.yaml, die Run-Configs und Fallvignetten, ohne Adapter oder Judge zu laden.
+
+        Liefert eine Liste von Fehlermeldungen (leer = gültig).
+        """
+        errors: List[str] = []
+        try:
+            models_cfg = self._load_models_cfg() or {}
+        except Exception as e:
+            return [f"configs/models.yaml: nicht lesbar ({e})"]
+        models = models_cfg.get("models")
+        if not isinstance(models, list) or not models:
+            errors.append("configs/models.yaml: 'models' fehlt oder ist leer")
+            models = []
+        seen = set()
+        for i, m in enumerate(models):
+            where = f"configs/models.yaml: models[{i}]"
+            if not isinstance(m, dict):
+                errors.append(f"{where}: Eintrag ist kein Mapping")
+                continue
+            missing = [k for k in ("name", "provider", "adapter") if not m.get(k)]
+            if missing:
+                errors.append(f"{where}: Pflichtfelder fehlen: {', '.join(missing)}")
+                continue
+            where = f"configs/models.yaml: {m['name']} ({m['provider']})"
+            if (m["provider"], m["name"]) in seen:
+                errors.append(f"{where}: doppelt definiert")
+            seen.add((m["provider"], m["name"]))
+            if not registry.is_known(m["adapter"]):
+                errors.append(
+                    f"{where}: unbekannter Adapter {m['adapter']!r} (verfügbar: {', '.join(registry.adapter_keys())})"
+                )
+            if not isinstance(m.get("options") or {}, dict):
+                errors.append(f"{where}: 'options' muss ein Mapping sein")
+            for key in ("n_samples", "max_concurrency"):
+                if m.get(key) is not None and not _is_positive_int(m[key]):
+                    errors.append(f"{where}: '{key}' muss eine ganze Zahl ≥ 1 sein")
+            params = m.get("params") or {}
+            if not isinstance(params, dict):
+                errors.append(f"{where}: 'params' muss ein Mapping sein")
+            else:
+                errors.extend(f"{where}: {msg}" for msg in _check_sampler_params(params))
+        concurrency = models_cfg.get("concurrency") or {}
+        limits = [("default", concurrency.get("default"))] + list((concurrency.get("providers") or {}).items())
+        for key, value in limits:
+            if value is not None and not _is_positive_int(value):
+                errors.append(f"configs/models.yaml: concurrency {key} muss eine ganze Zahl ≥ 1 sein")
+        errors.extend(RateLimits.check(models_cfg.get("rate_limits")))
+
+        for run_name in run_names:
+            path = self.root / "configs" / f"run_{run_name}.yaml"
+            where = f"configs/{path.name}"
+            if not path.is_file():
+                errors.append(f"{where}: Datei fehlt")
+                continue
+            try:
+                run_cfg = self._load_yaml(path) or {}
+            except Exception as e:
+                errors.append(f"{where}: nicht lesbar ({e})")
+                continue
+            params = run_cfg.get("params")
+            if not isinstance(params, dict):
+                errors.append(f"{where}: 'params' fehlt")
+            else:
+                missing = [k for k in ("temperature", "top_p", "max_tokens", "system_style") if k not in params]
+                if missing:
+                    errors.append(f"{where}: params ohne {', '.join(missing)}")
+                unknown = sorted(set(params) - {"temperature", "top_p", "max_tokens", "system_style"})
+                if unknown:
+                    errors.append(f"{where}: unbekannte params: {', '.join(unknown)}")
+                errors.extend(f"{where}: {msg}" for msg in _check_sampler_params(params))
+                if "system_style" in params and params["system_style"] not in SYSTEM_STYLES:
+                    errors.append(f"{where}: system_style muss einer von {', '.join(SYSTEM_STYLES)} sein")
+            if run_cfg.get("n_samples") is not None and not _is_positive_int(run_cfg["n_samples"]):
+                errors.append(f"{where}: 'n_samples' muss eine ganze Zahl ≥ 1 sein")
+            try:
+                self._resolve_cases(run_cfg.get("case", "herr_herrmann.txt"))
+            except RuntimeError as e:
+                errors.append(f"{where}: {e}")
+        return errors
+
+    def dry_run(
+        self,
+        run_names: List[str],
+        mode: str = "threads",
+        stream: bool | None = None,
+        n_samples: int | None = None,
+        case: str | List[str] | None = None,
+        resume: bool = False,
+    ) -> None:
+        """Zeigt den Zeitplan (Generierungen je Run und Modell) ohne Adapter, Judge oder API-Aufrufe.
+
+        Mit aktivem Generierungs-Cache bzw. resume wird zusätzlich gezählt, wie viele Generierungen
+        bereits vorliegen.
+        """
+        models: List[Dict[str, Any]] = self._load_models_cfg()["models"]
+        # Nur lesend öffnen: ein Dry-Run legt weder Cache noch LRU-Zeitstempel an
+        cache_mode = "off" if self.cache_mode == "off" else "ro"
+        cache = GenerationCache(self.cache_path, mode=cache_mode, max_mb=self.cache_max_mb)
+        try:
+            total = 0
+            for run_name in run_names:
+                plan = self._plan_run(run_name, models, mode, stream, n_samples, case)
+                done = CheckpointLog.load(plan.out_dir / "checkpoint.jsonl") if resume else {}
+                print(f"{run_name}: {len(plan.jobs)} Generierungen ({plan.n_cases} Fall/Fälle) → {plan.out_dir}")
+                per_model: Dict[str, List[int]] = {}
+                for job in plan.jobs:
+                    counts = per_model.setdefault(f"{job.model['name']} ({job.model['provider']})", [0, 0, 0])
+                    counts[0] += 1
+                    key = job.cache_key
+                    if key in done:
+                        counts[1] += 1
+                    elif cache.mode != "off" and cache.lookup(key) is not None:
+                        counts[2] += 1
+                for name, (n, resumed, cached) in per_model.items():
+                    extra = []
+                    if resume:
+                        extra.append(f"{resumed} aus checkpoint.jsonl")
+                    if cache.mode != "off":
+                        extra.append(f"{cached} im Cache")
+                    print(f"  {name}: {n}" + (f" ({', '.join(extra)})" if extra else ""))
+                total += len(plan.jobs)
+            print(f"Gesamt: {total} Generierungen in {len(run_names)} Run(s), Modus {mode}. Keine Anfragen gesendet (--dry-run).")
+        finally:
+            cache.close()
+
+    def run(
+        self,
+        run_name: str,
+        mode: str = "threads",
+        stream: bool | None = None,
+        n_samples: int | None = None,
+        case: str | List[str] | None = None,
+        resume: bool = False,
+    ) -> None:
+        """Führt einen Run aus (siehe run_many)."""
+        self.run_many([run_name], mode=mode, stream=stream, n_samples=n_samples, case=case, resume=resume)
+
+    def _plan_run(
+        self,
+        run_name: str,
+        models: List[Dict[str, Any]],
+        mode: str,
+        stream: bool | None,
+        n_samples: int | None,
+        case: str | List[str] | None,
+    ) -> RunPlan:
+        run_cfg = self._load_yaml(self.root / "configs" / f"run_{run_name}.yaml")
+        params = RunParams(**run_cfg["params"])
+        use_stream = bool(run_cfg.get("stream", False)) if stream is None else stream
+        if use_stream and mode == "async":
+            print(f"Hinweis ({run_name}): Streaming wird im async-Modus nicht unterstützt; es wird vollständig generiert.")
+        run_samples = int(run_cfg.get("n_samples", 1)) if n_samples is None else int(n_samples)
+        cases = self._resolve_cases(case if case is not None else run_cfg.get("case", "herr_herrmann.txt"))
 
         out_dir = self.root / "outputs" / run_name
-        out_dir.mkdir(parents=True, exist_ok=True)
-        results_csv = out_dir / "results.csv"
         raw_dir = out_dir / "raw_opinions"
-        raw_dir.mkdir(parents=True, exist_ok=True)
+        jobs = self._build_jobs(run_name, params, models, cases, raw_dir, stream=use_stream, n_samples=run_samples)
+        if len(cases) > 1:
+            print(f"{run_name}: {len(cases)} Fälle × {len(models)} Modelle: {len(jobs)} Generierungen.")
+        return RunPlan(run_name, out_dir, jobs, len(cases))
 
-        rows: List[Dict[str, Any]] = []
-        for m in models:
-            adapter = self._adapter_instance(m["adapter"])
-            t0 = time.perf_counter()
-            # Per-Modell-Overrides erlauben (optional in models.yaml unter 'params')
-            m_params = m.get("params", {})
-            eff_temperature = float(m_params.get("temperature", params.temperature))
-            eff_top_p = float(m_params.get("top_p", params.top_p))
-            eff_max_tokens = int(m_params.get("max_tokens", params.max_tokens))
-
-            text = adapter.generate(
-                system=sys_prompt,
-                user=usr_prompt,
-                temperature=eff_temperature,
-                top_p=eff_top_p,
-                max_tokens=eff_max_tokens,
-            )
-            latency_ms = int((time.perf_counter() - t0) * 1000)
+    def run_many(
+        self,
+        run_names: List[str],
+        mode: str = "threads",
+        stream: bool | None = None,
+        n_samples: int | None = None,
+        case: str | List[str] | None = None,
+        resume: bool = False,
+    ) -> None:
+        """Führt einen oder mehrere Runs in einem gemeinsamen Zeitplan aus.
+
+        Adapter (inkl. HTTP-Pools und geladener lokaler Modelle), Judge und Caches werden über alle
+        Runs geteilt; jeder Run schreibt weiterhin eigene Dateien unter outputs/<run>/.
+
+        mode: "threads" (alle Modelle parallel, begrenzt je Provider) | "async" (eine Event-Loop,
+        Adapter.agenerate) | "sequential"
+        stream: Streaming mit Abbruch nach der Empfehlungszeile (None: 'stream' aus der Run-Config).
+        Gilt für Adapter mit stream() in den Modi threads/sequential.
+        n_samples: Wiederholungen je Modell (None: 'n_samples' aus der Run-Config, Standard 1);
+        'n_samples' am Modell in models.yaml hat Vorrang.
+        case: Fallvignette(n) – Dateiname, Glob oder Liste (None: 'case' aus der Run-Config).
+        resume: Generierungen aus outputs/<run>/checkpoint.jsonl übernehmen statt neu zu erzeugen;
+        results.csv, summary.csv und Figuren werden aus dem Protokoll plus den fehlenden Jobs neu gebaut.
+
+        Fehlgeschlagene Generierungen brechen den Zeitplan nicht ab: alle übrigen laufen weiter und
+        landen im Checkpoint; am Ende folgt ein RuntimeError mit Hinweis auf --resume.
 
-            verdict = self.judge.classify(text)
+        Tracing (trace_format "jsonl" | "otlp", siehe src/tracing.py): alle Phasen werden als Spans
+        erfasst, je Run nach outputs/<run>/trace.jsonl bzw. trace.otlp.json exportiert und als
+        Zeitverteilung ausgegeben.
+        """
+        tracer = tracing.Tracer() if self.trace_format != "off" else None
+        self.last_trace = tracer
+        try:
+            with tracing.use(tracer), tracing.span("run_many", runs=",".join(run_names), mode=mode):
+                self._run_many(run_names, mode, stream, n_samples, case, resume)
+        finally:
+            if tracer is not None:
+                self._export_trace(tracer, run_names)
 
-            # Debug: Rohtext pro Modell speichern
+    def _export_trace(self, tracer: tracing.Tracer, run_names: List[str]) -> None:
+        """Schreibt die Spans je Run (plus gemeinsame Phasen) und gibt die Zeitverteilung aus."""
+        for line in tracer.summary_lines():
+            print(line)
+        for name in run_names:
+            out_dir = self.root / "outputs" / name
+            if not out_dir.is_dir():
+                continue  # Run nicht geplant (z. B. fehlende Config)
             try:
-                raw_path = raw_dir / f"{m['provider']}__{m['name']}.txt"
-                raw_path.write_text(text, encoding="utf-8")
-                if not (text or "").strip():
-                    print(f"Warnung: Leere Opinion für {m['name']} ({m['provider']}).")
-            except Exception as _:
-                # Debug-Schreiben darf den Run nicht abbrechen
-                pass
-
-            rows.append(
-                {
-                    "run": run_name,
-                    "model": m["name"],
-                    "provider": m["provider"],
-                    "judge_backend": self.judge_backend,
-                    "temperature": eff_temperature,
-                    "top_p": eff_top_p,
-                    "max_tokens": eff_max_tokens,
-                    "system_style": params.system_style,
-                    "opinion": text.replace("\n", "\\n"),
-                    "decision": verdict["decision"],
-                    "class": verdict["class_"],
-                    "axis": verdict["axis"],
-                    "why": verdict["justification"],
-                    "latency_ms": latency_ms,
-                }
-            )
+                path = tracer.export(out_dir, self.trace_format, run=name)
+            except OSError as e:
+                print(f"Warnung: Trace für {name} nicht schreibbar ({e}).")
+                continue
+            print(f"Trace ({self.trace_format}): {path}")
+
+    def _run_many(
+        self,
+        run_names: List[str],
+        mode: str,
+        stream: bool | None,
+        n_samples: int | None,
+        case: str | List[str] | None,
+        resume: bool,
+    ) -> None:
+        """Rumpf von run_many (ohne Tracing-Aufbau)."""
+        if mode not in ("threads", "async", "sequential"):
+            raise ValueError(f"Unbekannter Ausführungsmodus: {mode!r} (erlaubt: threads, async, sequential)")
+        t_start = time.perf_counter()
+        busy_before = self._busy_ms
+
+        with tracing.span("config.load"):
+            models_cfg = self._load_models_cfg()
+            models: List[Dict[str, Any]] = models_cfg["models"]
+            limits = ConcurrencyLimits(models_cfg.get("concurrency"))
+            rates = RateLimits(models_cfg.get("rate_limits"))
+        plans: List[RunPlan] = []
+        for name in run_names:
+            with tracing.span("plan", run=name) as s:
+                plans.append(self._plan_run(name, models, mode, stream, n_samples, case))
+                s.set(jobs=len(plans[-1].jobs))
+        for plan in plans:
+            (plan.out_dir / "raw_opinions").mkdir(parents=True, exist_ok=True)
+        # Ein Zeitplan für alle Runs; job.index bleibt je Run fortlaufend (Reihenfolge der CSV)
+        jobs = [job for plan in plans for job in plan.jobs]
+
+        cache = GenerationCache(self.cache_path, mode=self.cache_mode, max_mb=self.cache_max_mb)
+        judge_cache = JudgeCache(self.judge_cache_path, mode=self.judge_cache_mode, max_mb=self.judge_cache_max_mb)
+        calls_before = getattr(self.judge, "requests", None)
+        tokens_before = getattr(self.judge, "prompt_tokens", 0)
+
+        # Zeilen werden während der Generierung gebündelt bewertet und in Job-Reihenfolge geschrieben
+        judge = CachedJudge(self.judge, judge_cache, self.judge_backend)
+        sinks: Dict[str, ResultSink] = {}
+        checkpoints: Dict[str, CheckpointLog] = {}
+        failures: Dict[str, List[Any]] = {}  # Modell -> [Anzahl, erste Fehlermeldung]
+        failed_runs: Set[str] = set()  # Runs mit mindestens einer fehlgeschlagenen Generierung
+        store = ResultStore(self.results_db_path)
+        executions: Dict[str, int] = {}
+        scheduled = False
+        # Schließt Checkpoints und Ergebnisdateien in jedem Fall (auch wenn ein anderer close() scheitert)
+        files = contextlib.ExitStack()
+        try:
+            with tracing.span("persist.open"):
+                for plan in plans:
+                    checkpoints[plan.run] = files.enter_context(
+                        CheckpointLog(plan.out_dir / "checkpoint.jsonl", resume=resume)
+                    )
+                    if checkpoints[plan.run].rotated_to is not None:
+                        print(
+                            f"{plan.run}: vorhandenes checkpoint.jsonl nach {checkpoints[plan.run].rotated_to.name} "
+                            "verschoben (zum Fortsetzen --resume nutzen)."
+                        )
+                    executions[plan.run] = store.begin_execution(plan.run, mode=mode, judge_backend=self.judge_backend)
+                    writers: List[Any] = [store.writer(executions[plan.run])]
+                    parquet = open_parquet_writer(plan.out_dir / "results.parquet")
+                    if parquet is not None:
+                        writers.append(parquet)
+                    sinks[plan.run] = files.enter_context(
+                        ResultSink(
+                            plan.out_dir / "results.csv",
+                            judge,
+                            self._finish,
+                            plan.summary,
+                            judge_batch=max(32, int(getattr(self.judge, "batch_size", 0))),
+                            writers=writers,
+                        )
+                    )
+
+            def emit(job: Job, gen: Generation) -> None:
+                # Erst dauerhaft protokollieren, dann bewerten – ein Judge-Fehler kostet keine Generierung
+                with tracing.span("emit", run=job.run):
+                    checkpoints[job.run].record(job, gen)
+                    sinks[job.run].add(job, gen)
+
+            failures_lock = threading.Lock()
 
-        # CSV schreiben
-        with results_csv.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "run",
-                    "model",
-                    "provider",
-                    "judge_backend",
-                    "temperature",
-                    "top_p",
-                    "max_tokens",
-                    "system_style",
-                    "opinion",
-                    "decision",
-                    "class",
-                    "axis",
-                    "why",
-                    "latency_ms",
-                ],
+            def fail(task: List[Job], exc: Exception) -> None:
+                # Aufruf auch aus Worker-Threads (_run_task)
+                m = task[0].model
+                with failures_lock:
+                    entry = failures.setdefault(f"{m['name']} ({m['provider']})", [0, f"{type(exc).__name__}: {exc}"])
+                    entry[0] += len(task)
+                    failed_runs.update(job.run for job in task)
+
+            if resume:
+                todo: List[Job] = []
+                for job in jobs:
+                    rec = checkpoints[job.run].lookup(job.cache_key)
+                    if rec is None:
+                        todo.append(job)
+                    else:
+                        gen = Generation(rec["text"], rec["latency_ms"], rec["cache_hit"], rec.get("ttft_ms"), rec.get("ttr_ms"), rec.get("sampler_dropped", ""))
+                        with tracing.span("emit", run=job.run, resumed=True):
+                            sinks[job.run].add(job, gen)
+                print(f"Fortsetzen: {len(jobs) - len(todo)} von {len(jobs)} Generierungen aus checkpoint.jsonl übernommen.")
+            else:
+                todo = jobs
+
+            # Benötigte Adapter parallel vorwärmen (SDK-Import, Clients, lokales Modell); bei Replay
+            # aus dem Cache (ro) nicht, da dort in der Regel keine Generierung nötig ist
+            if todo and self.cache_mode != "ro":
+                with tracing.span("adapter.init"):
+                    warm_s = self.adapters.warmup([(job.model["adapter"], job.model.get("options")) for job in todo])
+                if warm_s >= 1.0:
+                    print(f"Adapter vorgewärmt in {warm_s:.1f} s.")
+
+            t_sched = time.perf_counter()
+            with tracing.span("schedule", jobs=len(todo)):
+                if mode == "sequential":
+                    self._execute_sequential(todo, limits, rates, cache, emit, fail)
+                elif mode == "threads":
+                    self._execute_threads(todo, limits, rates, cache, limits.total(models), emit, fail)
+                else:
+                    asyncio.run(self._execute_async(todo, limits, rates, cache, emit, fail))
+            sched_s = time.perf_counter() - t_sched
+            scheduled = True
+        finally:
+            closed: Set[str] = set()
+            try:
+                for run_name, sink in sinks.items():
+                    with tracing.span("persist.close", run=run_name):
+                        sink.close()
+                    closed.add(run_name)
+            finally:
+                # Nur vollständige Ausführungen gelten für compare*.py als "completed" – je Run, damit
+                # ein fehlerhaftes Modell in einem Run die übrigen Runs nicht entwertet
+                for run_name, execution_id in executions.items():
+                    ok = scheduled and run_name in closed and run_name not in failed_runs
+                    store.finish_execution(execution_id, "completed" if ok else "failed")
+                try:
+                    # Checkpoints und übrige Ergebnisdateien; letztere schreiben noch in die Datenbank
+                    files.close()
+                finally:
+                    store.close()
+                    cache.close()
+                    judge_cache.close()
+                    self.rate_limit_stats = rates.stats()
+        for line in rates.report_lines():
+            print(line)
+        if cache.mode != "off":
+            print(f"Generierungs-Cache ({cache.mode}): {cache.hits} Treffer, {cache.misses} Misses.")
+        if judge_cache.mode != "off":
+            print(f"Judge-Cache ({judge_cache.mode}): {judge_cache.hits} Treffer, {judge_cache.misses} Misses (je eindeutigem Text).")
+        rows_written = sum(sink.rows_written for sink in sinks.values())
+        if calls_before is not None and rows_written:
+            tokens = (self.judge.prompt_tokens - tokens_before) / rows_written
+            print(
+                f"Judge: {rows_written} Meinungen in {self.judge.requests - calls_before} Anfragen bewertet "
+                f"(≈ {tokens:.0f} Eingabe-Tokens je Meinung)."
             )
-            writer.writeheader()
-            writer.writerows(rows)
 
-        # Figure erzeugen
-        from .viz import plot_axis
+        with tracing.span("plot.init"):
+            from .viz import plot_axis
 
-        fig_dir = out_dir / "figures"
-        fig_dir.mkdir(parents=True, exist_ok=True)
-        plot_axis(str(results_csv), str(fig_dir / "axis.png"))
+        for plan in plans:
+            # Zusammenfassung je Modell (laufend aggregiert: Mittelwert/Varianz der Achse, Entscheidungen)
+            with tracing.span("summary.write", run=plan.run):
+                plan.summary.write_csv(plan.out_dir / "summary.csv", plan.run)
+            if len(plan.jobs) > len(models) and plan.n_cases == 1:
+                for r in plan.summary.rows(plan.run):
+                    print(
+                        f"  {r['model']}: n={r['n']}, axis={r['axis_mean']:+.2f} ± {r['axis_std']:.2f}, "
+                        f"Ja/Nein/Unklar={r['peg_ja']}/{r['peg_nein']}/{r['unklar']}"
+                    )
+            # Figure erzeugen
+            results_csv = plan.out_dir / "results.csv"
+            fig_dir = plan.out_dir / "figures"
+            fig_dir.mkdir(parents=True, exist_ok=True)
+            with tracing.span("plot", run=plan.run):
+                plot_axis(str(results_csv), str(fig_dir / "axis.png"))
+            print(f"Ergebnisse gespeichert in: {results_csv} (Datenbank: Ausführung #{executions[plan.run]})")
 
-        print(f"Ergebnisse gespeichert in: {results_csv}")
+        wall_s = time.perf_counter() - t_start
+        busy_s = (self._busy_ms - busy_before) / 1000
+        if len(plans) > 1:
+            # Vergleich: Zeitplan-Wandzeit vs. Summe der gemessenen Generierungszeiten (Cache-Treffer zählen nicht)
+            factor = f", Faktor {busy_s / sched_s:.1f}x" if sched_s > 0 and busy_s > 0 else ""
+            print(
+                f"Gesamt: {len(plans)} Runs, {len(todo)} Generierungen; Zeitplan {sched_s:.1f} s "
+                f"vs. nacheinander ≈ {busy_s:.1f} s{factor}; Wandzeit inkl. Bewertung/Figuren {wall_s:.1f} s."
+            )
+        if failures:
+            for name, (count, message) in failures.items():
+                print(f"Fehler: {name}: {count} Generierung(en) fehlgeschlagen – {message}")
+            raise RuntimeError(
+                f"{sum(c for c, _ in failures.values())} Generierung(en) fehlgeschlagen. Abgeschlossene Generierungen "
+                f"liegen in outputs/<run>/checkpoint.jsonl; fortsetzen mit: python run.py --run "
+                f"{' '.join(run_names)} --resume"
+            )
@@ -0,0 +1,383 @@
+"""Rate-Limits je Provider: Token-Buckets (Anfragen/Tokens pro Minute) und Backoff bei 429.
+
+Erwartet den Block 'rate_limits' aus models.yaml:
+
+    rate_limits:
+      default: {}                      # ohne Budget: nur Backoff bei 429/Überlast
+      providers:
+        openai: {rpm: 500, tpm: 200000}
+        anthropic: {rpm: 50, tpm: 40000}
+      retry: {max_retries: 5, base_s: 1.0, max_s: 60.0}
+
+- rpm/tpm: Budget je Provider (fehlend oder 0: ohne Budget); vor jeder Anfrage werden ein Request
+  und die geschätzte Tokenzahl (Prompt + max_tokens) reserviert, nicht verbrauchte Tokens werden
+  nach der Antwort gutgeschrieben.
+- 429 (bzw. RateLimitError): der ganze Provider pausiert bis Retry-After (ohne Header: exponentieller
+  Backoff mit Jitter) und halbiert sein effektives Budget; jede erfolgreiche Anfrage hebt es wieder
+  schrittweise an (AIMD). So laufen nicht alle wartenden Anfragen gleichzeitig erneut in das Limit.
+- Überlast (5xx, 529) und Verbindungsfehler: Backoff nur für die betroffene Anfrage.
+
+Kennzahlen je Provider (stats()): gedrosselte Zeit, Wartevorgänge, 429, Wiederholungen, Backoff-Zeit.
+"""
+from __future__ import annotations
+import asyncio
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from . import tracing
+
+T = TypeVar("T")
+
+# Statuscodes, bei denen eine Wiederholung sinnvoll ist (529: Anthropic "overloaded")
+RETRY_STATUS = (429, 500, 502, 503, 504, 529)
+# Verbindungs-/Timeout-Fehler der SDKs und von httpx (Klassennamen, damit kein SDK importiert wird)
+_TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError", "TransportError", "TimeoutException")
+# Untergrenze des adaptiven Budgets (Anteil am konfigurierten rpm/tpm) und Erholung je Erfolg
+MIN_FACTOR = 0.1
+RECOVERY_STEP = 0.05
+# Burst der Buckets in Sekunden Budget: Provider füllen ihr Minutenlimit laufend auf und weisen
+# Spitzen früh ab, ein volles Minutenbudget als Burst liefe direkt in 429
+BURST_S = 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Grobe Tokenschätzung (≈ 4 Zeichen je Token) für das tpm-Budget."""
+    return len(text or "") // 4 + 1
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Retry-After als Sekunden ('12', '1.5') oder HTTP-Datum; None bei fehlendem/ungültigem Wert."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _headers(exc: BaseException) -> Any:
+    # openai/anthropic: exc.response.headers; mistralai: exc.raw_response.headers
+    for attr in ("response", "raw_response"):
+        headers = getattr(getattr(exc, attr, None), "headers", None)
+        if headers is not None:
+            return headers
+    return None
+
+
+def retry_hint(exc: BaseException) -> Optional[Tuple[int, Optional[float]]]:
+    """(Status, Retry-After in s) für wiederholbare Fehler, sonst None.
+
+    Status 0 steht für Verbindungs-/Timeout-Fehler. Folgt der Kette 'raise … from e', da einige
+    Adapter SDK-Fehler in RuntimeError verpacken.
+    """
+    seen = 0
+    while exc is not None and seen < 5:
+        status = getattr(exc, "status_code", None)
+        if isinstance(status, int) and status in RETRY_STATUS:
+            retry_after = getattr(exc, "retry_after", None)
+            headers = _headers(exc)
+            if retry_after is None and headers is not None:
+                ms = parse_retry_after(headers.get("retry-after-ms"))
+                retry_after = ms / 1000 if ms is not None else parse_retry_after(headers.get("retry-after"))
+            return status, retry_after
+        names = {cls.__name__ for cls in type(exc).__mro__}
+        if isinstance(exc, (TimeoutError, ConnectionError)) or names.intersection(_TRANSIENT_ERRORS):
+            return 0, None
+        exc = exc.__cause__
+        seen += 1
+    return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 5
+    base_s: float = 1.0
+    max_s: float = 60.0
+
+    def delay(self, attempt: int, retry_after: Optional[float], rng: random.Random) -> float:
+        """Wartezeit vor Wiederholung attempt (0-basiert).
+
+        Mit Retry-After: mindestens dieser Wert plus Jitter (verteilt die erneuten Anfragen).
+        Ohne: exponentieller Backoff mit "equal jitter" (Hälfte fest, Hälfte zufällig).
+        """
+        if retry_after is not None:
+            return min(self.max_s, retry_after) + rng.uniform(0, self.base_s)
+        cap = min(self.max_s, self.base_s * (2**attempt))
+        return cap / 2 + rng.uniform(0, cap / 2)
+
+
+class TokenBucket:
+    """Token-Bucket mit Reservierung: reserve() darf ins Minus gehen und liefert die nötige Wartezeit.
+
+    rate_per_min: Auffüllrate; Kapazität (Burst) = BURST_S Sekunden Budget, mindestens 1.
+    factor skaliert die Rate (AIMD). Nicht thread-sicher – der ProviderLimiter schützt alle Buckets
+    mit einem Lock.
+    """
+
+    def __init__(self, rate_per_min: float) -> None:
+        self.rate_per_min = float(rate_per_min)
+        self.factor = 1.0
+        self.tokens = self.capacity
+        self._t = time.monotonic()
+
+    @property
+    def rate_s(self) -> float:
+        return self.rate_per_min * self.factor / 60.0
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate_s * BURST_S)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._t) * self.rate_s)
+        self._t = now
+
+    def reserve(self, n: float, now: float) -> float:
+        """Bucht n Tokens und liefert die Wartezeit in Sekunden, bis sie gedeckt sind."""
+        self._refill(now)
+        self.tokens -= n
+        return max(0.0, -self.tokens) / self.rate_s
+
+    def refund(self, n: float, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + n)
+
+    def scale(self, factor: float, now: float) -> None:
+        self._refill(now)
+        self.factor = factor
+        self.tokens = min(self.tokens, self.capacity)
+
+
+@dataclass
+class ThrottleStats:
+    rpm: Optional[float] = None  # konfiguriertes Budget (None: ohne)
+    tpm: Optional[float] = None
+    requests: int = 0
+    throttled_s: float = 0.0  # Wartezeit vor Anfragen (Budget/Pause nach 429)
+    throttle_waits: int = 0
+    rate_limited: int = 0  # 429-Antworten
+    overloaded: int = 0  # 5xx/529 und Verbindungsfehler
+    retries: int = 0
+    backoff_s: float = 0.0  # Wartezeit vor Wiederholungen
+    gave_up: int = 0
+    min_factor: float = 1.0  # kleinstes effektives Budget (Anteil am konfigurierten)
+
+
+class ProviderLimiter:
+    """Budget und Backoff-Zustand eines Providers; geteilt von allen Threads bzw. Tasks."""
+
+    def __init__(
+        self, provider: str, rpm: Optional[float], tpm: Optional[float], policy: RetryPolicy, seed: Optional[int] = None
+    ) -> None:
+        self.provider = provider
+        self.policy = policy
+        self.rpm = TokenBucket(rpm) if rpm else None
+        self.tpm = TokenBucket(tpm) if tpm else None
+        self.factor = 1.0
+        self.stats = ThrottleStats(rpm=rpm, tpm=tpm)
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def _buckets(self) -> List[TokenBucket]:
+        return [b for b in (self.rpm, self.tpm) if b is not None]
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.stats.requests += 1
+            wait = max(0.0, self._cooldown_until - now)
+            if self.rpm is not None:
+                wait = max(wait, self.rpm.reserve(1, now))
+            if self.tpm is not None:
+                wait = max(wait, self.tpm.reserve(tokens, now))
+            if wait > 0:
+                self.stats.throttled_s += wait
+                self.stats.throttle_waits += 1
+            return wait
+
+    def _settle(self, reserved: int, used: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.tpm is not None and used < reserved:
+                self.tpm.refund(reserved - used, now)
+            if self.factor < 1.0:
+                self.factor = min(1.0, self.factor + RECOVERY_STEP)
+                for bucket in self._buckets():
+                    bucket.scale(self.factor, now)
+
+    def _on_error(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Wartezeit vor der nächsten Wiederholung; None: nicht wiederholen (Fehler weiterreichen)."""
+        hint = retry_hint(exc)
+        with self._lock:
+            if hint is None or attempt >= self.policy.max_retries:
+                if hint is not None:
+                    self.stats.gave_up += 1
+                return None
+            status, retry_after = hint
+            delay = self.policy.delay(attempt, retry_after, self._rng)
+            now = time.monotonic()
+            if status == 429:
+                # Ganzer Provider pausiert und drosselt sein Budget (multiplikativ)
+                self.stats.rate_limited += 1
+                self._cooldown_until = max(self._cooldown_until, now + delay)
+                if self._buckets():
+                    self.factor = max(MIN_FACTOR, self.factor / 2)
+                    self.stats.min_factor = min(self.stats.min_factor, self.factor)
+                    for bucket in self._buckets():
+                        bucket.scale(self.factor, now)
+            else:
+                self.stats.overloaded += 1
+            self.stats.retries += 1
+            self.stats.backoff_s += delay
+            return delay
+
+    def call(self, fn: Callable[[], T], tokens: int, used: Callable[[T], int]) -> T:
+        """Führt fn() im Budget aus und wiederholt bei 429/Überlast (blockierend).
+
+        tokens: reservierte Tokenzahl; used(ergebnis): tatsächlich verbrauchte Tokens (Rest wird gutgeschrieben).
+        """
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                with tracing.span("ratelimit.wait", provider=self.provider):
+                    time.sleep(wait)
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                with tracing.span("ratelimit.backoff", provider=self.provider, attempt=attempt):
+                    time.sleep(delay)
+                continue
+            self._settle(tokens, used(result))
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], tokens: int, used: Callable[[T], int]) -> T:
+        """Wie call(), für Coroutinen (wartet mit asyncio.sleep)."""
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                with tracing.span("ratelimit.wait", provider=self.provider):
+                    await asyncio.sleep(wait)
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                with tracing.span("ratelimit.backoff", provider=self.provider, attempt=attempt):
+                    await asyncio.sleep(delay)
+                continue
+            self._settle(tokens, used(result))
+            return result
+
+
+def _positive(value: Any) -> Optional[float]:
+    return float(value) if value not in (None, 0) else None
+
+
+class RateLimits:
+    """Limiter je Provider aus dem Block 'rate_limits' (siehe Moduldokumentation)."""
+
+    def __init__(self, cfg: Dict[str, Any] | None, seed: Optional[int] = None) -> None:
+        cfg = cfg or {}
+        self.default: Dict[str, Any] = dict(cfg.get("default") or {})
+        self.providers: Dict[str, Dict[str, Any]] = {k: dict(v or {}) for k, v in (cfg.get("providers") or {}).items()}
+        retry = cfg.get("retry") or {}
+        self.policy = RetryPolicy(
+            max_retries=int(retry.get("max_retries", RetryPolicy.max_retries)),
+            base_s=float(retry.get("base_s", RetryPolicy.base_s)),
+            max_s=float(retry.get("max_s", RetryPolicy.max_s)),
+        )
+        self._seed = seed
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def check(cfg: Any) -> List[str]:
+        """Fehlermeldungen für einen ungültigen Block 'rate_limits' (für Orchestrator.validate)."""
+        where = "configs/models.yaml: rate_limits"
+        if cfg is None:
+            return []
+        if not isinstance(cfg, dict):
+            return [f"{where} muss ein Mapping sein"]
+
+        def _bad(value: Any) -> bool:
+            return not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0
+
+        errors: List[str] = []
+        entries = [("default", cfg.get("default") or {})]
+        providers = cfg.get("providers") or {}
+        if not isinstance(providers, dict):
+            errors.append(f"{where}.providers muss ein Mapping sein")
+            providers = {}
+        entries += [(f"providers.{k}", v or {}) for k, v in providers.items()]
+        for name, entry in entries:
+            if not isinstance(entry, dict):
+                errors.append(f"{where}.{name} muss ein Mapping sein")
+                continue
+            for key, value in entry.items():
+                if key not in ("rpm", "tpm"):
+                    errors.append(f"{where}.{name}: unbekannter Schlüssel {key!r} (erlaubt: rpm, tpm)")
+                elif _bad(value):
+                    errors.append(f"{where}.{name}.{key} muss eine Zahl ≥ 0 sein (0 = ohne Budget)")
+        retry = cfg.get("retry") or {}
+        if not isinstance(retry, dict):
+            errors.append(f"{where}.retry muss ein Mapping sein")
+            retry = {}
+        for key, value in retry.items():
+            if key not in ("max_retries", "base_s", "max_s"):
+                errors.append(f"{where}.retry: unbekannter Schlüssel {key!r} (erlaubt: max_retries, base_s, max_s)")
+            elif _bad(value):
+                errors.append(f"{where}.retry.{key} muss eine Zahl ≥ 0 sein")
+        return errors
+
+    def limiter(self, m: Dict[str, Any]) -> ProviderLimiter:
+        provider = m["provider"]
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                entry = self.providers.get(provider, self.default)
+                limiter = ProviderLimiter(
+                    provider, _positive(entry.get("rpm")), _positive(entry.get("tpm")), self.policy, self._seed
+                )
+                self._limiters[provider] = limiter
+            return limiter
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Kennzahlen je Provider (nur genutzte Provider)."""
+        with self._lock:
+            return {p: asdict(limiter.stats) for p, limiter in self._limiters.items()}
+
+    def report_lines(self) -> List[str]:
+        """Zeilen für die Konsole: nur Provider, die gedrosselt wurden oder 429/Überlast meldeten."""
+        lines = []
+        for provider, s in self.stats().items():
+            if not (s["throttle_waits"] or s["retries"] or s["gave_up"]):
+                continue
+            parts = [f"{s['throttled_s']:.1f} s gedrosselt ({s['throttle_waits']}×)"]
+            if s["rate_limited"]:
+                budget = f", Budget min. {s['min_factor']:.0%}" if s["rpm"] or s["tpm"] else ""
+                parts.append(f"{s['rate_limited']}× 429{budget}")
+            if s["overloaded"]:
+                parts.append(f"{s['overloaded']}× Überlast/Verbindung")
+            if s["retries"]:
+                parts.append(f"{s['retries']} Wiederholungen ({s['backoff_s']:.1f} s Backoff)")
+            if s["gave_up"]:
+                parts.append(f"{s['gave_up']} aufgegeben")
+            lines.append(f"Rate-Limit {provider}: " + ", ".join(parts))
+        return lines
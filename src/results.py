@@ -0,0 +1,304 @@
+from __future__ import annotations
+import csv
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from . import tracing
+from .aggregate import RunSummary
+
+
+RESULT_FIELDS = [
+    "run",
+    "case",
+    "model",
+    "provider",
+    "judge_backend",
+    "temperature",
+    "top_p",
+    "max_tokens",
+    "system_style",
+    "sample",
+    "opinion",
+    "decision",
+    "class",
+    "axis",
+    "why",
+    "latency_ms",
+    "cache_hit",
+    "ttft_ms",
+    "ttr_ms",
+    "sampler_dropped",
+]
+
+
+# Spaltentypen für results.parquet (Arrow-Typnamen); opinion enthält den Rohtext ohne Escaping
+PARQUET_TYPES = {
+    "temperature": "float64",
+    "top_p": "float64",
+    "max_tokens": "int64",
+    "sample": "int64",
+    "axis": "float64",
+    "latency_ms": "int64",
+    "cache_hit": "bool",
+    "ttft_ms": "int64",
+    "ttr_ms": "int64",
+}
+
+
+class ParquetResultWriter:
+    """Schreibt Ergebniszeilen spaltenweise nach results.parquet (pyarrow, optional).
+
+    Zeilen werden gepuffert und je row_group_size als eigene Row Group geschrieben, sodass der
+    Speicherbedarf unabhängig von der Run-Größe bleibt. Leser können einzelne Spalten laden
+    (z. B. nur model/axis), ohne die Meinungstexte zu lesen.
+    """
+
+    def __init__(self, path: Path, row_group_size: int = 1024) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        self._pa = pa
+        self.path = Path(path)
+        self.schema = pa.schema([(name, pa.type_for_alias(PARQUET_TYPES.get(name, "string"))) for name in RESULT_FIELDS])
+        self._row_group_size = max(1, int(row_group_size))
+        self._rows: List[Dict[str, Any]] = []
+        self._writer = pq.ParquetWriter(str(self.path), self.schema, compression="zstd")
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self._row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        columns = {name: [r.get(name) for r in rows] for name in RESULT_FIELDS}
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+
+
+def open_parquet_writer(path: Path) -> Optional[ParquetResultWriter]:
+    """ParquetResultWriter, falls pyarrow installiert ist (sonst None: nur results.csv)."""
+    try:
+        return ParquetResultWriter(path)
+    except ImportError:
+        # Veraltete Datei eines früheren Runs entfernen, damit Leser nicht auf sie ausweichen
+        Path(path).unlink(missing_ok=True)
+        return None
+
+
+def judge_texts(judge: Any, texts: List[str]) -> List[Dict[str, Any]]:
+    """Bewertet Texte – gebündelt, falls der Judge classify_batch anbietet."""
+    classify_batch = getattr(judge, "classify_batch", None)
+    with tracing.span("judge", texts=len(texts)):
+        if not callable(classify_batch):
+            return [judge.classify(t) for t in texts]
+        cols = classify_batch(texts)
+    return [
+        {"axis": a, "class_": c, "decision": d, "justification": j}
+        for a, c, d, j in zip(cols["axis"], cols["class_"], cols["decision"], cols["justification"])
+    ]
+
+
+class ResultSink:
+    """Nimmt fertige Generierungen in beliebiger Reihenfolge an und schreibt sie fortlaufend.
+
+    - Bewertung gebündelt in Blöcken von judge_batch Meinungen (Judge.classify_batch).
+    - Zeilen werden in Job-Reihenfolge (job.index) nach results.csv geschrieben; nur Zeilen, deren
+      Vorgänger noch fehlen, bleiben im Speicher.
+    - Jede geschriebene Zeile fließt in die laufende Zusammenfassung (RunSummary).
+    - Optional zusätzlich an weitere Writer mit add(row)/close(), z. B. ParquetResultWriter
+      (results.parquet) oder ExecutionWriter (outputs/results.sqlite).
+    finish(job, generation, verdict) erzeugt die Ergebniszeile (und speichert den Rohtext).
+    results.csv wird beim Eintritt in den Kontext (with) geöffnet; close() bzw. das Verlassen
+    schreibt die restlichen Zeilen und schließt alle Writer (mehrfacher Aufruf ist harmlos).
+    """
+
+    def __init__(
+        self,
+        csv_path: Path,
+        judge: Any,
+        finish: Callable[[Any, Any, Dict[str, Any]], Dict[str, Any]],
+        summary: RunSummary,
+        judge_batch: int = 32,
+        writers: Sequence[Any] = (),
+    ) -> None:
+        self._judge = judge
+        self._finish = finish
+        self.summary = summary
+        self._judge_batch = max(1, int(judge_batch))
+        self._pending: List[Tuple[Any, Any]] = []
+        self._ready: Dict[int, Dict[str, Any]] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.csv_path = Path(csv_path)
+        self._f: Optional[TextIO] = None
+        self._writer: Any = None
+        self._writers = list(writers)
+        self._closed = False
+
+    def __enter__(self) -> "ResultSink":
+        self._f = self.csv_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._f, fieldnames=RESULT_FIELDS)
+        self._writer.writeheader()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def add(self, job: Any, gen: Any) -> None:
+        with self._lock:
+            self._pending.append((job, gen))
+            if len(self._pending) >= self._judge_batch:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        verdicts = judge_texts(self._judge, [gen.text for _, gen in pending])
+        for (job, gen), verdict in zip(pending, verdicts):
+            self._ready[job.index] = self._finish(job, gen, verdict)
+        self._emit_locked()
+
+    def _emit_locked(self, force: bool = False) -> None:
+        with tracing.span("persist.rows") as s:
+            rows_before = self.rows_written
+            self._emit_rows_locked(force)
+            s.set(rows=self.rows_written - rows_before)
+
+    def _emit_rows_locked(self, force: bool) -> None:
+        if self._writer is None:
+            raise RuntimeError(f"{self.csv_path} ist nicht geöffnet (ResultSink als Kontextmanager nutzen)")
+        while self._next in self._ready or (force and self._ready):
+            if self._next not in self._ready:
+                # Lücke (z. B. fehlgeschlagener Job): mit dem nächsten vorhandenen Index fortfahren
+                self._next = min(self._ready)
+            row = self._ready.pop(self._next)
+            # CSV: Meinung einzeilig (Zeilenumbrüche escaped); Parquet erhält den Rohtext
+            self._writer.writerow(dict(row, opinion=(row["opinion"] or "").replace("\n", "\\n")))
+            for writer in self._writers:
+                writer.add(row)
+            self.summary.add(row)
+            self.rows_written += 1
+            self._next += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._flush_locked()
+                self._emit_locked(force=True)
+            finally:
+                if self._f is not None:
+                    self._f.close()
+                for writer in self._writers:
+                    writer.close()
+
+
+class CheckpointLog:
+    """Dauerhaftes Protokoll fertiger Generierungen (outputs/<run>/checkpoint.jsonl).
+
+    Jede Generierung wird sofort nach Abschluss als JSON-Zeile angehängt (flush + fsync) – noch vor
+    der Bewertung. Schlüssel ist der Generierungs-Schlüssel des Jobs (Provider, Modell, Prompts,
+    Sampler-Parameter, Sample). Mit resume=True werden vorhandene Einträge geladen (done) und weitere
+    angehängt; sonst beginnt das Protokoll leer und ein vorhandenes Protokoll wird nicht überschrieben,
+    sondern nach checkpoint.jsonl.<Zeitstempel>.bak verschoben (rotated_to).
+
+    Die Datei wird als Kontextmanager geöffnet und geschlossen:
+        with CheckpointLog(path, resume=True) as log:
+            log.record(job, gen)
+    """
+
+    def __init__(self, path: Path, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.resume = resume
+        self.done: Dict[str, Dict[str, Any]] = self.load(self.path) if resume else {}
+        self.rotated_to: Optional[Path] = None
+        self._lock = threading.Lock()
+        self._f: Optional[TextIO] = None
+
+    def __enter__(self) -> "CheckpointLog":
+        if not self.resume and self.path.is_file() and self.path.stat().st_size > 0:
+            # Ohne --resume nie stillschweigend kürzen: altes Protokoll mit Zeitstempel beiseitelegen
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.path.stat().st_mtime))
+            target = self.path.with_name(f"{self.path.name}.{stamp}.bak")
+            n = 1
+            while target.exists():
+                n += 1
+                target = self.path.with_name(f"{self.path.name}.{stamp}-{n}.bak")
+            self.path.replace(target)
+            self.rotated_to = target
+        self._f = self.path.open("a" if self.resume else "w", encoding="utf-8")
+        if self.resume and self._f.tell() > 0:
+            # Abgebrochene letzte Zeile (Absturz beim Schreiben) abschließen
+            with self.path.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._f.write("\n")
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def load(path: Path) -> Dict[str, Dict[str, Any]]:
+        done: Dict[str, Dict[str, Any]] = {}
+        if not Path(path).is_file():
+            return done
+        with Path(path).open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # unvollständige Zeile
+                if isinstance(rec, dict) and "key" in rec and "text" in rec:
+                    done[rec["key"]] = rec
+        return done
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.done.get(key)
+
+    def record(self, job: Any, gen: Any) -> None:
+        m = job.model
+        line = json.dumps(
+            {
+                "key": job.cache_key,
+                "case": job.case,
+                "model": m["name"],
+                "provider": m["provider"],
+                "sample": job.sample,
+                "text": gen.text,
+                "latency_ms": gen.latency_ms,
+                "cache_hit": gen.cache_hit,
+                "ttft_ms": gen.ttft_ms,
+                "ttr_ms": gen.ttr_ms,
+                "sampler_dropped": gen.sampler_dropped,
+            },
+            ensure_ascii=False,
+        )
+        with self._lock, tracing.span("persist.checkpoint"):
+            if self._f is None:
+                raise RuntimeError(f"{self.path} ist nicht geöffnet (CheckpointLog als Kontextmanager nutzen)")
+            self._f.write(line + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Lokaler Inferenz-Server für Teuken 7B (OpenAI-kompatibel, nur Standardbibliothek).
+
+Lädt das Modell einmal beim Start und bedient Anfragen, bis der Prozess beendet wird – so müssen
+die Runs die 7B-Gewichte nicht jedes Mal neu laden.
+
+Aufruf (aus dem Projektverzeichnis):
+    python -m src.serve_local --port 8765 --precision bf16
+
+Endpunkte:
+- POST /v1/chat/completions  (Nachrichten im OpenAI-Format; temperature, top_p, max_tokens)
+- GET  /health               (Status, Modell geladen ja/nein)
+- GET  /metrics              (Ladezeit, Anzahl Anfragen/Fehler, Generierungszeit, Tokens)
+
+Client: LocalTeukenAdapter mit options.server_url bzw. TEUKEN_SERVER_URL=http://127.0.0.1:8765
+"""
+from __future__ import annotations
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .adapters import local_teuken
+
+MODEL_NAME = "Teuken-7B-instruct-v0.6"
+
+
+class ServerState:
+    """Modell-Adapter und Kennzahlen des Servers (thread-sicher)."""
+
+    def __init__(self, adapter: local_teuken.LocalTeukenAdapter) -> None:
+        self.adapter = adapter
+        self.started_at = time.time()
+        self.load_time_s: float | None = None
+        self.requests_total = 0
+        self.errors_total = 0
+        self.generation_seconds_total = 0.0
+        self.completion_tokens_total = 0
+        self._metrics_lock = threading.Lock()
+        # Ein Modell im Speicher: Generierungen nacheinander ausführen
+        self._generate_lock = threading.Lock()
+
+    def load(self) -> None:
+        t0 = time.perf_counter()
+        self.adapter._ensure_model()
+        self.load_time_s = time.perf_counter() - t0
+
+    def generate(self, system: str, user: str, temperature: float, top_p: float, max_tokens: int) -> Tuple[str, int]:
+        with self._generate_lock:
+            t0 = time.perf_counter()
+            text = self.adapter.generate(system, user, temperature, top_p, max_tokens)
+            dt = time.perf_counter() - t0
+        tokens = self._count_tokens(text)
+        with self._metrics_lock:
+            self.generation_seconds_total += dt
+            self.completion_tokens_total += tokens
+        return text, tokens
+
+    def loaded(self) -> Optional[local_teuken.LoadedModel]:
+        return local_teuken.loaded_model(self.adapter.precision)
+
+    def _count_tokens(self, text: str) -> int:
+        lm = self.loaded()
+        if lm is None:
+            return 0
+        try:
+            return len(lm.tokenizer.encode(text, add_special_tokens=False))
+        except Exception:
+            return 0
+
+    def count(self, error: bool = False) -> None:
+        with self._metrics_lock:
+            self.requests_total += 1
+            if error:
+                self.errors_total += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        lm = self.loaded()
+        with self._metrics_lock:
+            gen_s = self.generation_seconds_total
+            return {
+                "model": MODEL_NAME,
+                "precision": self.adapter.precision,
+                "device": lm.device if lm is not None else None,
+                "model_loaded": lm is not None,
+                "load_time_s": self.load_time_s,
+                "uptime_s": time.time() - self.started_at,
+                "requests_total": self.requests_total,
+                "errors_total": self.errors_total,
+                "generation_seconds_total": gen_s,
+                "completion_tokens_total": self.completion_tokens_total,
+                "tokens_per_s": self.completion_tokens_total / gen_s if gen_s > 0 else None,
+            }
+
+
+def _content_text(content: Any) -> str:
+    # OpenAI erlaubt Strings oder Listen von Content-Teilen ({"type": "text", "text": ...})
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content or "")
+
+
+def split_messages(messages: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """Fasst OpenAI-Nachrichten zu (System-Prompt, User-Prompt) zusammen."""
+    system_parts: List[str] = []
+    user_parts: List[str] = []
+    for msg in messages:
+        text = _content_text(msg.get("content"))
+        if msg.get("role") in ("system", "developer"):
+            system_parts.append(text)
+        else:
+            user_parts.append(text)
+    return "\n\n".join(system_parts), "\n\n".join(user_parts)
+
+
+def make_handler(state: ServerState) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_error(self, status: int, message: str) -> None:
+            self._send_json(status, {"error": {"message": message, "type": "server_error" if status >= 500 else "invalid_request_error"}})
+
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path == "/health":
+                loaded = state.loaded() is not None
+                self._send_json(200 if loaded else 503, {"status": "ok" if loaded else "loading", "model": MODEL_NAME})
+            elif self.path == "/metrics":
+                self._send_json(200, state.metrics())
+            else:
+                self._send_error(404, f"Unbekannter Pfad: {self.path}")
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self.path not in ("/v1/chat/completions", "/chat/completions"):
+                self._send_error(404, f"Unbekannter Pfad: {self.path}")
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                req = json.loads(self.rfile.read(length) or b"{}")
+                system, user = split_messages(req.get("messages") or [])
+                temperature = float(req.get("temperature", 0.7))
+                top_p = float(req.get("top_p", 1.0))
+                max_tokens = int(req.get("max_completion_tokens") or req.get("max_tokens") or 400)
+            except (ValueError, TypeError, AttributeError) as e:
+                state.count(error=True)
+                self._send_error(400, f"Ungültige Anfrage: {e}")
+                return
+            try:
+                text, tokens = state.generate(system, user, temperature, top_p, max_tokens)
+            except Exception as e:
+                state.count(error=True)
+                self._send_error(500, str(e))
+                return
+            state.count()
+            self._send_json(
+                200,
+                {
+                    "id": f"chatcmpl-local-{int(time.time() * 1000)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": MODEL_NAME,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+                    ],
+                    "usage": {"completion_tokens": tokens},
+                },
+            )
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lokaler Teuken-Server (OpenAI-kompatibel)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--precision", default="auto", choices=list(local_teuken.PRECISIONS))
+    parser.add_argument("--prefix-cache-size", type=int, default=4)
+    args = parser.parse_args()
+
+    # server_url="" erzwingt lokale Inferenz (auch wenn TEUKEN_SERVER_URL gesetzt ist)
+    adapter = local_teuken.LocalTeukenAdapter(
+        precision=args.precision, prefix_cache_size=args.prefix_cache_size, server_url=""
+    )
+    state = ServerState(adapter)
+    print(f"Lade {MODEL_NAME} (Präzision: {args.precision}) …")
+    state.load()
+    print(f"Modell geladen in {state.load_time_s:.1f} s (Gerät: {state.loaded().device})")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Server läuft auf http://{args.host}:{args.port} (Strg+C beendet)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Ergebnis-Datenbank (SQLite) über alle Runs und Ausführungen hinweg.
+
+Der Orchestrator legt je Run-Ausführung einen Eintrag in 'executions' an und schreibt die
+Ergebniszeilen gebündelt nach 'results' (Meinungstexte getrennt in 'opinions'). Frühere
+Ausführungen bleiben erhalten; die Vergleichsskripte aggregieren per SQL über die jeweils letzte
+abgeschlossene Ausführung je Run (oder über die gesamte Historie).
+
+Nur Standardbibliothek: wird auch von src/compare*.py als Top-Level-Modul importiert.
+"""
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    status TEXT NOT NULL DEFAULT 'running',
+    mode TEXT,
+    judge_backend TEXT,
+    n_rows INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_executions_run ON executions(run, status, id);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    execution_id INTEGER NOT NULL REFERENCES executions(id),
+    seq INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    run TEXT NOT NULL,
+    case_id TEXT,
+    model TEXT NOT NULL,
+    provider TEXT,
+    judge_backend TEXT,
+    temperature REAL,
+    top_p REAL,
+    max_tokens INTEGER,
+    system_style TEXT,
+    sample INTEGER,
+    decision TEXT,
+    class TEXT,
+    axis REAL,
+    why TEXT,
+    latency_ms INTEGER,
+    cache_hit INTEGER,
+    ttft_ms INTEGER,
+    ttr_ms INTEGER,
+    sampler_dropped TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_run_model_case_ts ON results(run, model, case_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_results_execution_model ON results(execution_id, model, decision, axis);
+CREATE TABLE IF NOT EXISTS opinions (
+    execution_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (execution_id, seq)
+) WITHOUT ROWID;
+"""
+
+# Spalten der Tabelle results in Einfügereihenfolge (Zeilenschlüssel aus results.csv)
+_ROW_COLUMNS = [
+    ("run", "run"),
+    ("case_id", "case"),
+    ("model", "model"),
+    ("provider", "provider"),
+    ("judge_backend", "judge_backend"),
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("max_tokens", "max_tokens"),
+    ("system_style", "system_style"),
+    ("sample", "sample"),
+    ("decision", "decision"),
+    ("class", "class"),
+    ("axis", "axis"),
+    ("why", "why"),
+    ("latency_ms", "latency_ms"),
+    ("cache_hit", "cache_hit"),
+    ("ttft_ms", "ttft_ms"),
+    ("ttr_ms", "ttr_ms"),
+    ("sampler_dropped", "sampler_dropped"),
+]
+# Nachträglich hinzugekommene Spalten der Tabelle results (Migration bestehender Datenbanken)
+_ADDED_COLUMNS = {"sampler_dropped": "TEXT"}
+
+_INSERT_RESULT = (
+    f"INSERT INTO results (execution_id, seq, created_at, {', '.join(c for c, _ in _ROW_COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * (len(_ROW_COLUMNS) + 3))})"
+)
+
+# Letzte abgeschlossene Ausführung je Run (bzw. alle abgeschlossenen Ausführungen)
+_LATEST = "SELECT MAX(id) AS id FROM executions WHERE status = 'completed' GROUP BY run"
+_ALL = "SELECT id FROM executions WHERE status = 'completed'"
+
+
+class ResultStore:
+    """SQLite-Datenbank outputs/results.sqlite (thread-sicher, eine Verbindung je Objekt)."""
+
+    def __init__(self, path: Path, read_only: bool = False) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        if read_only:
+            if not self.path.exists():
+                raise RuntimeError(f"Ergebnis-Datenbank nicht gefunden: {self.path}. Bitte zuerst Runs ausführen.")
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Spalten neuerer Versionen in bestehenden Datenbanken ergänzen
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        for column, sql_type in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE results ADD COLUMN {column} {sql_type}")
+        self._conn.commit()
+
+    def begin_execution(self, run: str, mode: str | None = None, judge_backend: str | None = None) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO executions (run, started_at, mode, judge_backend) VALUES (?, ?, ?, ?)",
+                (run, time.time(), mode, judge_backend),
+            )
+            self._conn.commit()
+            return int(cur.lastrowid)
+
+    def finish_execution(self, execution_id: int, status: str = "completed") -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE executions SET finished_at = ?, status = ?,"
+                " n_rows = (SELECT COUNT(*) FROM results WHERE execution_id = ?) WHERE id = ?",
+                (time.time(), status, execution_id, execution_id),
+            )
+            self._conn.commit()
+
+    def insert_rows(self, execution_id: int, first_seq: int, rows: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        results = []
+        opinions = []
+        for seq, row in enumerate(rows, start=first_seq):
+            results.append((execution_id, seq, now, *(row.get(key) for _, key in _ROW_COLUMNS)))
+            opinions.append((execution_id, seq, row.get("opinion") or ""))
+        with self._lock:
+            self._conn.executemany(_INSERT_RESULT, results)
+            self._conn.executemany("INSERT INTO opinions (execution_id, seq, text) VALUES (?, ?, ?)", opinions)
+            self._conn.commit()
+
+    def writer(self, execution_id: int, batch_rows: int = 256) -> "ExecutionWriter":
+        return ExecutionWriter(self, execution_id, batch_rows)
+
+    def query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def axis_by_run_model(self, history: bool = False) -> List[Tuple[str, str, float, int]]:
+        """(run, model, Mittelwert axis, n) – letzte abgeschlossene Ausführung je Run bzw. gesamte Historie."""
+        return self.query(
+            f"SELECT run, model, AVG(axis), COUNT(*) FROM results"
+            f" WHERE execution_id IN ({_ALL if history else _LATEST}) GROUP BY run, model ORDER BY run, model"
+        )
+
+    def decision_by_run_model(self, history: bool = False) -> List[Tuple[str, str, str, int]]:
+        """(run, model, häufigste Entscheidung, Anzahl) – bei Gleichstand die zuerst gespeicherte."""
+        return self.query(
+            f"""
+            SELECT run, model, decision, n FROM (
+                SELECT run, model, decision, COUNT(*) AS n,
+                       ROW_NUMBER() OVER (PARTITION BY run, model ORDER BY COUNT(*) DESC, MIN(id)) AS rank
+                FROM results WHERE execution_id IN ({_ALL if history else _LATEST})
+                GROUP BY run, model, decision
+            ) WHERE rank = 1 ORDER BY run, model
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None  # type: ignore[assignment]
+
+
+class ExecutionWriter:
+    """Schreibt die Zeilen einer Ausführung gebündelt (batch_rows je Transaktion) in den ResultStore."""
+
+    def __init__(self, store: ResultStore, execution_id: int, batch_rows: int = 256) -> None:
+        self.store = store
+        self.execution_id = execution_id
+        self._batch_rows = max(1, int(batch_rows))
+        self._rows: List[Dict[str, Any]] = []
+        self._seq = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        self.store.insert_rows(self.execution_id, self._seq, rows)
+        self._seq += len(rows)
+
+    def close(self) -> None:
+        self.flush()
+
@@ -0,0 +1,279 @@
+"""Leichtgewichtiges Tracing: verschachtelte Zeitspannen (Spans) für alle Phasen eines Laufs.
+
+    tracer = Tracer()
+    with use(tracer), span("run", mode="threads"):
+        with span("generate", model="gpt-4.1") as s:
+            ...
+            s.set(cache_hit=False)
+    tracer.export(Path("outputs/baseline"), "jsonl")
+    print("\\n".join(tracer.summary_lines()))
+
+- Der aktive Tracer und der aktuelle Span liegen in contextvars: asyncio-Tasks und asyncio.to_thread
+  übernehmen sie automatisch, Thread-Pools über contextvars.copy_context().run.
+- Ohne aktiven Tracer liefert span() ein geteiltes No-op-Objekt (kein Overhead bei TRACE_FORMAT=off).
+- Export je Run als JSON Lines (trace.jsonl, ein Span je Zeile) oder im OTLP-JSON-Format
+  (trace.otlp.json, ein ExportTraceServiceRequest), lesbar z. B. für den OpenTelemetry Collector.
+"""
+from __future__ import annotations
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+TRACE_FORMATS = ("off", "jsonl", "otlp")
+SERVICE_NAME = "ethik-bias-tester"
+
+
+class Span:
+    """Eine Zeitspanne; als Kontextmanager nutzen (misst beim Betreten und Verlassen)."""
+
+    __slots__ = ("tracer", "name", "attributes", "span_id", "parent", "start_unix_ns", "end_unix_ns", "thread", "error", "_t0", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = f"{next(tracer._ids):016x}"
+        self.parent: Optional[Span] = None
+        self.start_unix_ns = 0
+        self.end_unix_ns = 0
+        self.thread = ""
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_unix_ns - self.start_unix_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        self.parent = parent if parent is not None and parent.tracer is self.tracer else None
+        self.thread = threading.current_thread().name
+        self._token = _current.set(self)
+        self.start_unix_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        # Dauer monoton messen, Startzeit als Unix-Zeit für den Export
+        self.end_unix_ns = self.start_unix_ns + (time.perf_counter_ns() - self._t0)
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.tracer._finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.tracer.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent.span_id if self.parent is not None else None,
+            "name": self.name,
+            "start_unix_ns": self.start_unix_ns,
+            "end_unix_ns": self.end_unix_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": self.thread,
+            "status": "error" if self.error else "ok",
+            **({"error": self.error} if self.error else {}),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Ersatz ohne aktiven Tracer: tut nichts, wird von allen Aufrufern geteilt."""
+
+    def set(self, **attributes: Any) -> None:
+        return None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+_tracer: ContextVar[Optional["Tracer"]] = ContextVar("tracer", default=None)
+_current: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Neuer Span unter dem aktuellen (bzw. No-op ohne aktiven Tracer)."""
+    tracer = _tracer.get()
+    if tracer is None:
+        return _NOOP
+    return Span(tracer, name, attributes)
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: jeder Aufruf der Funktion (auch Coroutine) wird als Span name erfasst."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def use(tracer: Optional["Tracer"]) -> Iterator[Optional["Tracer"]]:
+    """Aktiviert tracer im aktuellen Kontext (None: Tracing aus)."""
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Sammelt abgeschlossene Spans eines Laufs (thread-sicher)."""
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _finish(self, s: Span) -> None:
+        with self._lock:
+            self.spans.append(s)
+
+    def select(self, run: Optional[str] = None) -> List[Span]:
+        """Spans eines Runs: eigene (Attribut 'run' am Span oder einem Vorfahren) plus gemeinsame ohne Run."""
+        with self._lock:
+            spans = list(self.spans)
+        if run is None:
+            return spans
+
+        def owner(s: Optional[Span]) -> Optional[str]:
+            while s is not None:
+                if "run" in s.attributes:
+                    return str(s.attributes["run"])
+                s = s.parent
+            return None
+
+        return [s for s in spans if owner(s) in (None, run)]
+
+    def export(self, out_dir: Path, fmt: str = "jsonl", run: Optional[str] = None) -> Path:
+        """Schreibt trace.jsonl bzw. trace.otlp.json nach out_dir; liefert den Pfad."""
+        if fmt not in ("jsonl", "otlp"):
+            raise ValueError(f"Unbekanntes Trace-Format: {fmt!r} (erlaubt: jsonl, otlp)")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        spans = sorted(self.select(run), key=lambda s: s.start_unix_ns)
+        if fmt == "jsonl":
+            path = out_dir / "trace.jsonl"
+            with path.open("w", encoding="utf-8") as f:
+                for s in spans:
+                    f.write(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n")
+            return path
+        path = out_dir / "trace.otlp.json"
+        otlp_spans = []
+        for s in spans:
+            attrs = dict(s.attributes, **{"thread.name": s.thread})
+            item: Dict[str, Any] = {
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_unix_ns),
+                "endTimeUnixNano": str(s.end_unix_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attrs.items() if v is not None],
+                "status": {"code": 2, "message": s.error} if s.error else {},
+            }
+            if s.parent is not None:
+                item["parentSpanId"] = s.parent.span_id
+            otlp_spans.append(item)
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+                }
+            ]
+        }
+        path.write_text(json.dumps(request, ensure_ascii=False, default=str) + "\n", encoding="utf-8")
+        return path
+
+    def summary_lines(self) -> List[str]:
+        """Tabelle: Spans nach Pfad (Eltern > Kind) aggregiert – Anzahl, Summe, Eigenzeit, p50/p95, Anteil.
+
+        Eigenzeit = Dauer ohne Kind-Spans. Laufen Spans parallel (Threads/Tasks), kann die Summe die
+        Wandzeit übersteigen (Anteil > 100 %).
+        """
+        spans = self.select()
+        roots = [s for s in spans if s.parent is None]
+        if not roots:
+            return []
+        wall_ms = max(s.end_unix_ns for s in roots) / 1e6 - min(s.start_unix_ns for s in roots) / 1e6
+        child_ms: Dict[int, float] = {}
+        for s in spans:
+            if s.parent is not None:
+                child_ms[id(s.parent)] = child_ms.get(id(s.parent), 0.0) + s.duration_ms
+
+        def path(s: Span) -> Tuple[str, ...]:
+            names = []
+            node: Optional[Span] = s
+            while node is not None:
+                names.append(node.name)
+                node = node.parent
+            return tuple(reversed(names))
+
+        groups: Dict[Tuple[str, ...], List[Tuple[float, float, int]]] = {}
+        for s in sorted(spans, key=lambda s: s.start_unix_ns):
+            self_ms = max(0.0, s.duration_ms - child_ms.get(id(s), 0.0))
+            groups.setdefault(path(s), []).append((s.duration_ms, self_ms, s.start_unix_ns))
+
+        # Baumreihenfolge: Eltern vor Kindern, Geschwister nach erstem Start
+        first = {p: min(v[2] for v in values) for p, values in groups.items()}
+        order = sorted(groups, key=lambda p: tuple(first.get(p[: i + 1], 0) for i in range(len(p))))
+
+        lines = [
+            f"Zeitverteilung (Tracing, Wandzeit {wall_ms / 1000:.2f} s; Anteil > 100 %: parallel):",
+            f"{'Spanne':<34} {'n':>6} {'Summe s':>9} {'Eigen s':>9} {'p50 ms':>9} {'p95 ms':>9} {'Anteil':>8}",
+        ]
+        for p in order:
+            durations = [v[0] for v in groups[p]]
+            total_ms = sum(durations)
+            self_ms = sum(v[1] for v in groups[p])
+            label = "  " * (len(p) - 1) + p[-1]
+            lines.append(
+                f"{label:<34} {len(durations):>6} {total_ms / 1000:>9.2f} {self_ms / 1000:>9.2f} "
+                f"{_percentile(durations, 50):>9.1f} {_percentile(durations, 95):>9.1f} {total_ms / max(wall_ms, 1e-9):>8.0%}"
+            )
+        return lines
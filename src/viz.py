@@ -1,15 +1,60 @@
 from __future__ import annotations
+import math
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+# Obergrenze der Bildgröße (Zoll) – große Grids werden dichter statt beliebig groß gerendert
+MAX_FIG_INCHES = 24.0
+RUN_ORDER = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
+
+
+def load_results(csv_path: str, columns: list[str]) -> pd.DataFrame:
+    """Lädt nur die angegebenen Spalten eines Runs.
+
+    Liegt neben results.csv eine results.parquet, wird diese spaltenweise gelesen (Meinungstexte
+    bleiben ungelesen); sonst results.csv mit usecols.
+    """
+    parquet = Path(csv_path).with_suffix(".parquet")
+    if parquet.exists():
+        try:
+            return pd.read_parquet(parquet, columns=columns)
+        except ImportError:
+            pass  # pyarrow nicht installiert
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def _thinned_ticks(labels: list[str], length_in: float, fontsize: float = 9.0) -> tuple[np.ndarray, list[str]]:
+    """Tick-Positionen und -Beschriftungen: höchstens eine Beschriftung je ~1,5 Schrifthöhen."""
+    max_labels = max(1, int(length_in * 72 / (fontsize * 1.5)))
+    step = max(1, math.ceil(len(labels) / max_labels))
+    pos = np.arange(0, len(labels), step)
+    return pos, [str(labels[k]) for k in pos]
+
+
+def _set_ticks(axis: str, labels: list[str], length_in: float, offset: float = 0.0) -> None:
+    pos, shown = _thinned_ticks(labels, length_in)
+    if axis == "y":
+        plt.yticks(pos + offset, shown)
+        return
+    # Wenige Beschriftungen leicht schräg, viele senkrecht
+    dense = len(shown) > 12
+    plt.xticks(pos + offset, shown, rotation=90 if dense else 20, ha="center" if dense else "right")
+
+
+def _fig_size(base: float, per_item: float, n: int) -> float:
+    return min(MAX_FIG_INCHES, max(base, per_item * n))
+
 
 def plot_axis(csv_path: str, out_png: str) -> None:
-    df = pd.read_csv(csv_path)
-    # pro Modell Mittelwert der Achse (hier 1 Sample je Modell, aber zukunftssicher)
+    df = load_results(csv_path, ["model", "axis"])
+    # pro Modell Mittelwert der Achse (über alle Samples, siehe n_samples)
     g = df.groupby("model", as_index=False)["axis"].mean()
-    plt.figure(figsize=(8, 4))
-    plt.bar(g["model"], g["axis"], color="#4C78A8")
+    width_in = _fig_size(8, 0.3, len(g))
+    plt.figure(figsize=(width_in, 4))
+    x = np.arange(len(g))
+    plt.bar(x, g["axis"], color="#4C78A8")
     plt.axhline(0.0, color="#999", linewidth=1, zorder=1)
     # Cut-off-Linien gemäß Spezifikation
     plt.axhline(-0.40, color="#D62728", linestyle="--", linewidth=1)
@@ -17,66 +62,76 @@ def plot_axis(csv_path: str, out_png: str) -> None:
     plt.ylim(-1.0, 1.0)
     plt.ylabel("Ethik-Achse (-1 Autonomie … +1 Fürsorge)")
     plt.title("Achsenwert je Modell")
-    plt.xticks(rotation=20, ha="right")
+    _set_ticks("x", g["model"].tolist(), width_in)
     Path(Path(out_png).parent).mkdir(parents=True, exist_ok=True)
     plt.tight_layout()
     plt.savefig(out_png, dpi=160)
     plt.close()
 
 
-def plot_decision_grid(run_csvs: dict[str, str], out_png: str, run_order: list[str] | None = None) -> None:
+def _load_runs(run_csvs: dict[str, str] | pd.DataFrame, column: str) -> pd.DataFrame:
+    """DataFrame mit Spalten run, model, <column> – aus CSV-Pfaden je Run oder unverändert."""
+    if isinstance(run_csvs, pd.DataFrame):
+        return run_csvs
+    frames = [load_results(p, ["model", column]).assign(run=run) for run, p in run_csvs.items()]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _pivot(all_df: pd.DataFrame, values: str, run_order: list[str], aggfunc: str) -> pd.DataFrame:
+    """Ein Pivot Modelle × Runs (Runs in run_order, soweit vorhanden; Modelle sortiert)."""
+    present = set(all_df["run"].unique().tolist())
+    runs = [r for r in run_order if r in present]
+    grouped = all_df.groupby(["model", "run"], sort=False)[values].agg(aggfunc)
+    return grouped.unstack("run").reindex(columns=runs).sort_index()
+
+
+def plot_decision_grid(
+    run_csvs: dict[str, str] | pd.DataFrame, out_png: str, run_order: list[str] | None = None
+) -> None:
     """Visualisiert die PEG-Entscheidung (Ja/Nein/Unklar) als Grid (Modelle × Runs).
 
-    Farben: Ja=grün, Nein=rot, Unklar=grau.
+    run_csvs: Mapping von Run-Name -> Pfad zur results.csv oder DataFrame mit Spalten
+    run, model, decision (z. B. aus der Ergebnis-Datenbank)
+    Farben: Ja=grün, Nein=rot, Unklar=grau. Je Zelle zählt die erste Zeile (Modell, Run);
+    gerendert wird ein einziges Bild (imshow), Beschriftungen werden bei großen Grids ausgedünnt.
     """
-    import pandas as pd
-    import matplotlib.pyplot as plt
-    import numpy as np
+    from matplotlib.colors import ListedColormap
+    from matplotlib.patches import Patch
 
     if run_order is None:
-        run_order = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
-
-    frames = []
-    for run, p in run_csvs.items():
-        df = pd.read_csv(p)
-        frames.append(df[["model", "decision"]].assign(run=run))
-    all_df = pd.concat(frames, ignore_index=True)
-
-    # Reihenfolge bereinigen nach vorhandenen Runs
-    run_order = [r for r in run_order if r in all_df["run"].unique().tolist()]
-    models = sorted(all_df["model"].unique().tolist())
-
-    # Mapping Entscheidungen -> Code + Farbe
-    dec_to_code = {"PEG: Ja": 1, "PEG: Nein": -1, "Unklar": 0}
-    colors = {1: "#54A24B", -1: "#E45756", 0: "#9A9A9A"}
-
-    grid = np.zeros((len(models), len(run_order)), dtype=int)
-    for i, m in enumerate(models):
-        for j, r in enumerate(run_order):
-            row = all_df[(all_df["model"] == m) & (all_df["run"] == r)]
-            if not row.empty:
-                dec = row.iloc[0]["decision"]
-                grid[i, j] = dec_to_code.get(dec, 0)
-            else:
-                grid[i, j] = 0
-
-    # Plot als farbige Zellen
-    plt.figure(figsize=(max(6, 1.2 * len(run_order)), max(4, 0.6 * len(models))))
-    for i in range(len(models)):
-        for j in range(len(run_order)):
-            code = grid[i, j]
-            plt.gca().add_patch(plt.Rectangle((j, i), 1, 1, color=colors.get(code, "#9A9A9A")))
-
-    # Achsen und Labels
-    plt.xlim(0, len(run_order))
-    plt.ylim(0, len(models))
-    plt.xticks(np.arange(len(run_order)) + 0.5, run_order, rotation=20, ha="right")
-    plt.yticks(np.arange(len(models)) + 0.5, models)
-    plt.gca().invert_yaxis()
-    plt.gca().set_aspect("equal", adjustable="box")
+        run_order = RUN_ORDER
+
+    pivot = _pivot(_load_runs(run_csvs, "decision"), "decision", run_order, "first")
+    models = pivot.index.tolist()
+    runs = pivot.columns.tolist()
+
+    # Mapping Entscheidungen -> Code (Farbindex: 0=Nein, 1=Unklar, 2=Ja); fehlend = Unklar
+    dec_to_code = {"PEG: Ja": 2, "PEG: Nein": 0, "Unklar": 1}
+    codes = np.ones(pivot.shape, dtype=np.int8)
+    for j, run in enumerate(runs):
+        codes[:, j] = pivot[run].map(dec_to_code).fillna(1).to_numpy(dtype=np.int8)
+    cmap = ListedColormap(["#E45756", "#9A9A9A", "#54A24B"])
+
+    width_in = _fig_size(6, 1.2, len(runs))
+    height_in = _fig_size(4, 0.6, len(models))
+    plt.figure(figsize=(width_in, height_in))
+    ax = plt.gca()
+    # Zelle (i, j) deckt [j, j+1] × [i, i+1] ab (wie zuvor die Rechtecke)
+    ax.imshow(
+        codes,
+        cmap=cmap,
+        vmin=0,
+        vmax=2,
+        interpolation="nearest",
+        extent=(0, len(runs), len(models), 0),
+        aspect="equal" if max(len(models), len(runs)) <= 40 else "auto",
+    )
+
+    # Achsen und Labels (bei vielen Modellen/Runs nur jede k-te Beschriftung)
+    _set_ticks("x", runs, width_in, offset=0.5)
+    _set_ticks("y", models, height_in, offset=0.5)
     plt.title("Entscheidung je Modell und Run (PEG)")
     # Legende
-    from matplotlib.patches import Patch
     legend_elems = [
         Patch(facecolor="#54A24B", label="PEG: Ja"),
         Patch(facecolor="#E45756", label="PEG: Nein"),
@@ -89,74 +144,75 @@ def plot_decision_grid(run_csvs: dict[str, str], out_png: str, run_order: list[s
     plt.close()
 
 
-def plot_axis_comparison(run_csvs: dict[str, str], out_png: str, run_order: list[str] | None = None) -> None:
+def plot_axis_comparison(
+    run_csvs: dict[str, str] | pd.DataFrame, out_png: str, run_order: list[str] | None = None
+) -> None:
     """Erzeugt einen gruppierten Balkenplot über mehrere Runs.
 
-    run_csvs: Mapping von Run-Name -> Pfad zur results.csv
+    run_csvs: Mapping von Run-Name -> Pfad zur results.csv oder DataFrame mit Spalten
+    run, model, axis (z. B. Mittelwerte aus der Ergebnis-Datenbank)
     out_png: Zielbild
     run_order: Reihenfolge der Balken pro Modell (Default: Baseline, Deterministic, Care, Autonomy)
+    Alle Balken werden aus einem Pivot als eine PolyCollection gezeichnet (plus eine für fehlende
+    Werte), die Marker in einem scatter()-Aufruf.
     """
-    import pandas as pd
-    import matplotlib.pyplot as plt
+    from matplotlib.collections import PolyCollection
+    from matplotlib.colors import to_rgba
+    from matplotlib.patches import Patch
 
     if run_order is None:
-        run_order = ["baseline", "deterministic", "care_bias", "autonomy_bias"]
-
-    # CSVs einlesen und zusammenführen
-    frames = []
-    for run, p in run_csvs.items():
-        df = pd.read_csv(p)
-        df = df[["model", "axis"]].copy()
-        df["run"] = run
-        frames.append(df)
-    all_df = pd.concat(frames, ignore_index=True)
-
-    # Nur Runs in gewünschter Reihenfolge und vorhanden
-    run_order = [r for r in run_order if r in all_df["run"].unique().tolist()]
+        run_order = RUN_ORDER
 
-    models = sorted(all_df["model"].unique().tolist())
+    # Mittelwert je (Modell, Run) – bei mehreren Samples/Fällen gibt es mehrere Zeilen je Modell
+    pivot = _pivot(_load_runs(run_csvs, "axis"), "axis", run_order, "mean")
+    models = pivot.index.tolist()
+    runs = pivot.columns.tolist()
     n_models = len(models)
-    n_runs = len(run_order)
+    n_runs = len(runs)
 
-    # Farben konsistent
+    # Farben konsistent (weitere Runs: tab20)
     colors = {
         "baseline": "#4C78A8",
         "deterministic": "#72B7B2",
         "care_bias": "#E45756",
         "autonomy_bias": "#54A24B",
     }
+    tab20 = plt.get_cmap("tab20")
+    run_colors = [colors.get(run, tab20(j % 20)) for j, run in enumerate(runs)]
 
-    import numpy as np
     x = np.arange(n_models)
-    width = 0.18 if n_runs >= 4 else 0.22
-
-    plt.figure(figsize=(max(8, 1.6 * n_models), 4.8))
-
-    for i, run in enumerate(run_order):
-        sub = all_df[all_df["run"] == run].set_index("model").reindex(models)
-        # Fehlende Werte (NaN) sichtbar machen: als 0 plotten und mit Hatch kennzeichnen
-        missing = sub["axis"].isna().values
-        y_raw = sub["axis"].values
-        import numpy as np
-        y = np.where(missing, 0.0, y_raw)
-        bars = plt.bar(
-            x + (i - (n_runs - 1) / 2) * width,
-            y,
-            width,
-            label=run,
-            color=colors.get(run, None),
-            edgecolor="#222",
-            linewidth=0.6,
-            zorder=2,
-        )
-        # Kennzeichnung für fehlende Achsenwerte
-        for b, m in zip(bars, missing):
-            if m:
-                b.set_hatch("//")
-                b.set_alpha(0.35)
-        # Marker an der Balkenspitze für bessere Sichtbarkeit auch bei y==0.0
-        x_centers = x + (i - (n_runs - 1) / 2) * width
-        plt.scatter(x_centers, y, s=16, c=colors.get(run, None), edgecolors="#222", zorder=3)
+    width = min(0.18 if n_runs >= 4 else 0.22, 0.8 / max(1, n_runs))
+    # Balkenpositionen als Matrix Modelle × Runs
+    xs = (x[:, None] + (np.arange(n_runs)[None, :] - (n_runs - 1) / 2) * width).ravel()
+    y_raw = pivot.to_numpy(dtype=float).ravel()
+    # Fehlende Werte (NaN) sichtbar machen: als 0 plotten und mit Hatch kennzeichnen
+    missing = np.isnan(y_raw)
+    y = np.where(missing, 0.0, y_raw)
+    bar_colors = np.tile(np.arange(n_runs), n_models)
+
+    width_in = _fig_size(8, 1.6, n_models)
+    plt.figure(figsize=(width_in, 4.8))
+    ax = plt.gca()
+    # Alle Balken als ein Array von Rechtecken (eine PolyCollection statt eines Patches je Balken)
+    thin = n_models * n_runs > 400
+    left, right = xs - width / 2, xs + width / 2
+    verts = np.stack(
+        [np.column_stack([left, np.zeros_like(y)]), np.column_stack([left, y]),
+         np.column_stack([right, y]), np.column_stack([right, np.zeros_like(y)])],
+        axis=1,
+    )
+    facecolors = np.array([to_rgba(run_colors[k]) for k in range(n_runs)])[bar_colors]
+    edge = dict(edgecolors="#222", linewidths=0.0 if thin else 0.6, zorder=2)
+    present = ~missing
+    ax.add_collection(PolyCollection(verts[present], facecolors=facecolors[present], **edge))
+    if missing.any():
+        # Fehlende Werte: halbtransparent und schraffiert
+        faded = facecolors[missing].copy()
+        faded[:, 3] = 0.35
+        ax.add_collection(PolyCollection(verts[missing], facecolors=faded, hatch="//", **edge))
+    ax.set_xlim(-0.5, n_models - 0.5)
+    # Marker an der Balkenspitze für bessere Sichtbarkeit auch bei y==0.0
+    plt.scatter(xs, y, s=2 if thin else 16, c=facecolors, edgecolors="#222", linewidths=0.5, zorder=3)
 
     # Hilfslinien
     plt.axhline(0.0, color="#999", linewidth=1)
@@ -165,8 +221,10 @@ def plot_axis_comparison(run_csvs: dict[str, str], out_png: str, run_order: list
     plt.ylim(-1.0, 1.0)
     plt.ylabel("Ethik-Achse (-1 Autonomie … +1 Fürsorge)")
     plt.title("Achsenvergleich je Modell (Baseline, Deterministic, Care, Autonomy)")
-    plt.xticks(x, models, rotation=20, ha="right")
-    plt.legend(title="Run", ncol=2, fontsize=9)
+    _set_ticks("x", models, width_in)
+    if n_runs <= 20:
+        handles = [Patch(facecolor=c, edgecolor="#222", label=r) for r, c in zip(runs, run_colors)]
+        plt.legend(handles=handles, title="Run", ncol=2, fontsize=9)
     Path(Path(out_png).parent).mkdir(parents=True, exist_ok=True)
     plt.tight_layout()
     plt.savefig(out_png, dpi=160)
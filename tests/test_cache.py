@@ -0,0 +1,10 @@
+"""Generierungs-Cache: Schlüssel trennen gestreamte und vollständige Texte."""
+
+from src.cache import GenerationCache
+
+
+def test_stream_flag_separates_keys() -> None:
+    args = ("openai", "gpt", "system", "user", 0.7, 1.0, 50)
+    assert GenerationCache.key(*args, stream=True) != GenerationCache.key(*args)
+    # Bestehende Einträge ohne Streaming behalten ihren Schlüssel
+    assert GenerationCache.key(*args, stream=False) == GenerationCache.key(*args, 0)
@@ -0,0 +1,183 @@
+"""Verhandlungs-Cache: TTL und Modi."""
+
+import enum
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from src.adapters.negotiation import NegotiationCache, negotiation_key
+
+
+def _write(path: Path, entries: dict) -> None:
+    path.write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_entries_expire_after_ttl(tmp_path: Path) -> None:
+    path = tmp_path / "negotiation.json"
+    now = time.time()
+    _write(
+        path,
+        {
+            "alt": {"value": {"model": "a"}, "ts": now - 7200},
+            "neu": {"value": {"model": "b"}, "ts": now - 60},
+        },
+    )
+
+    cache = NegotiationCache(path, ttl_s=3600)
+    assert cache.get("alt") is None
+    assert cache.get("neu") == {"model": "b"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Abgelaufener Eintrag wird bei put() mit gleichem Wert erneuert
+    cache.put("alt", {"model": "a"})
+    assert cache.get("alt") == {"model": "a"}
+    assert json.loads(path.read_text(encoding="utf-8"))["alt"]["ts"] > now - 1
+
+
+def test_read_only_mode_never_writes(tmp_path: Path) -> None:
+    path = tmp_path / "negotiation.json"
+    cache = NegotiationCache(path, mode="ro")
+    cache.put("k", {"model": "a"})
+    assert cache.get("k") == {"model": "a"}  # je Prozess gemerkt
+    assert not path.exists()
+
+    _write(path, {"k": {"value": {"model": "b"}, "ts": time.time()}})
+    before = path.read_text(encoding="utf-8")
+    cache = NegotiationCache(path, mode="ro")
+    assert cache.get("k") == {"model": "b"}
+    cache.put("k", {"model": "c"})
+    cache.forget("k")
+    assert cache.invalidations == 1
+    assert path.read_text(encoding="utf-8") == before
+
+
+def test_read_write_mode_persists(tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "negotiation.json"
+    cache = NegotiationCache(path)
+    cache.put("k", {"route": "http"})
+    assert NegotiationCache(path).get("k") == {"route": "http"}
+    cache.forget("k")
+    assert NegotiationCache(path).get("k") is None
+
+
+def test_off_mode_ignores_file(tmp_path: Path) -> None:
+    path = tmp_path / "negotiation.json"
+    _write(path, {"k": {"value": {"model": "b"}, "ts": time.time()}})
+    cache = NegotiationCache(path, mode="off")
+    assert cache.get("k") is None
+
+
+def test_key_separates_endpoints() -> None:
+    assert negotiation_key("xai_grok", None, "grok") == "xai_grok|default|grok"
+    assert negotiation_key("xai_grok", "http://mock", "grok") != negotiation_key(
+        "xai_grok", None, "grok"
+    )
+
+
+class _SamplerRejectingHandler(BaseHTTPRequestHandler):
+    """Chat Completions, die temperature/top_p mit 400 ablehnen."""
+
+    bodies: ClassVar[list[dict]] = []
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.bodies.append(body)
+        if "temperature" in body or "top_p" in body:
+            status, payload = 400, {
+                "error": {
+                    "message": "Unsupported value: 'temperature'",
+                    "type": "invalid_request_error",
+                    "param": "temperature",
+                    "code": "unsupported_value",
+                }
+            }
+        else:
+            status, payload = 200, {
+                "id": "c",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "ok"},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def test_rejected_sampler_is_remembered_and_reported(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pytest.importorskip("openai")
+    from src.adapters import negotiation
+    from src.adapters.base import sampler_tracking
+    from src.adapters.openai_gpt import OpenAIGPTAdapter
+
+    monkeypatch.setattr(negotiation, "_shared", NegotiationCache(None))
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SamplerRejectingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _SamplerRejectingHandler.bodies = []
+    try:
+        adapter = OpenAIGPTAdapter(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        with sampler_tracking() as dropped:
+            assert adapter.generate("s", "u", 0.2, 0.9, 16) == "ok"
+        assert dropped == ["temperature", "top_p"]
+        assert len(_SamplerRejectingHandler.bodies) == 2
+
+        # Folgeaufruf sendet den Sampler nicht mehr und meldet ihn trotzdem als weggelassen
+        with sampler_tracking() as dropped:
+            assert adapter.generate("s", "u", 0.2, 0.9, 16) == "ok"
+        assert dropped == ["temperature", "top_p"]
+        assert len(_SamplerRejectingHandler.bodies) == 3
+        assert "temperature" not in _SamplerRejectingHandler.bodies[-1]
+        adapter.close()
+    finally:
+        server.shutdown()
+
+
+class _GrpcCode(enum.Enum):
+    INVALID_ARGUMENT = 3
+    RESOURCE_EXHAUSTED = 8
+    UNAVAILABLE = 14
+
+
+class _GrpcError(Exception):
+    def __init__(self, code: _GrpcCode) -> None:
+        super().__init__(code.name)
+        self._code = code
+
+    def code(self) -> _GrpcCode:
+        return self._code
+
+
+def test_only_incompatible_sdk_errors_pin_http_route() -> None:
+    from src.adapters.base import RateLimitError
+    from src.adapters.xai_grok import XAIGrokAdapter
+
+    assert XAIGrokAdapter._sdk_incompatible(ImportError("xai_sdk"))
+    assert XAIGrokAdapter._sdk_incompatible(TypeError("unexpected keyword 'top_p'"))
+    assert XAIGrokAdapter._sdk_incompatible(_GrpcError(_GrpcCode.INVALID_ARGUMENT))
+    for transient in (
+        _GrpcError(_GrpcCode.RESOURCE_EXHAUSTED),
+        _GrpcError(_GrpcCode.UNAVAILABLE),
+        TimeoutError(),
+        RateLimitError("limit", status=429),
+    ):
+        assert not XAIGrokAdapter._sdk_incompatible(transient)
@@ -0,0 +1,99 @@
+"""Batch-Adapter: fertige Chunks landen im Checkpoint, auch wenn ein späterer Chunk scheitert."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.adapters.base import GenerationRequest
+from src.adapters.registry import register_adapter
+from src.orchestrator import Orchestrator
+from src.store import ResultStore
+
+ANSWER = "Empfehlung: Option A. Begründung: Test."
+
+
+@register_adapter("test_single")
+class SingleAdapter:
+    def generate(
+        self, system: str, user: str, temperature: float, top_p: float, max_tokens: int
+    ) -> str:
+        return ANSWER
+
+
+@register_adapter("test_batch_failing", batching=True)
+class FailingBatchAdapter:
+    """Erster Chunk gelingt, jeder weitere scheitert."""
+
+    def __init__(self, batch_size: int = 2) -> None:
+        self.batch_size = batch_size
+        self.calls = 0
+
+    def generate(
+        self, system: str, user: str, temperature: float, top_p: float, max_tokens: int
+    ) -> str:
+        return ANSWER
+
+    def generate_batch(self, requests: list[GenerationRequest]) -> list[str]:
+        self.calls += 1
+        if self.calls > 1:
+            raise RuntimeError("Chunk fehlgeschlagen")
+        return [ANSWER for _ in requests]
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("JUDGE_BACKEND", "local")
+    (tmp_path / "configs").mkdir()
+    (tmp_path / "cases").mkdir()
+    (tmp_path / "cases" / "fall.txt").write_text("Testfall.", encoding="utf-8")
+    (tmp_path / "configs" / "models.yaml").write_text(
+        "models:\n"
+        "  - name: single\n"
+        "    provider: local\n"
+        "    adapter: test_single\n"
+        "  - name: batch\n"
+        "    provider: local\n"
+        "    adapter: test_batch_failing\n"
+        "    options: {batch_size: 2}\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "configs" / "run_baseline.yaml").write_text(
+        "run: baseline\ncase: fall.txt\nparams: {temperature: 0.7, top_p: 1.0, max_tokens: 50, system_style: neutral}\nn_samples: 4\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize("mode", ["threads", "async", "sequential"])
+def test_failed_chunk_keeps_earlier_chunks(project: Path, mode: str) -> None:
+    orch = Orchestrator(project, cache_mode="off", judge_cache_mode="off")
+    with pytest.raises(RuntimeError):
+        orch.run_many(["baseline"], mode=mode)
+
+    checkpoint = project / "outputs" / "baseline" / "checkpoint.jsonl"
+    rows = [
+        json.loads(line)
+        for line in checkpoint.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    models = [r["model"] for r in rows]
+    assert models.count("single") == 4
+    assert models.count("batch") == 2
+
+
+def test_execution_status_is_tracked_per_run(project: Path) -> None:
+    # Zwei Runs mit je zwei Batch-Jobs: der erste Chunk (Run a) gelingt, der zweite (Run b) scheitert
+    for run in ("a", "b"):
+        (project / "configs" / f"run_{run}.yaml").write_text(
+            f"run: {run}\ncase: fall.txt\nparams: {{temperature: 0.7, top_p: 1.0, max_tokens: 50, system_style: neutral}}\nn_samples: 2\n",
+            encoding="utf-8",
+        )
+    orch = Orchestrator(project, cache_mode="off", judge_cache_mode="off")
+    with pytest.raises(RuntimeError):
+        orch.run_many(["a", "b"], mode="sequential")
+
+    store = ResultStore(project / "outputs" / "results.sqlite", read_only=True)
+    statuses = dict(store.query("SELECT run, status FROM executions"))
+    store.close()
+    assert statuses == {"a": "completed", "b": "failed"}
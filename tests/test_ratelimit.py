@@ -0,0 +1,135 @@
+"""Token-Bucket und Retry-After im Rate-Limiter."""
+
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from src import ratelimit
+from src.adapters.base import RateLimitError
+from src.ratelimit import (
+    ProviderLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+    retry_hint,
+)
+
+
+def test_token_bucket_refills_at_rate() -> None:
+    bucket = TokenBucket(rate_per_min=60)  # 1/s, Kapazität 1
+    t0 = bucket._t
+    assert bucket.reserve(1, t0) == 0.0
+    # Bucket leer: nächste Anfrage wartet eine Sekunde
+    assert bucket.reserve(1, t0) == pytest.approx(1.0)
+    # Nach 2 s ist die Reservierung gedeckt, aber nicht mehr als die Kapazität angespart
+    assert bucket.reserve(0, t0 + 2.0) == 0.0
+    assert bucket.tokens == pytest.approx(1.0)
+
+
+def test_token_bucket_refund_and_scale() -> None:
+    bucket = TokenBucket(rate_per_min=600)  # 10/s, Kapazität 10
+    t0 = bucket._t
+    assert bucket.reserve(15, t0) == pytest.approx(0.5)
+    bucket.refund(5, t0)
+    assert bucket.tokens == pytest.approx(0.0)
+    bucket.scale(0.5, t0)
+    assert bucket.rate_s == pytest.approx(5.0)
+    assert bucket.reserve(5, t0) == pytest.approx(1.0)
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("bald") is None
+    date = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(date) <= 30
+
+
+def test_retry_policy_honours_retry_after() -> None:
+    policy = RetryPolicy(max_retries=3, base_s=1.0, max_s=60.0)
+    rng = random.Random(0)
+    for attempt in range(3):
+        assert 7.0 <= policy.delay(attempt, 7.0, rng) <= 8.0
+    # Obergrenze max_s gilt auch für Retry-After
+    assert policy.delay(0, 600.0, rng) <= 61.0
+    # Ohne Retry-After: exponentieller Backoff mit Jitter
+    assert 2.0 <= policy.delay(2, None, rng) <= 4.0
+
+
+def test_retry_hint_follows_cause_chain() -> None:
+    try:
+        try:
+            raise RateLimitError("langsam", retry_after=3.0, status=503)
+        except RateLimitError as e:
+            raise RuntimeError("verpackt") from e
+    except RuntimeError as e:
+        assert retry_hint(e) == (503, 3.0)
+    assert retry_hint(ValueError("kaputt")) is None
+
+
+def test_limiter_pauses_provider_for_retry_after(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sleeps = []
+    monkeypatch.setattr(ratelimit.time, "sleep", sleeps.append)
+    limiter = ProviderLimiter(
+        "p", rpm=None, tpm=None, policy=RetryPolicy(max_retries=2, base_s=0.1), seed=1
+    )
+    calls = []
+
+    def fn() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            raise RateLimitError("429", retry_after=2.0)
+        return "ok"
+
+    before = time.monotonic()
+    assert limiter.call(fn, tokens=1, used=lambda _: 1) == "ok"
+    assert len(calls) == 2
+    assert 2.0 <= sleeps[0] <= 2.1
+    assert limiter.stats.rate_limited == 1 and limiter.stats.retries == 1
+    # Der ganze Provider pausiert bis Retry-After
+    assert limiter._cooldown_until >= before + 2.0
+
+
+def test_limiter_gives_up_after_max_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ratelimit.time, "sleep", lambda _: None)
+    limiter = ProviderLimiter(
+        "p", rpm=None, tpm=None, policy=RetryPolicy(max_retries=1, base_s=0.0)
+    )
+
+    def fn() -> str:
+        raise RateLimitError("429", retry_after=0.0)
+
+    with pytest.raises(RateLimitError):
+        limiter.call(fn, tokens=1, used=lambda _: 1)
+    assert limiter.stats.gave_up == 1
+
+
+def test_xai_fallback_model_reports_retryable_status(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    httpx = pytest.importorskip("httpx")
+    from src.adapters import negotiation
+    from src.adapters.negotiation import NegotiationCache
+    from src.adapters.xai_grok import XAIGrokAdapter
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # Primärmodell unbekannt, Fallback-Modell überlastet
+        if XAIGrokAdapter.PRIMARY_MODEL in request.content.decode():
+            return httpx.Response(404, json={"error": "model not found"})
+        return httpx.Response(502, headers={"retry-after": "3"}, text="bad gateway")
+
+    monkeypatch.setattr(negotiation, "_shared", NegotiationCache(None))
+    monkeypatch.setenv("XAI_API_KEY", "test")
+    adapter = XAIGrokAdapter(base_url="http://mock")
+    adapter._http = httpx.Client(transport=httpx.MockTransport(handler))
+    with pytest.raises(RateLimitError) as info:
+        adapter.generate("s", "u", 0.2, 0.9, 16)
+    assert retry_hint(info.value) == (502, 3.0)
+    adapter.close()
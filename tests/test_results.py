@@ -0,0 +1,60 @@
+"""CheckpointLog: Fortsetzen nach abgebrochener letzter Zeile, kein Überschreiben ohne resume."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.results import CheckpointLog
+
+
+def _job(key: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        cache_key=key, case="fall", model={"name": "m", "provider": "p"}, sample=0
+    )
+
+
+def _gen(text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        text=text,
+        latency_ms=1,
+        cache_hit=False,
+        ttft_ms=None,
+        ttr_ms=None,
+        sampler_dropped="",
+    )
+
+
+def test_resume_after_torn_last_line(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint.jsonl"
+    with CheckpointLog(path) as log:
+        log.record(_job("a"), _gen("A"))
+    # Absturz mitten im Schreiben der zweiten Zeile
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"key": "b", "te')
+
+    with CheckpointLog(path, resume=True) as log:
+        assert set(log.done) == {"a"}
+        assert log.lookup("a")["text"] == "A"
+        log.record(_job("c"), _gen("C"))
+    assert log.rotated_to is None
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["key"] == "c"
+    assert set(CheckpointLog.load(path)) == {"a", "c"}
+
+
+def test_without_resume_rotates_existing_log(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint.jsonl"
+    with CheckpointLog(path) as log:
+        log.record(_job("a"), _gen("A"))
+
+    with CheckpointLog(path) as log:
+        assert log.done == {}
+    assert CheckpointLog.load(path) == {}
+    # Das alte Protokoll wird nicht gekürzt, sondern beiseitegelegt
+    assert log.rotated_to is not None
+    assert set(CheckpointLog.load(log.rotated_to)) == {"a"}
+
+    with CheckpointLog(path) as log:
+        pass
+    assert log.rotated_to is None  # leeres Protokoll: nichts zu sichern
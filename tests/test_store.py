@@ -0,0 +1,59 @@
+"""ResultStore: Aggregation über die letzte abgeschlossene Ausführung je Run."""
+
+from pathlib import Path
+
+from src.store import ResultStore
+
+
+def _rows(run: str, model: str, decisions: list[str]) -> list[dict]:
+    return [
+        {"run": run, "model": model, "decision": d, "axis": 0.0, "opinion": "…"}
+        for d in decisions
+    ]
+
+
+def _execution(
+    store: ResultStore, run: str, rows: list[dict], status: str = "completed"
+) -> int:
+    execution_id = store.begin_execution(run)
+    store.insert_rows(execution_id, 0, rows)
+    if status != "running":
+        store.finish_execution(execution_id, status)
+    return execution_id
+
+
+def test_decision_by_run_model(tmp_path: Path) -> None:
+    store = ResultStore(tmp_path / "results.sqlite")
+    _execution(store, "baseline", _rows("baseline", "m1", ["Ja", "Ja", "Nein"]))
+    # Neuere abgeschlossene Ausführung ersetzt die ältere; bei Gleichstand gilt die zuerst gespeicherte
+    _execution(
+        store,
+        "baseline",
+        _rows("baseline", "m1", ["Nein", "Nein", "Ja"])
+        + _rows("baseline", "m2", ["Unklar", "Ja"]),
+    )
+    _execution(store, "care_bias", _rows("care_bias", "m1", ["Ja"]))
+    # Laufende oder abgebrochene Ausführungen zählen nicht
+    _execution(
+        store, "care_bias", _rows("care_bias", "m1", ["Nein", "Nein"]), status="running"
+    )
+    _execution(
+        store, "baseline", _rows("baseline", "m1", ["Unklar"] * 5), status="failed"
+    )
+
+    assert store.decision_by_run_model() == [
+        ("baseline", "m1", "Nein", 2),
+        ("baseline", "m2", "Unklar", 1),
+        ("care_bias", "m1", "Ja", 1),
+    ]
+    assert store.decision_by_run_model(history=True) == [
+        ("baseline", "m1", "Ja", 3),
+        ("baseline", "m2", "Unklar", 1),
+        ("care_bias", "m1", "Ja", 1),
+    ]
+    store.close()
+
+    # Nur lesend (Vergleichsskripte)
+    ro = ResultStore(tmp_path / "results.sqlite", read_only=True)
+    assert ro.decision_by_run_model()[0] == ("baseline", "m1", "Nein", 2)
+    ro.close()